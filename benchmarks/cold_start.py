@@ -0,0 +1,93 @@
+# 📌 benchmarks/cold_start.py
+# 📌 Cold-start timing: the old startup (sequential extension loading, tree.sync on every start) vs the
+# 📌 startup pipeline (concurrent imports and setup, hash-gated sync, warmups after ready).
+# 📌 Each run is a fresh interpreter, so module imports are really cold. Nothing connects to Discord or MongoDB.
+# 📌 Run from the repository root:  python -m benchmarks.cold_start --runs 5 --db-delay 0.005 --sync-delay 0.8
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# 📌 Taken before any heavy import, so the import stage includes discord.py and pymongo.
+PROCESS_START = time.perf_counter()
+
+async def child(mode: str, db_delay: float, sync_delay: float) -> dict:
+    """📌 One simulated startup up to the point where interactions are served. Returns stage -> seconds."""
+    import asyncio
+    stages = {}
+    mark = time.perf_counter()
+
+    def record(name: str):
+        nonlocal mark
+        now = time.perf_counter()
+        stages[name] = now - mark
+        mark = now
+
+    import discord
+    from discord.ext import commands
+    import utils.database
+    from benchmarks.fake_mongo import install_fake_database
+    install_fake_database(db_delay)  # 📌 Before the cogs import their collections
+    from utils import metrics, startup
+    from utils.scheduler import ExpiryScheduler
+    record("import.core")
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.default(), tree_cls=metrics.InstrumentedCommandTree)
+    bot.scheduler = ExpiryScheduler(utils.database.jobs_collection)
+    bot._connection.application_id = 1  # 📌 Normally filled in at login
+
+    async def fake_sync(*args, **kwargs):
+        await asyncio.sleep(sync_delay)  # 📌 Stands in for the rate-limited bulk upsert of global commands
+    bot.tree.sync = fake_sync
+
+    if mode == "sequential":
+        for name in startup.discover_extensions():
+            await bot.load_extension(name)
+        record("extensions")
+        await bot.tree.sync()
+        record("tree_sync")
+    else:
+        await startup.load_extensions(bot)
+        record("extensions")
+        # 📌 Simulates a restart with unchanged commands: the stored hash matches the current tree (untimed setup).
+        utils.database.settings_collection.docs[f"{startup.COMMAND_TREE_ID}:1"] = {
+            "_id": f"{startup.COMMAND_TREE_ID}:1", "hash": startup.command_tree_hash(bot.tree)
+        }
+        mark = time.perf_counter()
+        # 📌 Hashing plus one lookup; bot.py also runs this as a background warmup rather than before ready.
+        await startup.sync_commands_if_changed(bot)
+        record("tree_sync")
+    stages["total"] = time.perf_counter() - PROCESS_START
+    return stages
+
+def run_child(mode: str, args) -> dict:
+    command = [sys.executable, "-m", "benchmarks.cold_start", "--child", mode,
+               "--db-delay", str(args.db_delay), "--sync-delay", str(args.sync_delay)]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time: sequential startup vs the startup pipeline")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per mode (the median is reported)")
+    parser.add_argument("--db-delay", type=float, default=0.005, help="Simulated MongoDB round-trip time (seconds)")
+    parser.add_argument("--sync-delay", type=float, default=0.8, help="Simulated global command sync time (seconds)")
+    parser.add_argument("--child", choices=("sequential", "pipeline"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        import asyncio
+        print(json.dumps(asyncio.run(child(args.child, args.db_delay, args.sync_delay))))
+        return
+
+    print(f"📌 {args.runs} cold starts per mode, {args.db_delay * 1000:.1f} ms per DB call, "
+          f"{args.sync_delay * 1000:.0f} ms per command sync")
+    for mode in ("sequential", "pipeline"):
+        runs = [run_child(mode, args) for _ in range(args.runs)]
+        medians = {stage: statistics.median(run[stage] for run in runs) for stage in runs[0]}
+        print(f"{mode:<11} " + "  ".join(f"{stage}={seconds * 1000:7.1f} ms" for stage, seconds in medians.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# 📌 benchmarks/db_latency.py
+# 📌 Measures interaction latency when the database is artificially slow.
+# 📌 Run from the repository root:  python -m benchmarks.db_latency --delay 0.05 --interactions 200
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+import utils.permissions as permissions
+import utils.user_state as user_state
+from benchmarks.fake_mongo import FakeCollection
+from utils.settings_cache import CommandAccessCache, command_access_id
+from utils.write_buffer import WriteBehindBuffer
+
+ALLOWED_ROLE_ID = 1000
+
+class FakeResponse:
+    """📌 Minimal stand-in for discord.InteractionResponse."""
+    async def send_message(self, *args, **kwargs):
+        pass
+
+def make_member(user_id: int):
+    """📌 Builds a fake non-admin member holding the allowlisted role."""
+    default_role = SimpleNamespace(id=0)
+    guild = SimpleNamespace(id=1, default_role=default_role)
+    member = SimpleNamespace(
+        id=user_id,
+        guild=guild,
+        roles=[default_role, SimpleNamespace(id=ALLOWED_ROLE_ID)],
+        guild_permissions=SimpleNamespace(administrator=False),
+    )
+    # 📌 Lets resolve_member() find the member as if it were in the gateway cache.
+    guild.get_member = lambda member_id: member
+    return member
+
+async def handle_interaction(user_id: int, users):
+    """📌 One simulated moderation command: the access check followed by a user document write."""
+    member = make_member(user_id)
+    interaction = SimpleNamespace(response=FakeResponse(), user=member, guild=member.guild)
+    if await permissions.check_moderation_access(interaction, member):
+        await users.update_one({"_id": f"{member.guild.id}:{user_id}"}, {"$set": {"banned": True}}, upsert=True)
+
+async def run(blocking: bool, delay: float, interactions: int, interval: float) -> list:
+    """📌 Fires `interactions` commands every `interval` seconds and returns each one's latency in ms."""
+    settings = FakeCollection(delay, blocking)
+    users = FakeCollection(delay, blocking)
+    settings.docs[command_access_id(1)] = {"_id": command_access_id(1), "allowlist": [ALLOWED_ROLE_ID], "blacklist": []}
+    permissions.command_access_cache = CommandAccessCache(settings)
+    user_state.users_buffer = WriteBehindBuffer(users, enabled=False)
+
+    latencies = []
+
+    async def timed(user_id: int, due: float):
+        await handle_interaction(user_id, users)
+        latencies.append((time.perf_counter() - due) * 1000)
+
+    start = time.perf_counter()
+    tasks = []
+    for i in range(interactions):
+        due = start + i * interval
+        # 📌 Sleep until the next arrival; a blocked loop makes us late, which counts against latency.
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        tasks.append(asyncio.create_task(timed(i, due)))
+    await asyncio.gather(*tasks)
+    return latencies
+
+def report(label: str, latencies: list):
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:<10} p50={p50:9.1f} ms  p99={p99:9.1f} ms  max={ordered[-1]:9.1f} ms  mean={statistics.mean(ordered):9.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="p99 interaction latency with a slow database")
+    parser.add_argument("--delay", type=float, default=0.05, help="Artificial latency per database call (seconds)")
+    parser.add_argument("--interactions", type=int, default=200, help="Number of simulated interactions")
+    parser.add_argument("--interval", type=float, default=0.01, help="Seconds between interaction arrivals")
+    args = parser.parse_args()
+
+    print(f"📌 {args.interactions} interactions, one every {args.interval * 1000:.0f} ms, {args.delay * 1000:.0f} ms per DB call")
+    report("blocking", asyncio.run(run(True, args.delay, args.interactions, args.interval)))
+    report("async", asyncio.run(run(False, args.delay, args.interactions, args.interval)))
+
+if __name__ == "__main__":
+    main()
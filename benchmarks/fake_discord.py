@@ -0,0 +1,237 @@
+# 📌 benchmarks/fake_discord.py
+# 📌 In-process stand-ins for the discord.py objects the cogs touch, so command callbacks run without a token.
+
+import asyncio
+import itertools
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Optional
+
+import discord
+
+# 📌 Snowflake-looking IDs for fake objects.
+_ids = itertools.count(100_000_000_000_000_000)
+
+class FakeREST:
+    """📌 Shared latency for simulated Discord REST calls, counted so runs can be compared."""
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def call(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+class FakeRole:
+    def __init__(self, guild: "FakeGuild", name: str, position: int, role_id: Optional[int] = None):
+        self.id = role_id if role_id is not None else next(_ids)
+        self.guild = guild
+        self.name = name
+        self.position = position
+        self.mention = f"<@&{self.id}>"
+
+    def __eq__(self, other):
+        return isinstance(other, FakeRole) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def is_default(self) -> bool:
+        return self.id == self.guild.id
+
+class FakeMember:
+    """📌 Member with the attributes, permissions and moderation methods the cogs use."""
+    def __init__(self, guild: "FakeGuild", roles: list, administrator: bool = False, user_id: Optional[int] = None):
+        self.id = user_id if user_id is not None else next(_ids)
+        self.guild = guild
+        self.name = f"user{self.id % 10_000}"
+        self.mention = f"<@{self.id}>"
+        self.bot = False
+        self.roles = [guild.default_role] + list(roles)
+        self.guild_permissions = SimpleNamespace(administrator=administrator, ban_members=True, moderate_members=True)
+        self.avatar = None
+        self.default_avatar = SimpleNamespace(url="https://cdn.discordapp.com/embed/avatars/0.png")
+        self.created_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.joined_at = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        self.timed_out_until = None
+        self.top_role = max(self.roles, key=lambda role: role.position)
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def _roles(self) -> list:
+        """📌 Sorted IDs of the member's own roles, like discord.py's internal SnowflakeList."""
+        return sorted(role.id for role in self.roles if role.id != self.guild.id)
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return next((role for role in self.roles if role.id == role_id and role.id != self.guild.id), None)
+
+    async def timeout(self, until, reason: str = None):
+        await self.guild.rest.call()
+        if isinstance(until, timedelta):
+            until = discord.utils.utcnow() + until
+        self.timed_out_until = until
+
+    async def ban(self, reason: str = None):
+        await self.guild.ban(self, reason=reason)
+
+    async def add_roles(self, *roles, reason: str = None):
+        await self.guild.rest.call()
+        self.roles += [role for role in roles if role not in self.roles]
+
+    async def remove_roles(self, *roles, reason: str = None):
+        await self.guild.rest.call()
+        self.roles = [role for role in self.roles if role not in roles]
+
+class FakeChannel:
+    def __init__(self, guild: "FakeGuild"):
+        self.id = next(_ids)
+        self.guild = guild
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        await self.guild.rest.call()
+        self.sent += 1
+        return FakeMessage(self)
+
+    def get_partial_message(self, message_id: int):
+        return FakeMessage(self, message_id)
+
+class FakeMessage:
+    def __init__(self, channel: FakeChannel, message_id: Optional[int] = None):
+        self.id = message_id if message_id is not None else next(_ids)
+        self.channel = channel
+        self.guild = channel.guild
+
+    async def edit(self, **kwargs):
+        await self.guild.rest.call()
+
+class FakeGuild:
+    """📌 Guild with a role hierarchy, a member cache and an in-memory ban list."""
+    def __init__(self, rest: FakeREST, role_count: int = 20, guild_id: Optional[int] = None):
+        self.id = guild_id if guild_id is not None else next(_ids)
+        self.rest = rest
+        self.default_role = FakeRole(self, "@everyone", 0, role_id=self.id)
+        self.roles = [self.default_role] + [FakeRole(self, f"role-{i}", i) for i in range(1, role_count + 1)]
+        self.members = {}
+        self.bans = {}
+        self.system_channel = FakeChannel(self)
+        self.channels = {self.system_channel.id: self.system_channel}
+        self.me = SimpleNamespace(guild_permissions=SimpleNamespace(ban_members=True, moderate_members=True))
+
+    def add_member(self, roles: list = (), administrator: bool = False) -> FakeMember:
+        member = FakeMember(self, roles, administrator)
+        self.members[member.id] = member
+        return member
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self.members.get(user_id)
+
+    async def fetch_member(self, user_id: int) -> FakeMember:
+        await self.rest.call()
+        return self.members[user_id]
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return next((role for role in self.roles if role.id == role_id), None)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self.channels.get(channel_id)
+
+    async def ban(self, user, reason: str = None):
+        await self.rest.call()
+        self.bans[user.id] = reason
+
+    async def unban(self, user, reason: str = None):
+        await self.rest.call()
+        if self.bans.pop(user.id, discord.utils.MISSING) is discord.utils.MISSING:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Ban")
+
+    async def fetch_ban(self, user) -> SimpleNamespace:
+        await self.rest.call()
+        if user.id not in self.bans:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Ban")
+        return SimpleNamespace(user=user, reason=self.bans[user.id])
+
+class FakeResponse:
+    """📌 discord.InteractionResponse stand-in; every acknowledgement costs one REST call."""
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _ack(self):
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        await self._interaction.guild.rest.call()
+        self._done = True
+
+    async def send_message(self, *args, **kwargs):
+        await self._ack()
+
+    async def defer(self, *args, **kwargs):
+        await self._ack()
+
+    async def edit_message(self, *args, **kwargs):
+        await self._ack()
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, *args, **kwargs):
+        await self._interaction.guild.rest.call()
+
+class FakeInteraction:
+    """📌 The parts of discord.Interaction used by command and component callbacks."""
+    def __init__(self, user: FakeMember, data: Optional[dict] = None):
+        self.id = next(_ids)
+        self.user = user
+        self.guild = user.guild
+        self.channel = user.guild.system_channel
+        self.data = data or {}
+        self.extras = {}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def original_response(self) -> FakeMessage:
+        return FakeMessage(self.channel)
+
+class FakeBot:
+    """📌 Just enough of commands.Bot for the cogs' constructors and callbacks."""
+    def __init__(self, guild: FakeGuild, scheduler, owner: FakeMember):
+        self.guilds = [guild]
+        self.scheduler = scheduler
+        self.owner = owner
+        self.ipc = None
+        self.latency = 0.042
+        self.shard_id = None
+        self.user = SimpleNamespace(id=next(_ids), name="Support Me")
+        self._never_ready = asyncio.Event()
+        self.cogs = {}
+
+    async def application_info(self):
+        return SimpleNamespace(owner=self.owner)
+
+    async def is_owner(self, user) -> bool:
+        return user.id == self.owner.id
+
+    async def wait_until_ready(self):
+        # 📌 Background loops stay parked: the benchmark only drives callbacks directly.
+        await self._never_ready.wait()
+
+    def get_cog(self, name: str):
+        return self.cogs.get(name)
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return next((guild for guild in self.guilds if guild.id == guild_id), None)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        for guild in self.guilds:
+            channel = guild.get_channel(channel_id)
+            if channel is not None:
+                return channel
+        return None
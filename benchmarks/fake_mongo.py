@@ -0,0 +1,327 @@
+# 📌 benchmarks/fake_mongo.py
+
+import asyncio
+import copy
+import sys
+import time
+
+from bson import ObjectId
+from pymongo import DeleteOne, ReplaceOne, ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+
+class FakeUpdateResult:
+    """📌 Mirrors the attributes of pymongo's UpdateResult that the bot reads."""
+    def __init__(self, matched_count: int, modified_count: int, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+def _get(doc: dict, path: str):
+    """📌 Resolves a dotted field path (array indexes included), returning None when it's missing."""
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, list) and part.isdigit():
+            value = value[int(part)] if int(part) < len(value) else None
+        elif isinstance(value, dict):
+            value = value.get(part)
+        else:
+            return None
+    return value
+
+def _compare(value, condition) -> bool:
+    """📌 Equality, or the comparison operators the bot's queries use ($gt/$gte/$lt/$lte/$in/$ne/$exists)."""
+    if not (isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition)):
+        return value == condition or (isinstance(value, list) and condition in value)
+    for operator, operand in condition.items():
+        if operator == "$exists":
+            ok = (value is not None) == bool(operand)
+        elif operator == "$in":
+            ok = value in operand
+        elif operator == "$nin":
+            ok = value not in operand
+        elif operator == "$ne":
+            ok = value != operand
+        elif value is None:
+            ok = False
+        elif operator == "$gt":
+            ok = value > operand
+        elif operator == "$gte":
+            ok = value >= operand
+        elif operator == "$lt":
+            ok = value < operand
+        elif operator == "$lte":
+            ok = value <= operand
+        else:
+            raise NotImplementedError(f"FakeCollection does not support {operator}")
+        if not ok:
+            return False
+    return True
+
+def _matches(doc: dict, query: dict) -> bool:
+    """📌 Filter matching for the subset of query syntax the bot uses (field conditions, $or and $nor)."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, branch) for branch in condition):
+                return False
+        elif key == "$nor":
+            if any(_matches(doc, branch) for branch in condition):
+                return False
+        elif not _compare(_get(doc, key), condition):
+            return False
+    return True
+
+def _evaluate(expression, doc: dict):
+    """📌 Aggregation expressions used in pipeline updates: "$field" paths, $add, $cond, $gte and $ifNull."""
+    if isinstance(expression, str) and expression.startswith("$"):
+        return _get(doc, expression[1:])
+    if not (isinstance(expression, dict) and len(expression) == 1 and next(iter(expression)).startswith("$")):
+        return expression
+    (operator, operands), = expression.items()
+    values = [_evaluate(operand, doc) for operand in operands]
+    if operator == "$add":
+        return sum(values)
+    if operator == "$cond":
+        return values[1] if values[0] else values[2]
+    if operator == "$gte":
+        return values[0] >= values[1]
+    if operator == "$ifNull":
+        return values[0] if values[0] is not None else values[1]
+    raise NotImplementedError(f"FakeCollection does not support the {operator} expression")
+
+def _apply_update(doc: dict, update, inserting: bool = False):
+    """📌 Applies the subset of update operators used by the bot to a document in place."""
+    if isinstance(update, list):
+        # 📌 Pipeline update: each $set stage sees the result of the previous one.
+        for stage in update:
+            values = {key: _evaluate(value, doc) for key, value in stage["$set"].items()}
+            doc.update(copy.deepcopy(values))
+        return
+    if inserting:
+        for key, value in update.get("$setOnInsert", {}).items():
+            doc[key] = copy.deepcopy(value)
+    for key, value in update.get("$set", {}).items():
+        doc[key] = copy.deepcopy(value)
+    for key in update.get("$unset", {}):
+        doc.pop(key, None)
+    for key, value in update.get("$inc", {}).items():
+        doc[key] = doc.get(key, 0) + value
+    for key, value in update.get("$max", {}).items():
+        doc[key] = max(doc.get(key, value), value)
+    for key, value in update.get("$addToSet", {}).items():
+        values = doc.setdefault(key, [])
+        for item in (value["$each"] if isinstance(value, dict) and "$each" in value else [value]):
+            if item not in values:
+                values.append(copy.deepcopy(item))
+    for key, value in update.get("$pull", {}).items():
+        items = value["$in"] if isinstance(value, dict) and "$in" in value else [value]
+        doc[key] = [item for item in doc.get(key, []) if item not in items]
+    for key, value in update.get("$push", {}).items():
+        if isinstance(value, dict) and "$each" in value:
+            values = doc.setdefault(key, [])
+            values.extend(copy.deepcopy(value["$each"]))
+            if value.get("$slice") is not None:
+                doc[key] = values[value["$slice"]:] if value["$slice"] < 0 else values[:value["$slice"]]
+        else:
+            doc.setdefault(key, []).append(copy.deepcopy(value))
+
+class FakeCursor:
+    """📌 Async cursor over a snapshot of matching documents (supports sort, skip and limit chaining)."""
+    def __init__(self, docs: list):
+        self._docs = docs
+
+    def sort(self, key, direction: int = 1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, order in reversed(keys):
+            self._docs.sort(key=lambda doc: (_get(doc, field) is not None, _get(doc, field)), reverse=order < 0)
+        return self
+
+    def skip(self, count: int):
+        self._docs = self._docs[count:]
+        return self
+
+    def limit(self, count: int):
+        if count:
+            self._docs = self._docs[:count]
+        return self
+
+    async def to_list(self, length: int = None):
+        return self._docs[:length] if length else list(self._docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._docs:
+            yield doc
+
+class FakeCollection:
+    """
+    📌 In-process stand-in for a pymongo AsyncCollection.
+    📌 `delay` adds artificial latency to every call to simulate a slow database.
+    📌 With `blocking=True` the delay is a time.sleep(), reproducing a synchronous driver that freezes the event loop.
+    """
+    def __init__(self, delay: float = 0.0, blocking: bool = False, name: str = "fake"):
+        self.name = name
+        self.delay = delay
+        self.blocking = blocking
+        self.docs = {}
+        self.round_trips = 0
+
+    async def _wait(self):
+        self.round_trips += 1
+        if not self.delay:
+            return
+        if self.blocking:
+            time.sleep(self.delay)
+        else:
+            await asyncio.sleep(self.delay)
+
+    async def find_one(self, query: dict, projection: dict = None):
+        """📌 Projections are accepted for API compatibility and ignored."""
+        await self._wait()
+        doc = self._find(query)
+        return copy.deepcopy(doc) if doc is not None else None
+
+    def find(self, query: dict = None, projection: dict = None, batch_size: int = 0) -> FakeCursor:
+        """📌 Like pymongo's find(), not a coroutine; the round trip is counted when it's called."""
+        self.round_trips += 1
+        return FakeCursor([copy.deepcopy(doc) for doc in self.docs.values() if _matches(doc, query or {})])
+
+    async def count_documents(self, query: dict) -> int:
+        await self._wait()
+        return sum(1 for doc in self.docs.values() if _matches(doc, query))
+
+    async def insert_one(self, doc: dict):
+        await self._wait()
+        self._insert(doc)
+
+    async def insert_many(self, docs: list, ordered: bool = True):
+        await self._wait()
+        for doc in docs:
+            self._insert(doc)
+
+    def _insert(self, doc: dict):
+        # 📌 Like the driver, assigns an ObjectId to documents inserted without an `_id`.
+        doc.setdefault("_id", ObjectId())
+        self.docs[doc["_id"]] = copy.deepcopy(doc)
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        await self._wait()
+        return self._update(query, update, upsert)
+
+    async def find_one_and_update(self, query: dict, update: dict, upsert: bool = False,
+                                  return_document: bool = ReturnDocument.BEFORE, projection: dict = None):
+        await self._wait()
+        before = copy.deepcopy(self._find(query))
+        self._update(query, update, upsert)
+        if return_document == ReturnDocument.AFTER:
+            return copy.deepcopy(self._find(query))
+        return before
+
+    async def replace_one(self, query: dict, replacement: dict, upsert: bool = False):
+        await self._wait()
+        self._replace(query, replacement, upsert)
+
+    async def delete_one(self, query: dict):
+        await self._wait()
+        doc = self._find(query)
+        if doc is not None:
+            del self.docs[doc["_id"]]
+
+    async def delete_many(self, query: dict):
+        await self._wait()
+        for key in [key for key, doc in self.docs.items() if _matches(doc, query)]:
+            del self.docs[key]
+
+    async def create_index(self, keys, **kwargs) -> str:
+        await self._wait()
+        return str(keys)
+
+    async def aggregate(self, pipeline: list) -> FakeCursor:
+        """📌 Supports the $match / $group($sum) / $sort / $limit stages the bot uses."""
+        await self._wait()
+        # 📌 Copy only what the leading $match selects, so the fake's own cost doesn't grow with collection size.
+        first = pipeline[0].get("$match", {}) if pipeline else {}
+        docs = [copy.deepcopy(doc) for doc in self.docs.values() if _matches(doc, first)]
+        for stage in pipeline:
+            (name, spec), = stage.items()
+            if name == "$match":
+                docs = [doc for doc in docs if _matches(doc, spec)]
+            elif name == "$group":
+                groups = {}
+                for doc in docs:
+                    key = _get(doc, spec["_id"][1:]) if isinstance(spec["_id"], str) else spec["_id"]
+                    group = groups.setdefault(key, {"_id": key})
+                    for field, accumulator in spec.items():
+                        if field == "_id":
+                            continue
+                        operand = accumulator["$sum"]
+                        value = (_get(doc, operand[1:]) or 0) if isinstance(operand, str) else operand
+                        group[field] = group.get(field, 0) + value
+                docs = list(groups.values())
+            elif name == "$sort":
+                cursor = FakeCursor(docs).sort(list(spec.items()))
+                docs = cursor._docs
+            elif name == "$limit":
+                docs = docs[:spec]
+            else:
+                raise NotImplementedError(f"FakeCollection does not support the {name} stage")
+        return FakeCursor(docs)
+
+    async def bulk_write(self, requests: list, ordered: bool = True):
+        """📌 Applies pymongo UpdateOne / ReplaceOne / DeleteOne requests in a single simulated round trip."""
+        await self._wait()
+        for request in requests:
+            if isinstance(request, DeleteOne):
+                doc = self._find(request._filter)
+                if doc is not None:
+                    del self.docs[doc["_id"]]
+            elif isinstance(request, ReplaceOne):
+                self._replace(request._filter, request._doc, request._upsert)
+            else:
+                self._update(request._filter, request._doc, request._upsert)
+
+    def _find(self, query: dict):
+        if set(query) == {"_id"} and not isinstance(query["_id"], dict):
+            return self.docs.get(query["_id"])
+        return next((doc for doc in self.docs.values() if _matches(doc, query)), None)
+
+    def _replace(self, query: dict, replacement: dict, upsert: bool):
+        doc = self._find(query)
+        if doc is None and not upsert:
+            return
+        key = doc["_id"] if doc is not None else replacement.get("_id", query.get("_id"))
+        self.docs[key] = {**copy.deepcopy(replacement), "_id": key}
+
+    def _update(self, query: dict, update: dict, upsert: bool):
+        doc = self._find(query)
+        if doc is not None:
+            _apply_update(doc, update)
+            return FakeUpdateResult(1, 1)
+        if not upsert:
+            return FakeUpdateResult(0, 0)
+        doc = copy.deepcopy(query)
+        _apply_update(doc, update, inserting=True)
+        self.docs[doc["_id"]] = doc
+        return FakeUpdateResult(0, 0, doc["_id"])
+
+def install_fake_database(delay: float = 0.0) -> dict:
+    """
+    📌 Swaps every AsyncCollection referenced by the bot's modules (and by module-level objects such as
+    📌 users_buffer or command_access_cache) for a FakeCollection with the same name. Returns name -> fake.
+    📌 Modules imported afterwards pick up the fakes from utils.database.
+    """
+    fakes = {}
+
+    def fake(collection: AsyncCollection) -> FakeCollection:
+        return fakes.setdefault(collection.name, FakeCollection(delay, name=collection.name))
+
+    for name, module in list(sys.modules.items()):
+        if not name.startswith(("utils.", "commands.")):
+            continue
+        for attribute, value in list(vars(module).items()):
+            if isinstance(value, AsyncCollection):
+                setattr(module, attribute, fake(value))
+            elif isinstance(getattr(value, "collection", None), AsyncCollection):
+                value.collection = fake(value.collection)
+    return fakes
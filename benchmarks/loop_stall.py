@@ -0,0 +1,58 @@
+# 📌 benchmarks/loop_stall.py
+# 📌 Blocks the event loop from inside a timed "command" with a synchronous sleep and checks that the
+# 📌 loop watchdog attributes the stall to that command and call site, while normal traffic stays under threshold.
+# 📌 Run from the repository root:  python -m benchmarks.loop_stall --block 0.4 --stalls 3
+# 📌 Exits with code 1 if a stall is missed or misattributed.
+
+import argparse
+import asyncio
+import sys
+import time
+
+from utils import metrics
+from utils.loop_watchdog import LoopWatchdog
+
+async def well_behaved(count: int):
+    """📌 Cooperative work: many short awaits, never blocking."""
+    for _ in range(count):
+        await asyncio.sleep(0.001)
+
+def blocking_call(seconds: float):
+    time.sleep(seconds)  # 📌 Stands in for a synchronous driver call or CPU-heavy handler code
+
+async def slow_command(seconds: float):
+    metrics.start_timing("slowcommand")
+    await asyncio.sleep(0)
+    blocking_call(seconds)
+
+async def run(block: float, stalls: int, threshold: float) -> LoopWatchdog:
+    watchdog = LoopWatchdog(interval=0.05, threshold=threshold)
+    watchdog.start()
+    await asyncio.gather(*(well_behaved(200) for _ in range(20)))
+    for _ in range(stalls):
+        await asyncio.create_task(slow_command(block))
+        await asyncio.sleep(0.2)  # 📌 Let the heartbeat record the stall
+    await watchdog.stop()
+    return watchdog
+
+def main():
+    parser = argparse.ArgumentParser(description="Loop watchdog stall attribution")
+    parser.add_argument("--block", type=float, default=0.4, help="Seconds each stall blocks the loop")
+    parser.add_argument("--stalls", type=int, default=3, help="Number of stalls")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Watchdog capture threshold (seconds)")
+    args = parser.parse_args()
+
+    watchdog = asyncio.run(run(args.block, args.stalls, args.threshold))
+    stats = watchdog.stats()
+    print(f"📌 {watchdog.lag.count} heartbeats  p50={stats['p50'] * 1000:.0f} ms  p99={stats['p99'] * 1000:.0f} ms  "
+          f"worst={stats['max'] * 1000:.0f} ms  stalls={stats['stalls']}")
+    for handler, site, offender in watchdog.top(5):
+        print(f"  {handler:<14} {site:<50} x{offender.count}  worst={offender.worst * 1000:.0f} ms")
+    top = watchdog.top(1)
+    ok = (stats["stalls"] == args.stalls and top and top[0][0] == "slowcommand"
+          and "blocking_call" in top[0][1] and top[0][2].count == args.stalls)
+    print("✅ stalls attributed" if ok else "❌ stall missed or misattributed")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# 📌 benchmarks/member_memory.py
+# 📌 Reports resident memory per 10k guild members for the "full" and "lean" intents profiles.
+# 📌 Feeds a synthetic GUILD_CREATE payload through discord.py's own cache code, without connecting to Discord.
+# 📌 Run from the repository root:  python -m benchmarks.member_memory --members 50000
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+def rss_bytes() -> int:
+    """📌 Current resident set size (Linux /proc), falling back to peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+def guild_payload(members: int, presences: bool) -> dict:
+    """📌 A GUILD_CREATE payload with `members` members holding two roles each."""
+    roles = [
+        {"id": str(i), "name": f"role{i}", "permissions": "0", "position": i, "color": 0,
+         "hoist": False, "managed": False, "mentionable": False}
+        for i in range(1, 4)
+    ]
+    member_data = [
+        {"user": {"id": str(10**17 + i), "username": f"user{i}", "discriminator": "0", "avatar": None, "global_name": None},
+         "roles": ["2", "3"], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+        for i in range(members)
+    ]
+    presence_data = [
+        {"user": {"id": str(10**17 + i)}, "status": "online", "activities": [], "client_status": {"desktop": "online"}}
+        for i in range(members)
+    ] if presences else []
+    return {
+        "id": "1", "name": "benchmark", "roles": roles, "members": member_data, "presences": presence_data,
+        "member_count": members, "channels": [], "threads": [], "emojis": [], "stickers": [], "features": [],
+        "unavailable": False,
+    }
+
+async def measure(members: int) -> dict:
+    """📌 Runs in a child process with INTENTS_PROFILE already set; returns cache sizes and RSS growth."""
+    import discord
+    from utils import member_cache
+
+    client = discord.Client(**member_cache.bot_options())
+    state = client._connection
+    gc.collect()
+    before = rss_bytes()
+    payload = guild_payload(members, presences=not member_cache.LEAN_MODE)
+    # 📌 tracemalloc only counts blocks allocated from here on, i.e. what the cache itself retains.
+    tracemalloc.start()
+    state.parse_guild_create(payload)
+    guild = client.get_guild(1)
+    if member_cache.LEAN_MODE:
+        # 📌 Simulate members interacting with the bot; only the most recent MEMBER_CACHE_SIZE are kept.
+        for data in payload["members"]:
+            member_cache.recent_members.remember(discord.Member(data=data, guild=guild, state=state))
+    del payload
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "cached_members": len(guild.members) + len(member_cache.recent_members),
+        "rss_delta": rss_bytes() - before,
+        "retained": retained,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS per 10k cached members for each intents profile")
+    parser.add_argument("--members", type=int, default=50000, help="Members in the synthetic guild")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args.members))))
+        return
+
+    print(f"📌 Synthetic guild with {args.members} members")
+    for profile in ("full", "lean"):
+        # 📌 Each profile runs in a fresh interpreter so allocations don't leak between measurements.
+        env = dict(os.environ, INTENTS_PROFILE=profile)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.member_memory", "--child", "--members", str(args.members)],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        scale = 10000 / args.members / 2**20
+        print(f"{profile:<5} cached={result['cached_members']:>7}  "
+              f"RSS per 10k guild members={result['rss_delta'] * scale:6.2f} MiB  "
+              f"retained heap per 10k={result['retained'] * scale:6.2f} MiB")
+
+if __name__ == "__main__":
+    main()
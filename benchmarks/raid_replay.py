@@ -0,0 +1,169 @@
+# 📌 benchmarks/raid_replay.py
+# 📌 Replays synthetic member-join streams through the raid detector (utils/raid_detector.py) on a simulated clock:
+# 📌 organic joins spread over many guilds, a launch-day surge of established accounts (must not be flagged),
+# 📌 a raid of fresh accounts and a raid of aged accounts sharing a name pattern (both must be flagged within seconds).
+# 📌 Then a short raid is driven through the RaidProtection cog with RAID_ACTION=timeout against the fake database,
+# 📌 checking the suspects are timed out in batches through MassModeration.
+# 📌 Run from the repository root:  python -m benchmarks.raid_replay --rate 12000 --minutes 5
+# 📌 Exits with code 1 on a missed raid, a slow detection or a flagged surge.
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+
+import discord
+
+import commands.mass_moderation as mass_moderation
+import commands.raid as raid
+from benchmarks.suite import Environment
+from utils.raid_detector import RaidDetector
+
+DAY = 86400
+# 📌 Events are timed in chunks of this many joins; the slowest chunk shows whether any join is expensive.
+CHUNK = 1000
+WORDS = ("free", "nitro", "gift", "promo", "crypto", "drop")
+
+def organic_name(rng: random.Random) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))) + str(rng.randint(0, 99))
+
+def stream(args) -> tuple:
+    """
+    📌 Returns (joins sorted by time, {scenario: (guild_id, start, end, user IDs)}).
+    📌 Each join is (at, guild_id, user_id, name, created_at); `at` starts at 0.
+    """
+    rng = random.Random(args.seed)
+    end = args.minutes * 60
+    joins, user_ids = [], iter(range(1, 10**9))
+    # 📌 Organic traffic: guild sizes follow a power law, ~15% of joiners are new accounts, names are unrelated.
+    weights = [1 / (rank + 1) for rank in range(args.guilds)]
+    guilds = rng.choices(range(args.guilds), weights, k=int(args.rate * args.minutes))
+    for guild_id in guilds:
+        at = rng.uniform(0, end)
+        age = rng.uniform(0, 3 * DAY) if rng.random() < 0.15 else rng.uniform(30 * DAY, 3000 * DAY)
+        joins.append((at, guild_id, next(user_ids), organic_name(rng), at - age))
+
+    scenarios = {}
+
+    def burst(name: str, guild_id: int, start: float, seconds: float, per_second: float, make):
+        members = set()
+        for n in range(int(seconds * per_second)):
+            at = start + n / per_second + rng.uniform(0, 0.01)
+            user_id = next(user_ids)
+            username, created_at = make(at)
+            joins.append((at, guild_id, user_id, username, created_at))
+            members.add(user_id)
+        scenarios[name] = (guild_id, start, start + seconds, members)
+
+    # 📌 Established accounts arriving fast after an announcement.
+    burst("surge", args.guilds + 1, end * 0.2, 30, 25, lambda at: (organic_name(rng), at - rng.uniform(60 * DAY, 2000 * DAY)))
+    # 📌 Fresh accounts with random names (young-account wave).
+    burst("fresh_raid", args.guilds + 2, end * 0.4, 30, 20, lambda at: (organic_name(rng), at - rng.uniform(0, DAY)))
+    # 📌 Bought/aged accounts renamed to one pattern (similar-name wave).
+    burst("named_raid", args.guilds + 3, end * 0.6, 30, 20,
+          lambda at: (f"{rng.choice(WORDS[:1])}_{rng.choice(WORDS[1:2])}{rng.randint(0, 9999)}", at - rng.uniform(200 * DAY, 900 * DAY)))
+    # 📌 The same raid pattern hitting a big, busy guild (guild 0 gets the most organic joins).
+    burst("busy_guild_raid", 0, end * 0.8, 20, 30, lambda at: (f"xX_{rng.choice(WORDS)}_{rng.randint(0, 99)}", at - rng.uniform(0, DAY)))
+    joins.sort()
+    return joins, scenarios
+
+def replay(args) -> bool:
+    joins, scenarios = stream(args)
+    detector = RaidDetector()
+    scenario_of = {guild_id: name for name, (guild_id, *_) in scenarios.items()}
+    first_flag, flagged = {}, {name: set() for name in scenarios}
+    organic_flagged = 0
+    chunk_times = []
+
+    started = time.perf_counter()
+    for chunk_start in range(0, len(joins), CHUNK):
+        chunk_started = time.perf_counter()
+        for at, guild_id, user_id, name, created_at in joins[chunk_start:chunk_start + CHUNK]:
+            detection = detector.observe(guild_id, user_id, name, created_at, at)
+            if detection is None:
+                continue
+            scenario = scenario_of.get(guild_id)
+            if scenario is None:
+                organic_flagged += len(detection.suspects)
+                continue
+            first_flag.setdefault(scenario, at)
+            flagged[scenario].update(detection.suspects)
+        chunk_times.append((time.perf_counter() - chunk_started) / CHUNK)
+    elapsed = time.perf_counter() - started
+
+    # 📌 Memory is measured in a second pass, so tracing doesn't slow the timed one.
+    tracemalloc.start()
+    detector = RaidDetector()
+    for at, guild_id, user_id, name, created_at in joins:
+        detector.observe(guild_id, user_id, name, created_at, at)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_minute = len(joins) / args.minutes
+    print(f"📌 {len(joins):,} joins over {args.minutes} simulated minutes ({per_minute:,.0f}/min) across {args.guilds + 3:,} guilds")
+    print(f"throughput {len(joins) / elapsed:,.0f} joins/s  mean {elapsed / len(joins) * 1e6:.2f} µs/join  "
+          f"worst chunk {max(chunk_times) * 1e6:.2f} µs/join  peak traced memory {peak / 1024:,.0f} KiB  "
+          f"guilds tracked at end {detector.stats()['guilds']:,}")
+
+    ok = True
+    for name, (guild_id, start, end, members) in scenarios.items():
+        caught = flagged[name] & members
+        latency = first_flag[name] - start if name in first_flag else None
+        recall = len(caught) / len(members)
+        innocent = len(flagged[name] - members)
+        print(f"{name:<16} flagged after {'never' if latency is None else f'{latency:.2f}s':>7}  "
+              f"recall {recall:6.1%}  organic joiners flagged {innocent}")
+        if name == "surge":
+            ok &= latency is None
+        else:
+            ok &= latency is not None and latency <= args.max_latency and recall >= 0.95
+    print(f"organic guilds: {organic_flagged} joiners flagged")
+    ok &= organic_flagged == 0
+    return ok
+
+async def end_to_end(raiders: int) -> bool:
+    """📌 A raid through RaidProtection.on_member_join with RAID_ACTION=timeout, against the fake database and REST."""
+    env = Environment(0.0, 0.0)
+    raid.RAID_ACTION, raid.RAID_BATCH_SECONDS = "timeout", 0.05
+    raid.raid_detector = RaidDetector()  # 📌 Fresh state, separate from the replay
+    env.bot.cogs["MassModeration"] = mass_moderation.MassModeration(env.bot)
+    cog = raid.RaidProtection(env.bot)
+    members = []
+    for n in range(raiders):
+        member = env.guild.add_member()
+        member.name = f"promo_gift{n}"
+        member.created_at = discord.utils.utcnow() - timedelta(hours=2)
+        members.append(member)
+    started = time.perf_counter()
+    for member in members:
+        await cog.on_member_join(member)
+    while cog._batches:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    timed_out = sum(member.timed_out_until is not None for member in members)
+    events = len(env.db["mod_events"].docs)
+    lifts = sum(job.startswith("timeout_lift:") for job in env.db["scheduled_jobs"].docs)
+    await env.close()
+    print(f"end to end: {timed_out}/{raiders} raiders timed out in {elapsed:.2f}s, "
+          f"{events} mod log events, {lifts} scheduled lifts, {env.rest.calls} REST calls")
+    return timed_out == raiders and events == timed_out == lifts
+
+def main():
+    parser = argparse.ArgumentParser(description="Raid detector replay on synthetic join streams")
+    parser.add_argument("--rate", type=int, default=12000, help="Organic joins per minute across all guilds")
+    parser.add_argument("--minutes", type=float, default=5, help="Simulated minutes")
+    parser.add_argument("--guilds", type=int, default=5000, help="Guilds receiving organic joins")
+    parser.add_argument("--max-latency", type=float, default=5.0, help="Seconds allowed from raid start to flag")
+    parser.add_argument("--raiders", type=int, default=200, help="Raiders in the end-to-end run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    ok = replay(args)
+    ok &= asyncio.run(end_to_end(args.raiders))
+    print("✅ OK" if ok else "❌ FAILED")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# 📌 benchmarks/runtime_profile.py
+# 📌 Compares the stock and fast runtime profiles (utils/runtime.py) on the same workload: gateway frames are decoded
+# 📌 with discord.py's JSON codec and dispatched as tasks, and every interaction runs a moderation command against
+# 📌 the fake database and REST layer, then encodes its response. Each profile runs in its own process.
+# 📌 Run from the repository root:  python -m benchmarks.runtime_profile --interactions 5000
+# 📌 Missing optional packages (uvloop, orjson) are reported; the fast profile falls back without them.
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+
+# 📌 Gateway frames that aren't interactions (member updates, messages...) decoded per interaction.
+BACKGROUND_FRAMES = 10
+
+def interaction_frame(i: int, guild_id: int, user_id: int) -> dict:
+    """📌 An INTERACTION_CREATE gateway frame shaped like Discord's (a slash command with two options)."""
+    return {"op": 0, "s": i, "t": "INTERACTION_CREATE", "d": {
+        "id": str(10**18 + i), "application_id": "1", "type": 2, "token": "x" * 160, "version": 1,
+        "guild_id": str(guild_id), "channel_id": str(guild_id + 1), "locale": "en-US", "guild_locale": "en-US",
+        "app_permissions": "2251799813685247", "entitlements": [], "authorizing_integration_owners": {"0": str(guild_id)},
+        "context": 0, "data": {"id": "2", "name": "timeout", "type": 1, "options": [
+            {"name": "user", "type": 6, "value": str(user_id)}, {"name": "duration", "type": 3, "value": "10m"}]},
+        "member": {"user": {"id": str(user_id), "username": f"user{i}", "global_name": None, "avatar": None,
+                            "discriminator": "0", "public_flags": 0},
+                   "roles": [str(guild_id + n) for n in range(6)], "joined_at": "2024-01-01T00:00:00.000000+00:00",
+                   "permissions": "2251799813685247", "deaf": False, "mute": False, "flags": 0, "pending": False},
+    }}
+
+def background_frame(i: int, guild_id: int) -> dict:
+    return {"op": 0, "s": i, "t": "GUILD_MEMBER_UPDATE", "d": {
+        "guild_id": str(guild_id), "roles": [str(guild_id + n) for n in range(4)], "nick": None, "avatar": None,
+        "joined_at": "2024-01-01T00:00:00.000000+00:00", "premium_since": None, "pending": False, "flags": 0,
+        "communication_disabled_until": None,
+        "user": {"id": str(10**17 + i), "username": f"member{i}", "global_name": None, "avatar": None, "discriminator": "0"},
+    }}
+
+def _collections() -> int:
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+async def child_main(interactions: int, concurrency: int) -> dict:
+    import discord
+    from benchmarks.suite import Environment, scenarios
+    from utils import runtime
+
+    env = Environment(0.0, 0.0)
+    operations = scenarios(env)
+    command, ban = operations["moderation.timeout"], operations["moderation.ban"]
+    guild_id = env.guild.id
+    # 📌 Pre-encoded with the stdlib so both profiles decode identical bytes.
+    frames = [json.dumps(interaction_frame(i, guild_id, env.target(i).id)) for i in range(256)]
+    background = [json.dumps(background_frame(i, guild_id)) for i in range(256)]
+    runtime.freeze_startup_objects()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def handle(i: int, payload: dict):
+        async with semaphore:
+            await (command if i % 4 else ban)(i)
+            # 📌 The interaction callback body discord.py would send.
+            discord.utils._to_json({"type": 4, "data": {"content": f"done {payload['d']['id']}", "flags": 64}})
+
+    async def run(start: int, count: int):
+        tasks = []
+        for i in range(start, start + count):
+            for n in range(BACKGROUND_FRAMES):
+                discord.utils._from_json(background[(i * BACKGROUND_FRAMES + n) % len(background)])
+            payload = discord.utils._from_json(frames[i % len(frames)])
+            tasks.append(asyncio.create_task(handle(i, payload)))  # 📌 discord.py dispatches each event as a task
+            if len(tasks) >= concurrency * 4:
+                await asyncio.gather(*tasks)
+                tasks.clear()
+        await asyncio.gather(*tasks)
+
+    await run(0, min(interactions, 200))  # 📌 Warm-up
+    collections = _collections()
+    cpu, wall = time.process_time(), time.perf_counter()
+    await run(interactions, interactions)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    await env.close()
+    events = interactions * (BACKGROUND_FRAMES + 1)
+    return {
+        "runtime": runtime.summary(),
+        "events_per_sec": events / wall,
+        "interactions_per_sec": interactions / wall,
+        "cpu_ms_per_1k": cpu / interactions * 1_000_000,
+        "gc_collections": _collections() - collections,
+    }
+
+def run_child(args):
+    from utils import runtime
+    runtime.configure()
+    result = runtime.run(child_main(args.interactions, args.concurrency))
+    print(json.dumps(result))
+
+def run_profile(profile: str, args) -> dict:
+    env = {**os.environ, "RUNTIME_PROFILE": profile}
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.runtime_profile", "--child",
+         "--interactions", str(args.interactions), "--concurrency", str(args.concurrency)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Stock vs fast runtime profile")
+    parser.add_argument("--interactions", type=int, default=5000, help="Interactions per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Interactions handled at once")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per profile (the best is reported)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args)
+
+    print(f"📌 {args.interactions} interactions (+{BACKGROUND_FRAMES} gateway frames each), concurrency {args.concurrency}, best of {args.runs}")
+    results = {}
+    for profile in ("stock", "fast"):
+        runs = [run_profile(profile, args) for _ in range(args.runs)]
+        results[profile] = best = max(runs, key=lambda result: result["events_per_sec"])
+        print(f"{profile:<6} events/s={best['events_per_sec']:>10,.0f}  interactions/s={best['interactions_per_sec']:>8,.0f}  "
+              f"cpu/1k={best['cpu_ms_per_1k']:>7.1f} ms  gc={best['gc_collections']:>5}  [{best['runtime']}]")
+    stock, fast = results["stock"], results["fast"]
+    print(f"📌 fast vs stock: throughput x{fast['events_per_sec'] / stock['events_per_sec']:.2f}, "
+          f"CPU per 1k interactions x{fast['cpu_ms_per_1k'] / stock['cpu_ms_per_1k']:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# 📌 benchmarks/suite.py
+# 📌 Offline benchmark suite: drives the cogs' command callbacks against fake Discord objects and an in-process
+# 📌 Mongo stand-in, reporting throughput, latency percentiles and allocations per scenario.
+# 📌 Run from the repository root:
+# 📌   python -m benchmarks.suite --ops 2000 --concurrency 20 --save baseline.json
+# 📌   python -m benchmarks.suite --compare baseline.json          (exit code 1 on regression)
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+import commands.general as general
+import commands.moderation as moderation
+import commands.owner as owner
+import utils.permissions as permissions
+from benchmarks.fake_discord import FakeBot, FakeGuild, FakeInteraction, FakeREST
+from benchmarks.fake_mongo import install_fake_database
+from utils.scheduler import ExpiryScheduler
+from utils.settings_cache import command_access_id
+from utils.time_utils import convert_time
+
+Operation = Callable[[int], Awaitable[None]]
+
+class Environment:
+    """📌 One fake guild with moderators, targets and the three cogs constructed on a fake bot."""
+    def __init__(self, db_delay: float, rest_delay: float):
+        self.db = install_fake_database(db_delay)
+        self.rest = FakeREST(rest_delay)
+        self.guild = FakeGuild(self.rest)
+        roles = sorted(self.guild.roles, key=lambda role: role.position)
+        self.top_role, self.blacklisted_role, self.temp_role = roles[-1], roles[3], roles[2]
+        # 📌 No allowlist and one blacklisted role, so both the pass and the warning path of the access check run.
+        settings_id = command_access_id(self.guild.id)
+        self.db["bot_settings"].docs[settings_id] = {
+            "_id": settings_id, "guild_id": self.guild.id, "allowlist": [], "blacklist": [self.blacklisted_role.id]
+        }
+        permissions.command_access_cache.invalidate()
+        self.moderator = self.guild.add_member([self.top_role, roles[5]])
+        self.owner = self.guild.add_member([roles[1]])
+        self.targets = [self.guild.add_member([roles[1]]) for _ in range(200)]
+        self.blacklisted = [self.guild.add_member([self.blacklisted_role]) for _ in range(200)]
+        self.bot = FakeBot(self.guild, ExpiryScheduler(self.db["scheduled_jobs"]), self.owner)
+        self.moderation = moderation.Moderation(self.bot)
+        self.general = general.General(self.bot)
+        self.owner_cog = owner.Owner(self.bot)
+
+    async def close(self):
+        await self.owner_cog.cog_unload()
+
+    def round_trips(self) -> int:
+        return sum(collection.round_trips for collection in self.db.values())
+
+    def target(self, i: int):
+        return self.targets[i % len(self.targets)]
+
+def scenarios(env: Environment) -> dict:
+    """📌 name -> operation(i). Each operation builds its own interaction, so any number can run concurrently."""
+    def interaction(user, **data) -> FakeInteraction:
+        return FakeInteraction(user, data)
+
+    async def convert(i: int):
+        convert_time(("15m", "2h", "45s", "7d", "bad")[i % 5])
+
+    async def access_allowed(i: int):
+        await permissions.check_moderation_access(interaction(env.moderator), env.moderator)
+
+    async def access_blacklisted(i: int):
+        member = env.blacklisted[i % len(env.blacklisted)]
+        await permissions.check_moderation_access(interaction(member), member)
+
+    async def timeout(i: int):
+        await env.moderation.timeout.callback(env.moderation, interaction(env.moderator), env.target(i), "10m", "benchmark")
+
+    async def removetimeout(i: int):
+        target = env.target(i)
+        target.timed_out_until = None
+        await target.timeout(timedelta(minutes=10))
+        await env.moderation.removetimeout.callback(env.moderation, interaction(env.moderator), target)
+
+    async def ban(i: int):
+        await env.moderation.ban.callback(env.moderation, interaction(env.moderator), env.target(i), "benchmark")
+
+    async def unban(i: int):
+        # 📌 Banned on Discord but not mirrored yet, so the single-ban lookup path runs too.
+        user_id = 10_000_000 + i
+        env.guild.bans[user_id] = "benchmark"
+        await env.moderation.unban.callback(env.moderation, interaction(env.moderator), str(user_id), "benchmark")
+
+    async def temprole(i: int):
+        await env.moderation.temprole.callback(env.moderation, interaction(env.moderator), env.target(i), env.temp_role, "1h")
+
+    async def userinfo(i: int):
+        await env.moderation.userinfo.callback(env.moderation, interaction(env.moderator), env.target(i))
+
+    async def setting(i: int):
+        await env.general.setting.callback(env.general, interaction(env.moderator))
+
+    async def settings_button(i: int):
+        await general.CommandAccessButton().callback(interaction(env.moderator))
+
+    async def role_picker(i: int):
+        await general.AddAllowlistButton().callback(interaction(env.moderator))
+
+    async def live_embed(i: int):
+        await env.owner_cog.generate_live_embed()
+
+    async def metrics_command(i: int):
+        await env.owner_cog.metrics_command.callback(env.owner_cog, interaction(env.owner))
+
+    return {
+        "convert_time": convert,
+        "check_access.allowed": access_allowed,
+        "check_access.blacklisted": access_blacklisted,
+        "moderation.timeout": timeout,
+        "moderation.removetimeout": removetimeout,
+        "moderation.ban": ban,
+        "moderation.unban": unban,
+        "moderation.temprole": temprole,
+        "moderation.userinfo": userinfo,
+        "general.setting": setting,
+        "general.settings_button": settings_button,
+        "general.role_picker": role_picker,
+        "owner.live_embed": live_embed,
+        "owner.metrics": metrics_command,
+    }
+
+async def drive(operation: Operation, start: int, ops: int, concurrency: int) -> list:
+    """📌 Runs `ops` operations with `concurrency` workers; returns each one's latency in seconds."""
+    latencies = []
+    counter = itertools.count(start)
+    end = start + ops
+
+    async def worker():
+        while (i := next(counter)) < end:
+            started = time.perf_counter()
+            await operation(i)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+def percentile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+async def measure(env: Environment, operation: Operation, ops: int, concurrency: int, allocations: bool) -> dict:
+    """📌 A timed pass, then (optionally) a separate tracemalloc pass so tracing doesn't distort the timings."""
+    await drive(operation, 0, min(ops, 50), concurrency)  # 📌 Warm-up (imports, caches, first-use paths)
+    round_trips, rest_calls = env.round_trips(), env.rest.calls
+    gc.collect()
+    started = time.perf_counter()
+    latencies = await drive(operation, ops, ops, concurrency)
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+    result = {
+        "ops_per_sec": ops / elapsed,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "db_round_trips_per_op": (env.round_trips() - round_trips) / ops,
+        "rest_calls_per_op": (env.rest.calls - rest_calls) / ops,
+    }
+    if allocations:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        await drive(operation, 2 * ops, ops, concurrency)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        diff = after.compare_to(before, "filename")
+        result["peak_kib"] = peak / 1024
+        result["allocated_blocks_per_op"] = sum(stat.count_diff for stat in diff if stat.count_diff > 0) / ops
+        result["retained_bytes_per_op"] = sum(stat.size_diff for stat in diff) / ops
+    return result
+
+async def run(args) -> dict:
+    env = Environment(args.db_delay, args.rest_delay)
+    try:
+        selected = scenarios(env)
+        if args.only:
+            wanted = args.only.split(",")
+            selected = {name: op for name, op in selected.items() if any(name.startswith(w) for w in wanted)}
+        results = {}
+        for name, operation in selected.items():
+            results[name] = await measure(env, operation, args.ops, args.concurrency, not args.no_allocations)
+            report(name, results[name])
+        return results
+    finally:
+        await env.close()
+
+def report(name: str, result: dict):
+    line = (f"{name:<26} {result['ops_per_sec']:10.0f} ops/s  p50={result['p50_ms']:7.3f}  p95={result['p95_ms']:7.3f}  "
+            f"p99={result['p99_ms']:7.3f} ms  db={result['db_round_trips_per_op']:.1f}  rest={result['rest_calls_per_op']:.1f}")
+    if "peak_kib" in result:
+        line += f"  peak={result['peak_kib']:8.1f} KiB  blocks/op={result['allocated_blocks_per_op']:.1f}"
+    print(line)
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """📌 Returns the scenarios whose throughput dropped or p99 grew by more than `threshold` (a fraction)."""
+    regressions = []
+    print(f"\n📌 Compared with baseline {baseline['meta'].get('commit', '?')} (threshold {threshold:.0%})")
+    for name, result in results.items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<26} (new scenario)")
+            continue
+        throughput = result["ops_per_sec"] / old["ops_per_sec"] - 1
+        p99 = result["p99_ms"] / old["p99_ms"] - 1 if old["p99_ms"] else 0.0
+        regressed = throughput < -threshold or p99 > threshold
+        print(f"{name:<26} ops/s {throughput:+7.1%}  p99 {p99:+7.1%}{'  ❌ REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for the bot's commands")
+    parser.add_argument("--ops", type=int, default=2000, help="Measured operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent interactions in flight")
+    parser.add_argument("--db-delay", type=float, default=0.0, help="Simulated MongoDB round-trip time (seconds)")
+    parser.add_argument("--rest-delay", type=float, default=0.0, help="Simulated Discord REST call time (seconds)")
+    parser.add_argument("--only", help="Comma-separated scenario name prefixes (e.g. moderation,convert_time)")
+    parser.add_argument("--no-allocations", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--save", help="Write the results to this baseline JSON file")
+    parser.add_argument("--compare", help="Compare against a baseline JSON file; exits with 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown when comparing")
+    args = parser.parse_args()
+
+    print(f"📌 {args.ops} ops per scenario, concurrency {args.concurrency}, "
+          f"db {args.db_delay * 1000:.1f} ms, rest {args.rest_delay * 1000:.1f} ms")
+    results = asyncio.run(run(args))
+
+    if args.save:
+        meta = {
+            "commit": git_commit(), "python": platform.python_version(), "created": time.time(),
+            "ops": args.ops, "concurrency": args.concurrency, "db_delay": args.db_delay, "rest_delay": args.rest_delay,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"📌 Saved baseline to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# 📌 benchmarks/warning_concurrency.py
+# 📌 Fires hundreds of simultaneous blacklist warnings at one member and checks the counts are exact:
+# 📌 the atomic counter vs the old find_one + update_one pattern, the spam front layer, and decay.
+# 📌 Run from the repository root:  python -m benchmarks.warning_concurrency --calls 500 --delay 0.002
+# 📌 Exits with code 1 if any count is off.
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fake_mongo import FakeCollection
+from utils.user_state import user_query
+from utils.warning_counter import WARNING_LIMIT, SlidingWindow, WarningCounter
+
+GUILD_ID, USER_ID = 1, 2
+
+class JitteryCollection(FakeCollection):
+    """📌 Random per-call latency, so concurrent calls interleave the way real round trips do."""
+    async def _wait(self):
+        self.round_trips += 1
+        await asyncio.sleep(random.uniform(0, self.delay))
+
+async def legacy_warn(collection) -> int:
+    """📌 The previous read-then-write increment, for comparison."""
+    doc = await collection.find_one(user_query(GUILD_ID, USER_ID)) or {}
+    warnings = doc.get("warnings", 0) + 1
+    await collection.update_one(user_query(GUILD_ID, USER_ID), {"$set": {"warnings": warnings}}, upsert=True)
+    return warnings
+
+def check(label: str, expected, actual) -> bool:
+    ok = expected == actual
+    print(f"{'✅' if ok else '❌'} {label:<48} expected={expected!s:<10} actual={actual}")
+    return ok
+
+async def run(calls: int, delay: float) -> bool:
+    ok = True
+
+    legacy = JitteryCollection(delay)
+    await asyncio.gather(*(legacy_warn(legacy) for _ in range(calls)))
+    stored = legacy.docs[user_query(GUILD_ID, USER_ID)["_id"]]["warnings"]
+    print(f"📌 find_one + update_one: {calls} calls stored {stored} warnings ({calls - stored} lost)")
+
+    # 📌 Front layer disabled (huge burst) so every call reaches the atomic increment.
+    counter = WarningCounter(JitteryCollection(delay), front=SlidingWindow(window=60, burst=calls * 2))
+    started = time.perf_counter()
+    strikes = await asyncio.gather(*(counter.warn(GUILD_ID, USER_ID) for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+    stored = counter.collection.docs[user_query(GUILD_ID, USER_ID)["_id"]]["warnings"]
+    ok &= check("atomic: stored count", calls, stored)
+    ok &= check("atomic: timeouts triggered", calls // WARNING_LIMIT, sum(strike.timeout for strike in strikes))
+    expected_numbers = {number: len(range(number, calls + 1, WARNING_LIMIT)) for number in range(1, WARNING_LIMIT + 1)}
+    ok &= check("atomic: each warning number handed out", expected_numbers,
+                {number: sum(strike.number == number for strike in strikes) for number in expected_numbers})
+    print(f"📌 {calls} atomic increments in {elapsed * 1000:.1f} ms ({counter.collection.round_trips} round trips)")
+
+    # 📌 Default front layer: one counted attempt per window, everything else dropped in memory.
+    spam = WarningCounter(JitteryCollection(delay))
+    started = time.perf_counter()
+    strikes = await asyncio.gather(*(spam.warn(GUILD_ID, USER_ID) for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+    ok &= check("front layer: attempts counted", 1, sum(strike is not None for strike in strikes))
+    ok &= check("front layer: database round trips", 1, spam.collection.round_trips)
+    print(f"📌 {calls} spam attempts handled in {elapsed * 1000:.1f} ms")
+
+    # 📌 Decay: a warning after the window restarts the count at 1.
+    decay = WarningCounter(JitteryCollection(delay))
+    now = datetime.now(timezone.utc)
+    await decay.increment(GUILD_ID, USER_ID, now)
+    await decay.increment(GUILD_ID, USER_ID, now + timedelta(seconds=1))
+    after = await decay.increment(GUILD_ID, USER_ID, now + timedelta(seconds=decay.decay + 2))
+    ok &= check("decay: count after the window", 1, after)
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact blacklist warning counts under concurrency")
+    parser.add_argument("--calls", type=int, default=300, help="Simultaneous warnings per check")
+    parser.add_argument("--delay", type=float, default=0.002, help="Maximum simulated MongoDB latency per call (seconds)")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.calls, args.delay)) else 1)
+
+if __name__ == "__main__":
+    main()
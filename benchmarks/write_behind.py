@@ -0,0 +1,66 @@
+# 📌 benchmarks/write_behind.py
+# 📌 Compares raid-style user-document write throughput: direct update_one calls vs the write-behind buffer.
+# 📌 Run from the repository root:  python -m benchmarks.write_behind --writes 5000 --users 200 --delay 0.002
+
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.fake_mongo import FakeCollection
+from utils.write_buffer import WriteBehindBuffer
+
+def raid_updates(writes: int, users: int, seed: int = 1) -> list:
+    """📌 A mix of the bot's real user-document writes, concentrated on `users` documents."""
+    rng = random.Random(seed)
+    shapes = [
+        lambda: {"$set": {"muted": True, "mute_end": "2030-01-01T00:00:00+00:00"},
+                 "$push": {"timeout_history": {"$each": [{"date": "2030-01-01", "reason": "raid"}], "$slice": -20}},
+                 "$inc": {"timeouts_total": 1}},
+        lambda: {"$set": {"muted": False}},
+        lambda: {"$set": {"banned": True, "ban_reason": "raid"}},
+        lambda: {"$inc": {"warnings": 1}},
+    ]
+    return [(rng.randrange(users), rng.choice(shapes)()) for _ in range(writes)]
+
+async def run(buffered: bool, updates: list, delay: float, concurrency: int, interval: float) -> dict:
+    collection = FakeCollection(delay)
+    buffer = WriteBehindBuffer(collection, enabled=buffered, interval=interval)
+    buffer.start()
+    queue = list(reversed(updates))
+
+    async def writer():
+        while queue:
+            user_id, update = queue.pop()
+            await buffer.update_one({"_id": user_id}, update, upsert=True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(concurrency)))
+    acked = time.perf_counter() - started
+    # 📌 Durable time includes the final shutdown flush, so both modes are compared once data is in the database.
+    await buffer.stop()
+    durable = time.perf_counter() - started
+    return {"acked": acked, "durable": durable, "round_trips": collection.round_trips, "docs": collection.docs}
+
+def main():
+    parser = argparse.ArgumentParser(description="Write-behind buffer throughput vs direct writes")
+    parser.add_argument("--writes", type=int, default=5000, help="Total update_one calls")
+    parser.add_argument("--users", type=int, default=200, help="Distinct user documents targeted")
+    parser.add_argument("--delay", type=float, default=0.002, help="Simulated database round-trip time (seconds)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent writers (command handlers)")
+    parser.add_argument("--interval", type=float, default=0.05, help="Write-behind flush interval (seconds)")
+    args = parser.parse_args()
+
+    updates = raid_updates(args.writes, args.users)
+    print(f"📌 {args.writes} writes to {args.users} users, {args.concurrency} writers, {args.delay * 1000:.1f} ms per round trip")
+    results = {}
+    for label, buffered in (("direct", False), ("buffered", True)):
+        result = asyncio.run(run(buffered, updates, args.delay, args.concurrency, args.interval))
+        results[label] = result
+        print(f"{label:<9} {args.writes / result['acked']:10.0f} writes/s acknowledged  "
+              f"{args.writes / result['durable']:10.0f} writes/s durable  round_trips={result['round_trips']}")
+    same = results["direct"]["docs"] == results["buffered"]["docs"]
+    print(f"📌 Final documents identical: {same}")
+
+if __name__ == "__main__":
+    main()
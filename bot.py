@@ -1,10 +1,25 @@
 # 📌 bot.py
 import os
 import discord
-import asyncio
 from discord.ext import commands
 from dotenv import load_dotenv
 from zoneinfo import ZoneInfo
+from utils import database
+from utils.settings_cache import command_access_cache
+from utils.scheduler import ExpiryScheduler
+from utils.ipc import ClusterIPCClient
+from utils import member_cache
+from utils.write_buffer import users_buffer
+from utils import metrics
+from utils.dispatcher import dispatcher
+from utils import startup
+from utils.guild_snapshot import snapshot
+from utils.permission_cache import permission_cache
+from utils.role_index import role_index
+from utils.loop_watchdog import loop_watchdog
+from utils.supervisor import supervisor
+from utils import runtime
+from utils import indexes, modlog
 
 
 
@@ -12,49 +27,154 @@ from zoneinfo import ZoneInfo
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")  # 📌 Your bot token from the Discord Developer Portal
 
-# 📌 Set up intents (adjust as needed; here we use all intents)
-intents = discord.Intents.all()
+# 📌 Sharding / cluster settings. cluster.py sets these for each worker process; all are optional.
+SHARDED = os.getenv("BOT_SHARDED", "0") == "1"  # 📌 Use AutoShardedBot even when running a single process
+SHARD_COUNT = int(os.getenv("SHARD_COUNT")) if os.getenv("SHARD_COUNT") else None  # 📌 None lets Discord recommend
+SHARD_IDS = [int(s) for s in os.getenv("SHARD_IDS").split(",")] if os.getenv("SHARD_IDS") else None
+CLUSTER_ID = int(os.getenv("CLUSTER_ID", "0"))
+IPC_PORT = int(os.getenv("IPC_PORT")) if os.getenv("IPC_PORT") else None
 
-# 📌 Create a Bot instance using the commands.Bot class.
+# 📌 Runtime profile (RUNTIME_PROFILE=stock|fast): JSON codec and GC settings apply before anything is created.
+runtime.configure()
+
+# 📌 Set up intents and member caching. INTENTS_PROFILE=full (default) uses all intents and caches every member;
+# 📌 INTENTS_PROFILE=lean drops presences and keeps only recently interacting members (see utils/member_cache.py).
+bot_options = member_cache.bot_options()
+# 📌 The instrumented tree records per-command latency, Mongo/REST time, errors and late acks.
+bot_options["tree_cls"] = metrics.InstrumentedCommandTree
+# 📌 With a guild snapshot on disk (GUILD_SNAPSHOT_PATH), skip chunking every guild at startup;
+# 📌 the snapshot is reconciled from gateway events instead.
+if snapshot.load():
+    bot_options["chunk_guilds_at_startup"] = False
+
+# 📌 Create a Bot instance. AutoShardedBot runs several gateway shards in this process
+# 📌 (every shard, or only SHARD_IDS when launched as part of a cluster).
 # 📌 The command_prefix is only used for text-based commands; slash commands use the application command tree.
-bot = commands.Bot(command_prefix="!", intents=intents)
+if SHARDED or SHARD_IDS:
+    bot = commands.AutoShardedBot(command_prefix="!", shard_count=SHARD_COUNT, shard_ids=SHARD_IDS, **bot_options)
+else:
+    bot = commands.Bot(command_prefix="!", **bot_options)
+
+def owns_guild(guild_id: int) -> bool:
+    """📌 True if the guild is served by one of this process's shards (always true without a cluster)."""
+    if not SHARD_IDS:
+        return True
+    return (guild_id >> 22) % SHARD_COUNT in SHARD_IDS
 
 # 📌 Set the bot's start time for use in commands (like /info) later.
 # 📌 We use UTC with a timezone-aware datetime.
 bot.start_time = discord.utils.utcnow().replace(tzinfo=ZoneInfo("UTC"))
 
-@bot.event
-async def on_ready():
-    """
-    📌 Called when the bot has connected to Discord and is ready.
-    📌 This function syncs all global slash commands.
-    """
-    print(f"✅ Logged in as {bot.user} ({bot.user.id})")
+# 📌 Durable scheduler for timeout lifts and temporary role removals (handlers are registered by the cogs).
+# 📌 In a cluster each process only loads the jobs of guilds on its own shards.
+bot.scheduler = ExpiryScheduler(database.jobs_collection, job_filter=lambda job: owns_guild(job["guild_id"]))
+
+# 📌 Cross-cluster stats channel to the launcher (only when started by cluster.py).
+bot.ipc = ClusterIPCClient(bot, CLUSTER_ID, IPC_PORT) if IPC_PORT else None
+
+# 📌 Time Discord REST calls and interaction acknowledgements for the metrics.
+metrics.install(bot)
+# 📌 Keep the guild snapshot current from raw gateway events (no-op unless GUILD_SNAPSHOT_PATH is set).
+snapshot.install(bot)
+# 📌 Drop cached moderation access decisions when members, roles or guilds change.
+permission_cache.install(bot)
+# 📌 Keep the settings role picker's sorted role index current from role events.
+role_index.install(bot)
+# 📌 Cancel a cog's background tasks when it is unloaded.
+supervisor.install(bot)
+
+async def sync_commands():
+    """📌 Syncs global slash commands only if their definitions changed (propagation may take up to an hour)."""
+    if CLUSTER_ID != 0:
+        # 📌 The command tree is global, so only the first cluster needs to sync it.
+        return
     try:
-        # 📌 Sync global slash commands. Global commands may take up to an hour to propagate.
-        await bot.tree.sync()
-        print("✅ Global slash commands synced!")
+        if await startup.sync_commands_if_changed(bot):
+            print("✅ Global slash commands synced!")
     except Exception as e:
         print("📌 Error syncing slash commands:", e)
 
-async def load_extensions():
+async def prepare_database():
     """
-    📌 Dynamically loads all command modules from the commands/ folder.
-    📌 Each Python file (except __init__.py) in this folder is loaded as an extension (Cog).
+    📌 Creates the mod log collection, then every index declared in utils/indexes.py (both idempotent).
+    📌 Runs as a warmup, so an unreachable database is logged instead of failing extension loading.
     """
-    for filename in os.listdir("./commands"):
-        if filename.endswith(".py") and filename != "__init__.py":
-            extension = f"commands.{filename[:-3]}"
-            await bot.load_extension(extension)
-            print(f"📌 Loaded extension: {extension}")
+    await modlog.ensure_collection()
+    await indexes.ensure_all()
+
+# 📌 Non-critical startup work, run in the background after on_ready so interactions are served immediately.
+startup.register_warmup("command_sync", sync_commands)
+startup.register_warmup("database", prepare_database)
+
+@bot.event
+async def on_ready():
+    """
+    📌 Called when the bot has connected to Discord and is ready (again after a full reconnect).
+    📌 Starts the background services, then kicks off the warmups once per process.
+    """
+    print(f"✅ Logged in as {bot.user} ({bot.user.id})")
+    # 📌 Follow settings changes made by other bot processes (no-op unless SETTINGS_CACHE_WATCH=1).
+    command_access_cache.start_watching()
+    # 📌 Reload pending expirations and catch up on any that became due while offline.
+    await bot.scheduler.start()
+    if bot.ipc:
+        bot.ipc.start()
+    if "ready" not in startup.timer.stages:
+        startup.timer.record("ready", startup.timer.since_start())
+        bot.warmup_task = supervisor.spawn(startup.run_warmups(), "warmups", owner="startup", essential=True)
+
+@bot.listen("on_interaction")
+async def remember_interacting_member(interaction: discord.Interaction):
+    """📌 Lean mode: keep members who use the bot in the small recent-member cache (and the guild snapshot)."""
+    if not isinstance(interaction.user, discord.Member):
+        return
+    if member_cache.LEAN_MODE:
+        member_cache.recent_members.remember(interaction.user)
+    snapshot.observe_member(interaction.user)
 
 async def main():
     """
     📌 Main entry point: load extensions and start the bot.
     """
     async with bot:
-        await load_extensions()
-        await bot.start(TOKEN)
+        metrics_server = None
+        try:
+            # 📌 Explicit REST connection pool limits (fast profile or HTTP_POOL_* settings), set before login opens the session.
+            connector = runtime.connector()
+            if connector is not None:
+                bot.http.connector = connector
+            users_buffer.start()  # 📌 No-op unless WRITE_BEHIND=1
+            # 📌 Event-loop lag histogram and capture of whatever blocks the loop (logged, shown on /liveinfo).
+            loop_watchdog.start()
+            # 📌 Local Prometheus endpoint (only when METRICS_PORT is set).
+            metrics_server = await metrics.start_http_server()
+            # 📌 Prioritised outbound queue for moderation actions, notices and panel edits.
+            dispatcher.start()
+            # 📌 Periodic guild snapshot writes (only when GUILD_SNAPSHOT_PATH is set).
+            snapshot.start()
+            # 📌 Every module in commands/ is an extension (Cog); they are imported and set up concurrently.
+            await startup.load_extensions(bot)
+            # 📌 Startup objects live for the whole process; freezing them keeps them out of every later GC pass.
+            runtime.freeze_startup_objects()
+            print(f"📌 Runtime: {runtime.summary()}")
+            await bot.start(TOKEN)
+        finally:
+            await bot.scheduler.stop()
+            # 📌 Final snapshot write, so the next start can skip chunking.
+            await snapshot.stop()
+            # 📌 Best-effort drain of queued actions and pending notification digests.
+            await dispatcher.stop()
+            await loop_watchdog.stop()
+            if metrics_server:
+                await metrics_server.cleanup()
+            if bot.ipc:
+                await bot.ipc.stop()
+            # 📌 Guaranteed flush of buffered user writes before the client closes.
+            await users_buffer.stop()
+            # 📌 Anything still running (warmups, the settings change stream, cog tasks) is cancelled before the client closes.
+            await supervisor.cancel()
+            # 📌 Close the async MongoDB client once the bot stops.
+            await database.close()
 
-# 📌 Run the main function using asyncio.
-asyncio.run(main())
+# 📌 Run the main function using asyncio (on uvloop when the runtime profile enables it and it's installed).
+runtime.run(main())
@@ -0,0 +1,84 @@
+# 📌 cluster.py
+# 📌 Multi-process launcher: splits the bot's shards across N worker processes running bot.py.
+# 📌 Usage:  python cluster.py --clusters 4            (shard count recommended by Discord)
+# 📌         python cluster.py --clusters 4 --shards 16
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+
+import aiohttp
+from dotenv import load_dotenv
+
+from utils.ipc import ClusterIPCServer
+
+# 📌 Load environment variables from the .env file
+load_dotenv()
+TOKEN = os.getenv("DISCORD_TOKEN")
+
+# 📌 Discord allows `max_concurrency` IDENTIFYs per 5 seconds.
+IDENTIFY_WINDOW = 5.0
+# 📌 Seconds to wait before restarting a worker that exited.
+RESTART_DELAY = 10.0
+
+async def fetch_gateway_info() -> dict:
+    """📌 Asks Discord for the recommended shard count and identify concurrency."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            "https://discord.com/api/v10/gateway/bot", headers={"Authorization": f"Bot {TOKEN}"}
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+def shard_ranges(shard_count: int, clusters: int) -> list:
+    """📌 Splits shard IDs 0..shard_count-1 into `clusters` contiguous, near-equal ranges."""
+    per_cluster = math.ceil(shard_count / clusters)
+    return [list(range(start, min(start + per_cluster, shard_count))) for start in range(0, shard_count, per_cluster)]
+
+async def run_worker(cluster_id: int, shard_ids: list, shard_count: int, ipc_port: int, start_delay: float):
+    """📌 Runs one bot.py process for a shard range and restarts it if it exits."""
+    await asyncio.sleep(start_delay)
+    env = dict(
+        os.environ,
+        CLUSTER_ID=str(cluster_id),
+        SHARD_IDS=",".join(map(str, shard_ids)),
+        SHARD_COUNT=str(shard_count),
+        IPC_PORT=str(ipc_port),
+    )
+    while True:
+        print(f"📌 Starting cluster {cluster_id} with shards {shard_ids[0]}-{shard_ids[-1]}")
+        process = await asyncio.create_subprocess_exec(sys.executable, "bot.py", env=env)
+        code = await process.wait()
+        print(f"❌ Cluster {cluster_id} exited with code {code}, restarting in {RESTART_DELAY:.0f}s")
+        await asyncio.sleep(RESTART_DELAY)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run the bot as several sharded worker processes")
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--shards", type=int, default=None, help="Total shard count (default: Discord's recommendation)")
+    args = parser.parse_args()
+
+    gateway = await fetch_gateway_info()
+    shard_count = args.shards or gateway["shards"]
+    max_concurrency = gateway.get("session_start_limit", {}).get("max_concurrency", 1)
+    ranges = shard_ranges(shard_count, min(args.clusters, shard_count))
+
+    server = ClusterIPCServer()
+    ipc_port = await server.start()
+    print(f"📌 {shard_count} shards across {len(ranges)} clusters (IPC on port {ipc_port})")
+
+    # 📌 Stagger workers so their IDENTIFYs don't exceed Discord's session start rate limit.
+    workers = []
+    delay = 0.0
+    for cluster_id, shard_ids in enumerate(ranges):
+        workers.append(run_worker(cluster_id, shard_ids, shard_count, ipc_port, delay))
+        delay += math.ceil(len(shard_ids) / max_concurrency) * IDENTIFY_WINDOW
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,16 +1,20 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from utils.database import settings_collection
+from utils.settings_cache import CommandAccess, command_access_cache
+from utils.member_cache import resolve_member
+from utils.permission_cache import permission_cache
+from utils.role_index import count_matches, page_entries, role_index, role_key
+from utils.metrics import InstrumentedView
 
 # -------------------- UI VIEWS --------------------
-class SettingsView(discord.ui.View):
+class SettingsView(InstrumentedView):
     """📌 Main settings view with buttons for different settings."""
     def __init__(self):
         super().__init__(timeout=None)
         self.add_item(CommandAccessButton())
 
-class CommandAccessView(discord.ui.View):
+class CommandAccessView(InstrumentedView):
     """📌 View for Command Access settings (Shows info + buttons)."""
     def __init__(self):
         super().__init__(timeout=None)
@@ -20,11 +24,11 @@ class CommandAccessView(discord.ui.View):
         self.add_item(RemoveBlacklistButton())
 
     @staticmethod
-    def get_embed():
-        """📌 Fetches and returns the current Command Access settings embed."""
-        data = settings_collection.find_one({"_id": "command_access"}) or {}
-        allowed_roles = data.get("allowlist", [])
-        blacklisted_roles = data.get("blacklist", [])
+    async def get_embed(guild_id: int):
+        """📌 Fetches and returns the guild's current Command Access settings embed."""
+        access = await command_access_cache.get(guild_id)
+        allowed_roles = access.allowlist
+        blacklisted_roles = access.blacklist
 
         embed = discord.Embed(title="🔧 Command Access Settings", color=discord.Color.blue())
         embed.add_field(name="✅ Allowed Roles", value='\n'.join(f"<@&{r}>" for r in allowed_roles) or "None", inline=False)
@@ -39,7 +43,7 @@ class CommandAccessButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         """📌 Displays the command access settings."""
-        embed = CommandAccessView.get_embed()
+        embed = await CommandAccessView.get_embed(interaction.guild.id)
         await interaction.response.edit_message(embed=embed, view=CommandAccessView())
 
 class RoleManagementButton(discord.ui.Button):
@@ -51,7 +55,8 @@ class RoleManagementButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         """📌 Opens the role selection dropdown for allowlist or blacklist."""
-        view = RoleSelectionView(self.role_type, self.remove, interaction.guild)
+        access = await command_access_cache.get(interaction.guild.id)
+        view = RoleSelectionView(self.role_type, self.remove, interaction.guild, access)
         await interaction.response.edit_message(view=view)
 
 class AddAllowlistButton(RoleManagementButton):
@@ -75,40 +80,102 @@ class RemoveBlacklistButton(RoleManagementButton):
         super().__init__("❌ Remove Blacklist Role", discord.ButtonStyle.danger, "blacklist", True)
 
 # -------------------- ROLE SELECTION DROPDOWN --------------------
-class RoleSelectionView(discord.ui.View):
-    """📌 View containing dropdown for selecting roles + confirm button."""
-    def __init__(self, role_type: str, remove: bool, guild: discord.Guild):
-        super().__init__(timeout=60)
+class RoleSelectionView(InstrumentedView):
+    """
+    📌 Paged, searchable role picker for allowlist or blacklist management (any number of roles, 25 per page).
+    📌 Adding pages through the guild's role index; removing pages through the roles already on the list.
+    📌 Selections are kept across pages and searches until Confirm.
+    """
+    def __init__(self, role_type: str, remove: bool, guild: discord.Guild, access: CommandAccess):
+        super().__init__(timeout=180)
         self.role_type = role_type
         self.remove = remove
-        self.add_item(RoleDropdown(role_type, remove, guild))
-        self.add_item(ConfirmButton(role_type, remove))
+        self.guild = guild
+
+        # 📌 `access` is the cached command access snapshot, fetched by the caller (constructors can't await).
+        current = access.allowlist if role_type == "allowlist" else access.blacklist
+        other = access.blacklist if role_type == "allowlist" else access.allowlist
+        if remove:
+            # 📌 Lists are short, so only their own roles are sorted.
+            self.entries = sorted(role_key(role) for role in map(guild.get_role, current) if role)
+            self.exclude = frozenset()
+        else:
+            self.entries = role_index.entries(guild)
+            # 📌 Skip roles already on this list, and roles on the other list (prevents conflicts).
+            self.exclude = frozenset(current) | frozenset(other)
+        self.query = ""
+        self.starts = [None]  # 📌 Start key of every page so far, so ◀ can go back
+        self.next_start = None
+        self.selected = set()
+        self.render()
+
+    def render(self):
+        """📌 Rebuilds the items for the current page (one binary search plus at most a page of roles)."""
+        role_ids, self.next_start = page_entries(self.entries, self.query, self.starts[-1], exclude=self.exclude)
+        roles = [role for role in map(self.guild.get_role, role_ids) if role]
+        placeholder = f"Select roles to {'remove' if self.remove else 'add'} · page {len(self.starts)}"
+        if self.query:
+            placeholder += f" · “{self.query}” ({count_matches(self.entries, self.query)} matches)"
+        self.clear_items()
+        self.add_item(RoleDropdown(roles, self.selected, placeholder[:150]))
+        self.add_item(PageButton("◀ Previous", -1, disabled=len(self.starts) == 1))
+        self.add_item(PageButton("Next ▶", 1, disabled=self.next_start is None))
+        self.add_item(SearchButton())
+        self.add_item(ConfirmButton(self.role_type, self.remove))
 
 class RoleDropdown(discord.ui.Select):
-    """📌 Dropdown to select multiple roles for allowlist or blacklist management."""
-    def __init__(self, role_type: str, remove: bool, guild: discord.Guild):
-        self.role_type = role_type
-        self.remove = remove
+    """📌 Dropdown with one page of roles; ticks reflect selections made earlier."""
+    def __init__(self, roles: list, selected: set, placeholder: str):
+        self.page_ids = {role.id for role in roles}
+        options = [discord.SelectOption(label=role.name, value=str(role.id), default=role.id in selected) for role in roles]
+        if not options:
+            # 📌 Discord requires at least one option; the menu is disabled instead.
+            options = [discord.SelectOption(label="No matching roles", value="none")]
+        super().__init__(placeholder=placeholder, options=options, min_values=0, max_values=len(options), disabled=not roles)
 
-        data = settings_collection.find_one({"_id": "command_access"}) or {}
-        allowlist_roles = set(data.get("allowlist", []))
-        blacklist_roles = set(data.get("blacklist", []))
+    async def callback(self, interaction: discord.Interaction):
+        """📌 Records this page's selection; selections on other pages are kept."""
+        self.view.selected -= self.page_ids
+        self.view.selected |= {int(value) for value in self.values}
+        await interaction.response.defer()
 
-        # Get valid roles based on type
-        if remove:
-            options = [
-                discord.SelectOption(label=guild.get_role(int(role)).name, value=str(role))
-                for role in (allowlist_roles if role_type == "allowlist" else blacklist_roles)
-                if guild.get_role(int(role))
-            ]
-        else:
-            options = [
-                discord.SelectOption(label=role.name, value=str(role.id))
-                for role in guild.roles
-                if str(role.id) not in (blacklist_roles if role_type == "allowlist" else allowlist_roles)  # Prevent conflicts
-            ]
+class PageButton(discord.ui.Button):
+    """📌 Moves the role picker one page forward or back."""
+    def __init__(self, label: str, step: int, disabled: bool):
+        super().__init__(label=label, style=discord.ButtonStyle.secondary, disabled=disabled)
+        self.step = step
+
+    async def callback(self, interaction: discord.Interaction):
+        view = self.view
+        if self.step > 0:
+            view.starts.append(view.next_start)
+        elif len(view.starts) > 1:
+            view.starts.pop()
+        view.render()
+        await interaction.response.edit_message(view=view)
+
+class RoleSearchModal(discord.ui.Modal, title="Search Roles"):
+    """📌 Filters the role picker to names starting with the entered text."""
+    query = discord.ui.TextInput(label="Role name starts with", required=False, max_length=100)
+
+    def __init__(self, picker: RoleSelectionView):
+        super().__init__()
+        self.picker = picker
+        self.query.default = picker.query
+
+    async def on_submit(self, interaction: discord.Interaction):
+        self.picker.query = self.query.value.strip()
+        self.picker.starts = [None]
+        self.picker.render()
+        await interaction.response.edit_message(view=self.picker)
+
+class SearchButton(discord.ui.Button):
+    """📌 Opens the role search prompt."""
+    def __init__(self):
+        super().__init__(label="🔍 Search", style=discord.ButtonStyle.secondary)
 
-        super().__init__(placeholder=f"Select roles to {'remove' if remove else 'add'}", options=options, min_values=1, max_values=len(options))
+    async def callback(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(RoleSearchModal(self.view))
 
 class ConfirmButton(discord.ui.Button):
     """📌 Button to confirm role selection and update the database."""
@@ -119,18 +186,13 @@ class ConfirmButton(discord.ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         """📌 Updates the allowlist or blacklist roles based on selection."""
-        selected_roles = [int(role) for role in interaction.data['values']]
-        data = settings_collection.find_one({"_id": "command_access"}) or {}
-        roles = set(data.get(self.role_type, []))
-
-        if self.remove:
-            roles -= set(selected_roles)
-        else:
-            roles |= set(selected_roles)
-
-        settings_collection.update_one({"_id": "command_access"}, {"$set": {self.role_type: list(roles)}}, upsert=True)
+        selected_roles = sorted(self.view.selected)
+        if not selected_roles:
+            return await interaction.response.send_message("⚠️ Select at least one role first.", ephemeral=True)
+        # 📌 Atomic $addToSet/$pull write that also refreshes the settings cache.
+        await command_access_cache.update_roles(interaction.guild.id, self.role_type, selected_roles, self.remove)
         
-        embed = CommandAccessView.get_embed()
+        embed = await CommandAccessView.get_embed(interaction.guild.id)
         await interaction.response.edit_message(embed=embed, view=CommandAccessView())
 
 # -------------------- COMMANDS --------------------
@@ -143,9 +205,12 @@ class General(commands.Cog):
         """
         📌 The /setting command displays settings UI but restricts access to the top 2 roles.
         """
-        highest_roles = sorted(interaction.guild.roles, key=lambda r: r.position, reverse=True)[:2]
+        # 📌 Precomputed per guild and refreshed on role changes, instead of sorting every role on each call.
+        highest_role_ids = permission_cache.top_roles(interaction.guild)
+        member = await resolve_member(interaction.guild, interaction.user)
         
-        if not any(role in interaction.user.roles for role in highest_roles):
+        # 📌 @everyone isn't among a member's own roles, but every member has it (as member.roles reports).
+        if member is None or not any(role_id == interaction.guild.id or member.get_role(role_id) for role_id in highest_role_ids):
             return await interaction.response.send_message("❌ Only the top two highest roles can access settings!", ephemeral=True)
         
         await interaction.response.send_message("⚙️ **Bot Settings:**", view=SettingsView(), ephemeral=True)
@@ -0,0 +1,221 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from datetime import timedelta
+
+# 📌 Import helper functions and database collections from utils
+from utils.time_utils import convert_time
+from utils.permissions import check_moderation_access
+from utils.database import users_collection, timeout_days_collection
+from utils.member_cache import get_or_fetch_member
+from utils.timeout_history import timeout_record_ops
+from utils.write_buffer import users_buffer
+from utils.user_state import user_update_op
+from utils import modlog
+from utils.dispatcher import Priority, dispatcher, guild_bucket
+from utils.bulk_actions import (
+    BULK_BAN_CHUNK, MAX_TARGETS, BulkResult, ProgressReporter,
+    parse_user_ids, run_bulk, select_members, summary,
+)
+
+# 📌 MassModeration Cog: raid-response versions of /timeout, /ban and /unban.
+class MassModeration(commands.Cog):
+    """
+    📌 Bulk moderation commands that act on many users at once.
+    📌 Discord calls go through a bounded worker pool and database state is committed with one bulk_write.
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    async def _collect_targets(self, interaction: discord.Interaction, users: str,
+                               role: discord.Role = None, joined_within: str = None):
+        """
+        📌 Merges explicit IDs/mentions with the optional role and join-time filters.
+        📌 Returns (targets, error message); the invoker and the bot are never targeted.
+        """
+        targets = parse_user_ids(users)
+        if role is not None or joined_within:
+            window = None
+            if joined_within:
+                window = convert_time(joined_within)
+                if window is None:
+                    return None, "❌ Invalid `joined_within` format! Use `1h`, `30m`, or `45s`."
+            targets += await select_members(interaction.guild, role, window)
+        excluded = {interaction.user.id, self.bot.user.id}
+        targets = [user_id for user_id in dict.fromkeys(targets) if user_id not in excluded]
+        if not targets:
+            return None, "⚠️ No matching users found."
+        if len(targets) > MAX_TARGETS:
+            return None, f"❌ Too many targets ({len(targets)}). The limit is {MAX_TARGETS} per command."
+        return targets, None
+
+    async def _start_progress(self, interaction: discord.Interaction, label: str, total: int) -> ProgressReporter:
+        message = await interaction.followup.send(f"⏳ {label}: `0/{total}` processed", ephemeral=True, wait=True)
+        return ProgressReporter(message, label, total)
+
+    async def timeout_members(self, guild: discord.Guild, targets: list, seconds: int, reason: str,
+                              actor_id: int = None, progress: ProgressReporter = None) -> BulkResult:
+        """
+        📌 Times out `targets` through the worker pool and commits the successes in one batch:
+        📌 timeout records, scheduled lifts and mod log events. Shared by /masstimeout and raid protection.
+        """
+        now = discord.utils.utcnow()
+        until = now + timedelta(seconds=seconds)
+
+        async def apply(user_id: int):
+            member = await get_or_fetch_member(guild, user_id)
+            if member is None:
+                raise ValueError("not a member of this server")
+            await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(guild), lambda: member.timeout(until, reason=reason))
+
+        result = await run_bulk(targets, apply, progress)
+
+        # 📌 Commit every successful timeout with one bulk_write per collection, then schedule the lifts.
+        if result.succeeded:
+            await users_buffer.flush()  # 📌 Keep per-user write order with any buffered updates
+            ops = [timeout_record_ops(guild.id, user_id, now, reason, {"muted": True, "mute_end": until.isoformat()})
+                   for user_id in result.succeeded]
+            await timeout_days_collection.bulk_write([bucket for bucket, _ in ops], ordered=False)
+            await users_collection.bulk_write([user for _, user in ops], ordered=False)
+            await self.bot.scheduler.schedule_many([
+                {"_id": f"timeout_lift:{guild.id}:{user_id}", "kind": "timeout_lift", "due": until,
+                 "guild_id": guild.id, "user_id": user_id}
+                for user_id in result.succeeded
+            ])
+            await modlog.record_many([
+                modlog.event(guild.id, "timeout", user_id, actor_id=actor_id, reason=reason,
+                             duration=timedelta(seconds=seconds))
+                for user_id in result.succeeded
+            ])
+        return result
+
+    @app_commands.describe(
+        users="User IDs or mentions, separated by spaces or commas",
+        duration="Duration (e.g., 1h, 30m, 45s)",
+        reason="Reason for timeout",
+        role="Also target every member with this role",
+        joined_within="Also target members who joined within this time (e.g., 10m)",
+    )
+    @app_commands.command(name="masstimeout", description="Timeout many users at once (Moderation)")
+    async def masstimeout(self, interaction: discord.Interaction, duration: str, users: str = "",
+                          reason: str = "No reason provided", role: discord.Role = None, joined_within: str = None):
+        """
+        📌 The /masstimeout command times out every target and records all of them in one database batch.
+        """
+        if not await check_moderation_access(interaction, interaction.user):
+            return
+        if not interaction.user.guild_permissions.moderate_members:
+            return await interaction.response.send_message("❌ You don’t have permission to timeout users!", ephemeral=True)
+        time_in_seconds = convert_time(duration)
+        if time_in_seconds is None:
+            return await interaction.response.send_message("❌ Invalid time format! Use `1h`, `30m`, or `45s`.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+
+        targets, error = await self._collect_targets(interaction, users, role, joined_within)
+        if error:
+            return await interaction.followup.send(error, ephemeral=True)
+
+        progress = await self._start_progress(interaction, "Mass timeout", len(targets))
+        result = await self.timeout_members(interaction.guild, targets, time_in_seconds, reason,
+                                            actor_id=interaction.user.id, progress=progress)
+        await progress.finish(summary(f"Mass timeout for `{duration}`", result))
+
+    @app_commands.describe(
+        users="User IDs or mentions, separated by spaces or commas",
+        reason="Reason for ban",
+        role="Also target every member with this role",
+        joined_within="Also target members who joined within this time (e.g., 10m)",
+    )
+    @app_commands.command(name="massban", description="Ban many users at once (Moderation)")
+    async def massban(self, interaction: discord.Interaction, users: str = "", reason: str = "No reason provided",
+                      role: discord.Role = None, joined_within: str = None):
+        """
+        📌 The /massban command bans every target using Discord's bulk-ban endpoint (200 users per request).
+        """
+        if not await check_moderation_access(interaction, interaction.user):
+            return
+        if not interaction.user.guild_permissions.ban_members:
+            return await interaction.response.send_message("❌ You don’t have permission to ban users!", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+
+        targets, error = await self._collect_targets(interaction, users, role, joined_within)
+        if error:
+            return await interaction.followup.send(error, ephemeral=True)
+
+        guild = interaction.guild
+        progress = await self._start_progress(interaction, "Mass ban", len(targets))
+        result = BulkResult([], {})
+        for start in range(0, len(targets), BULK_BAN_CHUNK):
+            chunk = targets[start:start + BULK_BAN_CHUNK]
+            try:
+                banned = await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(guild), lambda: guild.bulk_ban(
+                    [discord.Object(user_id) for user_id in chunk], reason=reason, delete_message_seconds=0
+                ))
+            except discord.HTTPException:
+                # 📌 Bulk ban needs Manage Server; fall back to individual bans through the worker pool.
+                chunk_result = await run_bulk(chunk, lambda user_id: dispatcher.submit(
+                    Priority.ENFORCEMENT, guild_bucket(guild), lambda: guild.ban(discord.Object(user_id), reason=reason)
+                ), progress)
+                result.succeeded.extend(chunk_result.succeeded)
+                result.failed.update(chunk_result.failed)
+                continue
+            result.succeeded.extend(user.id for user in banned.banned)
+            result.failed.update({user.id: "ban failed" for user in banned.failed})
+            for user in banned.banned:
+                await progress.advance(True)
+            for user in banned.failed:
+                await progress.advance(False)
+
+        if result.succeeded:
+            await users_buffer.flush()
+            await users_collection.bulk_write([
+                user_update_op(guild.id, user_id, {"$set": {"banned": True, "ban_reason": reason}})
+                for user_id in result.succeeded
+            ], ordered=False)
+            await modlog.record_many([
+                modlog.event(guild.id, "ban", user_id, actor_id=interaction.user.id, reason=reason)
+                for user_id in result.succeeded
+            ])
+        await progress.finish(summary("Mass ban", result))
+
+    @app_commands.describe(users="User IDs separated by spaces or commas", reason="Reason for unban (optional)")
+    @app_commands.command(name="massunban", description="Unban many users at once by ID (Moderation)")
+    async def massunban(self, interaction: discord.Interaction, users: str, reason: str = "No reason provided"):
+        """
+        📌 The /massunban command unbans every listed user ID through the worker pool.
+        """
+        if not await check_moderation_access(interaction, interaction.user):
+            return
+        if not interaction.user.guild_permissions.ban_members:
+            return await interaction.response.send_message("⛔ You don’t have permission to unban users!", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+
+        targets, error = await self._collect_targets(interaction, users)
+        if error:
+            return await interaction.followup.send(error, ephemeral=True)
+
+        guild = interaction.guild
+
+        async def apply(user_id: int):
+            try:
+                await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(guild), lambda: guild.unban(discord.Object(user_id), reason=reason))
+            except discord.NotFound:
+                raise ValueError("not currently banned")
+
+        progress = await self._start_progress(interaction, "Mass unban", len(targets))
+        result = await run_bulk(targets, apply, progress)
+        if result.succeeded:
+            await users_buffer.flush()
+            await users_collection.bulk_write([
+                user_update_op(guild.id, user_id, {"$set": {"banned": False}}, upsert=False)
+                for user_id in result.succeeded
+            ], ordered=False)
+            await modlog.record_many([
+                modlog.event(guild.id, "unban", user_id, actor_id=interaction.user.id, reason=reason)
+                for user_id in result.succeeded
+            ])
+        await progress.finish(summary("Mass unban", result))
+
+# 📌 Setup function to add this Cog to the bot.
+async def setup(bot: commands.Bot):
+    await bot.add_cog(MassModeration(bot))
@@ -1,17 +1,26 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 from datetime import datetime, timedelta, timezone
-import asyncio
 import re
+import os
 
 # 📌 Import helper functions and database collections from utils
 from utils.time_utils import convert_time
 from utils.permissions import check_moderation_access
 from utils.database import users_collection, roles_collection
+from utils.user_state import get_user, update_user
+from utils.member_cache import get_or_fetch_member, member_details
+from utils.timeout_history import record_timeout, count_recent_timeouts
+from utils import ban_index, modlog
+from utils.metrics import InstrumentedView
+from utils.dispatcher import Priority, dispatcher, guild_bucket
+
+# 📌 How often the local ban mirror is reconciled against each guild's ban list.
+BAN_RECONCILE_HOURS = float(os.getenv("BAN_RECONCILE_HOURS", "12"))
 
 # 📌 A view containing a button to copy the User ID.
-class CopyUserIDView(discord.ui.View):
+class CopyUserIDView(InstrumentedView):
     def __init__(self, user_id: int):
         super().__init__(timeout=None)
         self.user_id = user_id
@@ -31,6 +40,42 @@ class Moderation(commands.Cog):
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # 📌 Expirations are persisted by the bot-wide scheduler; these handlers run when they become due.
+        bot.scheduler.register("timeout_lift", self.expire_timeout)
+        bot.scheduler.register("role_removal", self.expire_temprole)
+
+    async def cog_load(self):
+        """📌 Starts ban reconciliation (collections and indexes are created by the "database" warmup in bot.py)."""
+        self.reconcile_bans.change_interval(hours=BAN_RECONCILE_HOURS)
+        self.reconcile_bans.start()
+
+    async def cog_unload(self):
+        """📌 Stops the reconciliation task when the cog is unloaded."""
+        self.reconcile_bans.cancel()
+
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild: discord.Guild, user: discord.User):
+        """📌 Keeps the ban mirror in sync with bans made by this bot, other bots or the Discord client."""
+        await ban_index.record_ban(guild.id, user.id)
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild: discord.Guild, user: discord.User):
+        await ban_index.record_unban(guild.id, user.id)
+
+    @tasks.loop(hours=12)
+    async def reconcile_bans(self):
+        """📌 Periodically repairs the ban mirror (missed events, downtime) by diffing it against Discord in pages."""
+        for guild in list(self.bot.guilds):
+            if not guild.me.guild_permissions.ban_members:
+                continue
+            try:
+                await ban_index.reconcile_guild(guild)
+            except discord.HTTPException as e:
+                print(f"Error reconciling bans for guild {guild.id}: {e}")
+
+    @reconcile_bans.before_loop
+    async def before_reconcile_bans(self):
+        await self.bot.wait_until_ready()
 
     @app_commands.describe(user="User to timeout", duration="Duration (e.g., 1h, 30m, 45s)", reason="Reason for timeout")
     @app_commands.command(name="timeout", description="Timeout a user (Moderation)")
@@ -52,37 +97,55 @@ class Moderation(commands.Cog):
         until = now + timedelta(seconds=time_in_seconds)
 
         try:
-            await user.timeout(until, reason=reason)
+            await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(user.guild), lambda: user.timeout(until, reason=reason))
         except Exception as e:
             return await interaction.followup.send(f"❌ Failed to timeout user: {e}", ephemeral=True)
 
-        # 📌 Update the database with timeout details.
-        users_collection.update_one(
-            {"_id": user.id},
-            {"$set": {"muted": True, "mute_end": until.isoformat()},
-             "$push": {"timeout_history": {"date": now.strftime("%Y-%m-%d"), "reason": reason}}},
-            upsert=True
-        )
+        # 📌 Update the database with timeout details (per-day counter + capped recent history).
+        await record_timeout(interaction.guild.id, user.id, now, reason, {"muted": True, "mute_end": until.isoformat()})
+        await modlog.record(interaction.guild.id, "timeout", user.id, actor_id=interaction.user.id, reason=reason,
+                            duration=timedelta(seconds=time_in_seconds))
 
         await interaction.followup.send(f"🔇 {user.mention} has been timed out for `{duration}`. Reason: `{reason}`")
 
-        # 📌 Schedule a background task to remove the timeout after the specified duration.
-        self.bot.loop.create_task(self.remove_timeout_after(user, time_in_seconds))
+        # 📌 Persist the timeout lift so it survives restarts (re-timing out a user replaces the earlier lift).
+        await self.bot.scheduler.schedule(
+            f"timeout_lift:{interaction.guild.id}:{user.id}", "timeout_lift", until,
+            guild_id=interaction.guild.id, user_id=user.id
+        )
 
-    async def remove_timeout_after(self, user: discord.Member, delay: int):
+    async def _resolve_member(self, job: dict):
+        """📌 Returns the (guild, member) a scheduled job refers to; member is None if they left."""
+        guild = self.bot.get_guild(job["guild_id"])
+        if guild is None:
+            return None, None
+        try:
+            member = await get_or_fetch_member(guild, job["user_id"])
+        except discord.HTTPException:
+            member = None
+        return guild, member
+
+    async def expire_timeout(self, job: dict):
         """
-        📌 Background task to remove the timeout after a delay.
+        📌 Scheduler handler: removes an expired timeout and notifies the server.
+        📌 Notices go through the dispatcher's digest, so a wave of expiries becomes one message.
         """
-        await asyncio.sleep(delay)
+        guild, user = await self._resolve_member(job)
+        if guild is None:
+            return
+        if user is None:
+            await update_user(guild.id, job["user_id"], {"$set": {"muted": False}}, upsert=False)
+            return
         try:
-            await user.timeout(None, reason="Timeout expired")
+            await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(guild), lambda: user.timeout(None, reason="Timeout expired"))
         except Exception as e:
             if user.guild.system_channel:
-                await user.guild.system_channel.send(f"❌ Failed to remove timeout for {user.mention}: {e}")
+                dispatcher.notify(user.guild.system_channel, f"❌ Failed to remove timeout for {user.mention}: {e}")
             return
-        users_collection.update_one({"_id": user.id}, {"$set": {"muted": False}})
+        await update_user(guild.id, user.id, {"$set": {"muted": False}}, upsert=False)
+        await modlog.record(guild.id, "timeout_expired", user.id)
         if user.guild.system_channel:
-            await user.guild.system_channel.send(f"🔊 {user.mention} is no longer timed out.")
+            dispatcher.notify(user.guild.system_channel, f"🔊 {user.mention} is no longer timed out.")
 
     @app_commands.describe(user="User to remove timeout from")
     @app_commands.command(name="removetimeout", description="Remove timeout from a user manually (Moderation)")
@@ -94,10 +157,12 @@ class Moderation(commands.Cog):
         if not user.timed_out_until or user.timed_out_until <= discord.utils.utcnow():
             return await interaction.followup.send(f"⚠️ {user.mention} is not currently timed out!", ephemeral=True)
         try:
-            await user.timeout(None, reason="Manual timeout removal")
+            await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(user.guild), lambda: user.timeout(None, reason="Manual timeout removal"))
         except Exception as e:
             return await interaction.followup.send(f"❌ Failed to remove timeout: {e}", ephemeral=True)
-        users_collection.update_one({"_id": user.id}, {"$set": {"muted": False}})
+        await self.bot.scheduler.cancel(f"timeout_lift:{interaction.guild.id}:{user.id}")
+        await update_user(interaction.guild.id, user.id, {"$set": {"muted": False}}, upsert=False)
+        await modlog.record(interaction.guild.id, "timeout_removed", user.id, actor_id=interaction.user.id)
         await interaction.followup.send(f"🔊 {user.mention} has been removed from timeout.")
 
     @app_commands.describe(user="User to ban", reason="Reason for ban")
@@ -111,19 +176,25 @@ class Moderation(commands.Cog):
             return
         if not interaction.user.guild_permissions.ban_members:
             return await interaction.response.send_message("❌ You don’t have permission to ban users!", ephemeral=True)
+        # 📌 Acknowledge first: the ban may wait behind the guild's rate-limit bucket for longer than 3 seconds.
+        # 📌 The deferred response is public, so the confirmation stays visible to the channel.
+        await interaction.response.defer()
         try:
-            await user.ban(reason=reason)
+            await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(user.guild), lambda: user.ban(reason=reason))
         except Exception as e:
-            return await interaction.response.send_message(f"❌ Failed to ban {user.mention}: {e}", ephemeral=True)
-        users_collection.update_one({"_id": user.id}, {"$set": {"banned": True, "ban_reason": reason}}, upsert=True)
-        await interaction.response.send_message(f"✅ {user.mention} was banned! Reason: {reason}")
+            # 📌 The first followup would replace the public "thinking" message; remove it so the error stays private.
+            await interaction.delete_original_response()
+            return await interaction.followup.send(f"❌ Failed to ban {user.mention}: {e}", ephemeral=True)
+        await update_user(interaction.guild.id, user.id, {"$set": {"banned": True, "ban_reason": reason}})
+        await modlog.record(interaction.guild.id, "ban", user.id, actor_id=interaction.user.id, reason=reason)
+        await interaction.followup.send(f"✅ {user.mention} was banned! Reason: {reason}")
 
     @app_commands.describe(user_id="User ID of the user to unban", reason="Reason for unban (optional)")
     @app_commands.command(name="unban", description="Unban a user by their ID (Moderation)")
     async def unban(self, interaction: discord.Interaction, user_id: str, reason: str = "No reason provided"):
         """
         📌 The /unban command unbans a user using their numeric ID.
-        📌 It iterates over the ban list to find the user to unban.
+        📌 It checks the local ban mirror and Discord's single-ban endpoint instead of listing every ban.
         """
         if not await check_moderation_access(interaction, interaction.user):
             return
@@ -133,19 +204,23 @@ class Moderation(commands.Cog):
             user_id_int = int(user_id)
         except ValueError:
             return await interaction.response.send_message("❌ Invalid user ID format. Please provide a valid numeric ID.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
         try:
-            user_to_unban = None
-            async for ban_entry in interaction.guild.bans():
-                if ban_entry.user.id == user_id_int:
-                    user_to_unban = ban_entry.user
-                    break
-            if user_to_unban is None:
-                return await interaction.response.send_message("❌ That user is not currently banned.", ephemeral=True)
-            await interaction.guild.unban(user_to_unban, reason=reason)
-            users_collection.update_one({"_id": user_id_int}, {"$set": {"banned": False}}, upsert=True)
-            await interaction.response.send_message(f"✅ Successfully unbanned {user_to_unban.mention}!")
+            if not await ban_index.is_banned(interaction.guild.id, user_id_int):
+                # 📌 Not mirrored: confirm with a single GET /bans/{user} (this also repairs a stale mirror).
+                if await ban_index.lookup_ban(interaction.guild, user_id_int) is None:
+                    return await interaction.followup.send("❌ That user is not currently banned.", ephemeral=True)
+            try:
+                await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(interaction.guild),
+                                        lambda: interaction.guild.unban(discord.Object(user_id_int), reason=reason))
+            except discord.NotFound:
+                await ban_index.record_unban(interaction.guild.id, user_id_int)
+                return await interaction.followup.send("❌ That user is not currently banned.", ephemeral=True)
+            await ban_index.record_unban(interaction.guild.id, user_id_int)
+            await modlog.record(interaction.guild.id, "unban", user_id_int, actor_id=interaction.user.id, reason=reason)
+            await interaction.followup.send(f"✅ Successfully unbanned <@{user_id_int}>!")
         except discord.Forbidden:
-            await interaction.response.send_message("❌ I don't have permission to unban users.", ephemeral=True)
+            await interaction.followup.send("❌ I don't have permission to unban users.", ephemeral=True)
 
     @app_commands.describe(user="User to assign temporary role", role="Role to assign", duration="Duration (e.g., 1h, 30m, 45s)")
     @app_commands.command(name="temprole", description="Assign a temporary role to a user (Moderation)")
@@ -156,14 +231,39 @@ class Moderation(commands.Cog):
         time_in_seconds = convert_time(duration)
         if time_in_seconds is None:
             return await interaction.response.send_message("❌ Invalid time format! Use `1h`, `30m`, or `45s`.", ephemeral=True)
+        # 📌 Acknowledge before queueing the role change, which may wait behind the guild's rate-limit bucket.
+        await interaction.response.defer(ephemeral=True)
         # 📌 Assign the role to the user.
-        await user.add_roles(role, reason="Temporary role assignment")
-        await interaction.response.send_message(f"✅ {role.mention} role has been assigned to {user.mention} for `{duration}`.")
-        # 📌 Wait for the duration to expire, then remove the role.
-        await asyncio.sleep(time_in_seconds)
-        await user.remove_roles(role, reason="Temporary role expired")
-        if interaction.channel:
-            await interaction.channel.send(f"🔔 The temporary role {role.mention} for {user.mention} has expired.")
+        try:
+            await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(user.guild), lambda: user.add_roles(role, reason="Temporary role assignment"))
+        except Exception as e:
+            return await interaction.followup.send(f"❌ Failed to assign {role.mention}: {e}", ephemeral=True)
+        await interaction.followup.send(f"✅ {role.mention} role has been assigned to {user.mention} for `{duration}`.")
+        await modlog.record(interaction.guild.id, "temprole", user.id, actor_id=interaction.user.id,
+                            duration=timedelta(seconds=time_in_seconds), role_id=role.id)
+        # 📌 Persist the removal instead of sleeping inside the interaction handler.
+        until = discord.utils.utcnow() + timedelta(seconds=time_in_seconds)
+        await self.bot.scheduler.schedule(
+            f"role_removal:{interaction.guild.id}:{user.id}:{role.id}", "role_removal", until,
+            guild_id=interaction.guild.id, user_id=user.id, role_id=role.id,
+            channel_id=interaction.channel.id if interaction.channel else None
+        )
+
+    async def expire_temprole(self, job: dict):
+        """
+        📌 Scheduler handler: removes an expired temporary role and announces it in the original channel.
+        """
+        guild, user = await self._resolve_member(job)
+        if guild is None or user is None:
+            return
+        role = guild.get_role(job["role_id"])
+        if role is None:
+            return
+        await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(guild), lambda: user.remove_roles(role, reason="Temporary role expired"))
+        await modlog.record(guild.id, "temprole_expired", user.id, role_id=role.id)
+        channel = guild.get_channel(job["channel_id"]) if job.get("channel_id") else None
+        if channel:
+            dispatcher.notify(channel, f"🔔 The temporary role {role.mention} for {user.mention} has expired.")
 
     @app_commands.describe(user="User to get information about")
     @app_commands.command(name="userinfo", description="Get information about a user (Moderation)")
@@ -175,18 +275,12 @@ class Moderation(commands.Cog):
         """
         user = user or interaction.user
 
-        # 📌 Retrieve user penalty data from the database.
-        doc = users_collection.find_one({"_id": user.id}) or {}
-        timeout_history = doc.get("timeout_history", [])
-        now_date = datetime.utcnow().date()
-        count_timeouts = 0
-        for entry in timeout_history:
-            try:
-                entry_date = datetime.strptime(entry.get("date", ""), "%Y-%m-%d").date()
-                if (now_date - entry_date).days <= 30:
-                    count_timeouts += 1
-            except Exception:
-                continue
+        # 📌 Retrieve the user's penalty data in this server (moderation state is kept per guild).
+        doc, count_timeouts = {}, 0
+        if interaction.guild:
+            doc = await get_user(interaction.guild.id, user.id, {"banned": 1})
+            # 📌 Sums the pre-aggregated per-day buckets instead of parsing the whole history.
+            count_timeouts = await count_recent_timeouts(interaction.guild.id, user.id)
 
         banned_status = doc.get("banned", False)
         ban_status_str = "🚫 Banned" if banned_status else "✅ Not banned"
@@ -214,11 +308,14 @@ class Moderation(commands.Cog):
 
         # 📌 If used in a guild, add server-specific information.
         if interaction.guild:
-            member = interaction.guild.get_member(user.id)
-            if member:
-                joined_at = member.joined_at.strftime("%Y-%m-%d %H:%M:%S UTC") if member.joined_at else "N/A"
+            # 📌 Falls back to the recent-member cache, the guild snapshot and a REST fetch when the member cache is lean.
+            details = await member_details(interaction.guild, user)
+            if details:
+                joined = details.joined_datetime
+                joined_at = joined.strftime("%Y-%m-%d %H:%M:%S UTC") if joined else "N/A"
                 embed.add_field(name="🤝 Joined Server", value=joined_at, inline=False)
-                roles = [role.mention for role in member.roles if role.name != "@everyone"]
+                # 📌 Snapshot role IDs can outlive a deleted role, so only mention roles the guild still has.
+                roles = [f"<@&{role_id}>" for role_id in details.role_ids if interaction.guild.get_role(role_id)]
                 embed.add_field(name="🎭 Roles", value=", ".join(roles) if roles else "None", inline=False)
 
         # 📌 Add penalty information fields.
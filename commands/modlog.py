@@ -0,0 +1,119 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+import tempfile
+
+# 📌 Import helper functions from utils
+from utils.permissions import check_moderation_access
+from utils.metrics import InstrumentedView
+from utils import modlog
+
+# 📌 Exports are spooled in memory up to this size and on disk beyond it.
+EXPORT_SPOOL_BYTES = 1024 * 1024
+# 📌 Discord rejects embeds whose description is longer than this (a few characters are kept for "…").
+DESCRIPTION_LIMIT = 4090
+
+ACTION_CHOICES = [app_commands.Choice(name=action, value=action) for action in modlog.ACTIONS]
+
+# -------------------- UI VIEWS --------------------
+class ModLogView(InstrumentedView):
+    """📌 Pages through the event log; only the cursor of the next page is kept between clicks."""
+    def __init__(self, invoker_id: int, guild_id: int, filters: dict, cursor: str):
+        super().__init__(timeout=300)
+        self.invoker_id = invoker_id
+        self.guild_id = guild_id
+        self.filters = filters
+        self.cursor = cursor
+        self.page_number = 1
+
+    @staticmethod
+    def get_embed(events: list, page_number: int):
+        """📌 Builds the embed for one page of events."""
+        embed = discord.Embed(title="📜 Moderation Log", color=discord.Color.blue())
+        lines, length = [], 0
+        for doc in events:
+            line = modlog.describe(doc)
+            # 📌 Stay under Discord's description limit; the remaining events are on the next page anyway.
+            if length + len(line) + 1 > DESCRIPTION_LIMIT:
+                lines.append("…")
+                break
+            lines.append(line)
+            length += len(line) + 1
+        embed.description = "\n".join(lines) or "No events found."
+        embed.set_footer(text=f"Page {page_number}")
+        return embed
+
+    @discord.ui.button(label="Older ▶", style=discord.ButtonStyle.secondary)
+    async def older_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """📌 Loads the next page after the stored cursor."""
+        if interaction.user.id != self.invoker_id:
+            return await interaction.response.send_message("❌ Only the moderator who ran /modlog can page it.", ephemeral=True)
+        events, self.cursor = await modlog.page(self.guild_id, self.cursor, **self.filters)
+        self.page_number += 1
+        button.disabled = self.cursor is None
+        await interaction.response.edit_message(embed=self.get_embed(events, self.page_number), view=self)
+
+# 📌 ModLog Cog: browsing and exporting the moderation event log.
+class ModLog(commands.Cog):
+    """
+    📌 A Cog for reading the append-only moderation event log.
+    📌 Events are written by the moderation commands, their scheduled expiries and the blacklist auto-timeout.
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @staticmethod
+    def _filters(user: discord.User = None, moderator: discord.User = None, action: str = None) -> dict:
+        return {"target_id": user.id if user else None, "actor_id": moderator.id if moderator else None, "action": action}
+
+    @app_commands.describe(user="Only events targeting this user", moderator="Only events by this moderator",
+                           action="Only this kind of event")
+    @app_commands.choices(action=ACTION_CHOICES)
+    @app_commands.command(name="modlog", description="Browse the moderation log (Moderation)")
+    async def modlog(self, interaction: discord.Interaction, user: discord.User = None,
+                     moderator: discord.User = None, action: str = None):
+        """
+        📌 The /modlog command shows the newest events first, one page at a time.
+        """
+        if not await check_moderation_access(interaction, interaction.user):
+            return
+        if not interaction.user.guild_permissions.moderate_members:
+            return await interaction.response.send_message("❌ You don’t have permission to view the moderation log!", ephemeral=True)
+        filters = self._filters(user, moderator, action)
+        events, cursor = await modlog.page(interaction.guild.id, **filters)
+        view = ModLogView(interaction.user.id, interaction.guild.id, filters, cursor)
+        view.older_button.disabled = cursor is None
+        await interaction.response.send_message(embed=ModLogView.get_embed(events, 1), view=view, ephemeral=True)
+
+    @app_commands.describe(format="File format", user="Only events targeting this user",
+                           moderator="Only events by this moderator", action="Only this kind of event")
+    @app_commands.choices(
+        format=[app_commands.Choice(name="NDJSON", value="ndjson"), app_commands.Choice(name="CSV", value="csv")],
+        action=ACTION_CHOICES,
+    )
+    @app_commands.command(name="modlogexport", description="Export the moderation log as a file (Moderation)")
+    async def modlogexport(self, interaction: discord.Interaction, format: str = "ndjson", user: discord.User = None,
+                           moderator: discord.User = None, action: str = None):
+        """
+        📌 The /modlogexport command streams matching events, oldest first, into a file attachment.
+        📌 Rows are written batch by batch, and the file stops at the guild's upload limit.
+        """
+        if not await check_moderation_access(interaction, interaction.user):
+            return
+        if not interaction.user.guild_permissions.moderate_members:
+            return await interaction.response.send_message("❌ You don’t have permission to export the moderation log!", ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
+        guild = interaction.guild
+        with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as fp:
+            rows, truncated = await modlog.export(guild.id, format, fp, guild.filesize_limit,
+                                                  **self._filters(user, moderator, action))
+            if rows == 0:
+                return await interaction.followup.send("📭 No matching events.", ephemeral=True)
+            fp.seek(0)
+            note = " (truncated at the upload limit; narrow the filters for the rest)" if truncated else ""
+            await interaction.followup.send(f"📦 Exported `{rows}` events{note}.",
+                                            file=discord.File(fp, filename=f"modlog-{guild.id}.{format}"), ephemeral=True)
+
+# 📌 Setup function to add this Cog to the bot.
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ModLog(bot))
@@ -1,17 +1,33 @@
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
+import inspect
+import math
 import time
+from utils.ipc import cluster_totals
+from utils.status_engine import MAX_PANELS_PER_GUILD, StatusEngine
+from utils import metrics
+from utils.dispatcher import dispatcher
+from utils.startup import register_warmup
+from utils.loop_watchdog import loop_watchdog
+from utils.memory_profiler import memory_profiler
+from utils.supervisor import supervisor
+from utils.query_profiler import QUERY_PROFILER, SLOW_QUERY_SECONDS, query_profiler
+from utils import indexes
+
+# Discord's limit on the total characters of an embed
+EMBED_LIMIT = 6000
 
 # Start time for uptime calculation
 BOT_START_TIME = time.time()
 
-def get_bot_uptime() -> str:
-    """Returns the bot's uptime as a formatted string."""
-    seconds = int(time.time() - BOT_START_TIME)
-    hours, remainder = divmod(seconds, 3600)
-    minutes, secs = divmod(remainder, 60)
-    return f"{hours}h {minutes}m {secs}s"
+CONTACT_URL = "https://discordapp.com/users/812347860128497694"  # Replace with actual invite or contact URL
+
+def contact_view() -> discord.ui.View:
+    """Link-button view attached to the live panel (set once; edits only change the embed)."""
+    view = discord.ui.View()
+    view.add_item(discord.ui.Button(label="📞 Contact Me", style=discord.ButtonStyle.link, url=CONTACT_URL))
+    return view
 
 class Owner(commands.Cog):
     """
@@ -19,7 +35,11 @@ class Owner(commands.Cog):
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.live_info_message = None  # Stores the persistent embed message
+        self.app_owner = None  # Cached application owner (fetched once instead of every tick)
+        # Renders the embed once per tick for every registered panel, skipping unchanged content
+        self.status = StatusEngine(bot, self.generate_live_embed)
+        # Panels persisted before the last restart are resumed in the background after ready
+        register_warmup("status_panels", self.status.load)
         self.update_live_info.start()  # Starts the auto-update loop
 
     async def cog_check(self, ctx: commands.Context) -> bool:
@@ -28,64 +48,223 @@ class Owner(commands.Cog):
 
     async def generate_live_embed(self) -> discord.Embed:
         """Generates a large, styled embed with bot info."""
-        ping = round(self.bot.latency * 1000, 2)
-        uptime = get_bot_uptime()
-        server_count = len(self.bot.guilds)
+        # Rounded so heartbeat jitter alone doesn't force an edit; inf (no heartbeat yet) and NaN (no websocket) show N/A
+        latency = self.bot.latency
+        ping = f"{round(latency * 1000)} ms" if math.isfinite(latency) else "N/A"
+        # 📌 Totals across every cluster when running under cluster.py, otherwise just this process.
+        totals = cluster_totals(self.bot)
+        server_count = totals["guilds"]
         online_status = "🟢 **Online**"
-        app_info = await self.bot.application_info()
-        owner = app_info.owner
+        if self.app_owner is None:
+            app_info = await self.bot.application_info()
+            self.app_owner = app_info.owner
+        owner = self.app_owner
 
         embed = discord.Embed(
             title=f"🤖 {self.bot.user.name} - Live Status",
-            description="📊 **Real-time bot statistics** (auto-refreshing every 5 seconds)",
+            description="📊 **Real-time bot statistics** (auto-refreshing)",
             color=discord.Color.green()
         )
-        embed.add_field(name="📡 **Ping**", value=f"⚡ `{ping} ms`", inline=True)
-        embed.add_field(name="⏳ **Uptime**", value=f"🔄 `{uptime}`", inline=True)
+        embed.add_field(name="📡 **Ping**", value=f"⚡ `{ping}`", inline=True)
+        # Discord renders relative timestamps client-side, so uptime stays current without edits
+        embed.add_field(name="⏳ **Uptime**", value=f"🔄 <t:{int(BOT_START_TIME)}:R>", inline=True)
         embed.add_field(name="🌍 **Servers**", value=f"🏠 `{server_count}`", inline=True)
         embed.add_field(name="🔌 **Status**", value=online_status, inline=True)
         embed.add_field(name="👑 **Owner**", value=f"🛠️ `{owner}`", inline=True)
-        embed.set_footer(text="🔄 This panel updates every 5 seconds | Support Me Bot")
+        embed.add_field(name="🧩 **Clusters / Shards**", value=f"🖥️ `{totals['clusters']}` / `{len(totals['shards'])}`", inline=True)
+        shard_lines = [f"#{shard_id}: `{round(latency * 1000, 2)} ms`" if math.isfinite(latency) else f"#{shard_id}: `N/A`"
+                       for shard_id, latency in totals["shards"].items()]
+        # 📌 Keep the field under Discord's 1024-character limit on large shard counts.
+        if len(shard_lines) > 20:
+            shard_lines = shard_lines[:20] + [f"… and {len(shard_lines) - 20} more"]
+        embed.add_field(name="📶 **Shard Latency**", value="\n".join(shard_lines), inline=False)
+        embed.add_field(name="🐢 **Loop Lag**", value=self.loop_lag_summary(), inline=False)
+        embed.set_footer(text="🔄 This panel updates automatically when stats change | Support Me Bot")
         return embed
 
+    @staticmethod
+    def loop_lag_summary() -> str:
+        """Lag percentiles (bucket bounds, so they only change between buckets) and the worst blocking call sites."""
+        def ms(seconds: float) -> str:
+            return "inf" if seconds == float("inf") else f"{seconds * 1000:.0f}"
+
+        stats = loop_watchdog.stats()
+        lines = [f"p50 `{ms(stats['p50'])} ms` · p99 `{ms(stats['p99'])} ms` · stalls `{stats['stalls']}`"]
+        for handler, site, offender in loop_watchdog.top(3):
+            lines.append(f"`{handler[:30]}` {site[:80]} ×{offender.count} (worst `{ms(offender.worst)} ms`)")
+        return "\n".join(lines)
+
     @app_commands.command(name="liveinfo", description="Displays a live bot info panel (Owner Only)")
     async def liveinfo(self, interaction: discord.Interaction):
         """
-        Posts a live status embed that updates automatically every 5 seconds.
+        Posts a live status embed that updates automatically. Each channel keeps one panel (a new one
+        replaces it) and each server up to MAX_PANELS_PER_GUILD; panels resume after a restart.
         """
+        # cog_check only covers prefix commands, so slash commands check ownership themselves
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message("❌ This command is restricted to the bot owner.", ephemeral=True)
+            return
+        if interaction.guild is not None and self.status.panel_in(interaction.channel_id) is None \
+                and self.status.guild_panels(interaction.guild.id) >= MAX_PANELS_PER_GUILD:
+            await interaction.response.send_message(
+                f"❌ This server already has {MAX_PANELS_PER_GUILD} live panels. Run this in one of their channels to replace it.",
+                ephemeral=True)
+            return
+
         embed = await self.generate_live_embed()
-        
-        # Button to contact the owner
-        view = discord.ui.View()
-        contact_button = discord.ui.Button(
-            label="📞 Contact Me",
-            style=discord.ButtonStyle.link,
-            url="https://discordapp.com/users/812347860128497694"  # Replace with actual invite or contact URL
+
+        # Send initial message with a button to contact the owner
+        await interaction.response.send_message(embed=embed, view=contact_view(), ephemeral=False)
+        await self.status.register(await interaction.original_response(), embed)
+
+    @app_commands.command(name="metrics", description="Shows per-command latency metrics (Owner Only)")
+    async def metrics_command(self, interaction: discord.Interaction):
+        """
+        Per-command invocation counts and latency percentiles since startup.
+        Percentiles are bucket upper bounds; the full histograms are on the METRICS_PORT endpoint.
+        """
+        # cog_check only covers prefix commands, so slash commands check ownership themselves
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message("❌ This command is restricted to the bot owner.", ephemeral=True)
+            return
+
+        rows = metrics.summary_rows()
+
+        def ms(seconds: float) -> str:
+            return "inf" if seconds == float("inf") else f"{seconds * 1000:.0f}"
+
+        lines = [f"{'command':<22}{'n':>6}{'p50':>7}{'p99':>7}{'ack99':>7}{'db99':>7}{'rest99':>7}{'err':>5}{'late':>5}"]
+        for name, count, p50, p99, ack99, mongo99, rest99, errors, late in rows[:25]:
+            lines.append(f"{name[:21]:<22}{count:>6}{ms(p50):>7}{ms(p99):>7}{ms(ack99):>7}{ms(mongo99):>7}{ms(rest99):>7}{errors:>5}{late:>5}")
+        embed = discord.Embed(
+            title="📊 Command Metrics",
+            description="```\n" + "\n".join(lines) + "\n```\nTimes in ms (p50/p99 bucket bounds); late = acknowledged after 3 s or never.",
+            color=discord.Color.blurple()
         )
-        view.add_item(contact_button)
+        if not rows:
+            embed.description = "No commands recorded yet."
+        depths = " · ".join(f"{name} `{depth}`" for name, depth in dispatcher.depths().items())
+        embed.add_field(name="📤 Outbound Queue", value=f"{depths}\nRate-limited buckets: `{dispatcher.pressured_buckets()}`", inline=False)
+        tasks = supervisor.stats()
+        owners = " · ".join(f"{owner} `{count}`" for owner, count in supervisor.running().most_common(8)) or "None"
+        embed.add_field(name="🧵 Background Tasks",
+                        value=f"{owners}\nStarted `{tasks['started']}` · failed `{tasks['failed']}` · refused `{tasks['rejected']}`",
+                        inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        # Send initial message
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=False)
-        self.live_info_message = await interaction.original_response()
+    @app_commands.describe(action="start tracing, take a snapshot (diffed against the previous one), or stop")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="start", value="start"),
+        app_commands.Choice(name="snapshot", value="snapshot"),
+        app_commands.Choice(name="stop", value="stop"),
+    ])
+    @app_commands.command(name="memprofile", description="Profiles memory growth per cog with tracemalloc (Owner Only)")
+    async def memprofile(self, interaction: discord.Interaction, action: str = "snapshot"):
+        """
+        Tracemalloc profiling: start, then take snapshots over time; each one lists the cogs and modules
+        whose allocations grew the most since the previous snapshot, with their top allocation sites.
+        """
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message("❌ This command is restricted to the bot owner.", ephemeral=True)
+            return
+        if action == "start":
+            memory_profiler.start()
+            await interaction.response.send_message("🧪 Tracing allocations. Take snapshots with `/memprofile snapshot`.", ephemeral=True)
+            return
+        if action == "stop":
+            memory_profiler.stop()
+            await interaction.response.send_message("🛑 Allocation tracing stopped.", ephemeral=True)
+            return
+        if not memory_profiler.tracing:
+            await interaction.response.send_message("⚠️ Tracing is off. Run `/memprofile start` first.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True)
+
+        def kib(size: int) -> str:
+            return f"{size / 1024:+,.1f} KiB"
+
+        # Files that define a cog are reported under the cog's name
+        owners = {inspect.getfile(type(cog)): name for name, cog in self.bot.cogs.items()}
+        report = await memory_profiler.snapshot(owners)
+        since = f"the previous snapshot ({report.interval:.0f} s ago)" if report.interval else "tracing started"
+        embed = discord.Embed(
+            title="🧪 Memory Profile",
+            description=f"Traced `{report.current / 1048576:.1f} MiB` (peak `{report.peak / 1048576:.1f} MiB`). Growth since {since}:",
+            color=discord.Color.blurple()
+        )
+        for area in report.areas[:10]:
+            sites = "\n".join(f"`{site[:60]}` {kib(size)}" for site, size in area.sites)
+            embed.add_field(name=f"{area.name[:60]}: {kib(area.size_diff)} ({area.count_diff:+,} blocks)", value=sites[:1024] or "-", inline=False)
+        if not report.areas:
+            embed.description += "\nNo change."
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.describe(action="show the report, or reset the recorded query shapes")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="report", value="report"),
+        app_commands.Choice(name="reset", value="reset"),
+    ])
+    @app_commands.command(name="queryprofile", description="Shows slow and unindexed database queries per command (Owner Only)")
+    async def queryprofile(self, interaction: discord.Interaction, action: str = "report"):
+        """
+        Query shapes recorded by the query profiler, flagged ones first: slow, unindexed (collection scan)
+        or scanning many documents per result. Plans come from explains of slow and sampled queries.
+        """
+        if not await self.bot.is_owner(interaction.user):
+            await interaction.response.send_message("❌ This command is restricted to the bot owner.", ephemeral=True)
+            return
+        if action == "reset":
+            query_profiler.reset()
+            await interaction.response.send_message("🧹 Query profile cleared.", ephemeral=True)
+            return
+
+        def ms(seconds: float) -> str:
+            return f"{seconds * 1000:.1f} ms"
+
+        stats = query_profiler.stats()
+        embed = discord.Embed(
+            title="🗄️ Query Profile",
+            description=f"`{stats['shapes']}` query shapes, `{stats['flagged']}` flagged, `{stats['explains']}` explained "
+                        f"(slow = {ms(SLOW_QUERY_SECONDS)} or more).",
+            color=discord.Color.blurple()
+        )
+        if not QUERY_PROFILER:
+            embed.description += "\nThe profiler is off; set `QUERY_PROFILER=1` and restart to record queries."
+        elif not stats["shapes"]:
+            embed.description += "\nNo queries recorded yet."
+        declared = " · ".join(f"{name} `{len(names)}`" for name, names in indexes.declared().items())[:1024] or "None"
+        declared_name = "📇 Declared Indexes"
+        # 📌 Discord rejects embeds over 6000 characters in total; shapes are added while they fit.
+        budget = EMBED_LIMIT - len(embed) - len(declared_name) - len(declared) - 100  # 📌 100 left for the footer
+        shown = 0
+        report = query_profiler.report()
+        for entry in report:
+            flags = f"⚠️ {', '.join(entry.flags)} · " if entry.flags else ""
+            plan = entry.plan or "not explained yet"
+            if entry.docs_examined is not None:
+                plan += f" · examined `{entry.docs_examined}` docs for `{entry.returned}`"
+            origins = ", ".join(f"{origin} `{count}`" for origin, count in entry.origins.most_common(3))
+            name = f"{flags}{entry.collection} {entry.operation}"[:256]
+            value = (f"`{entry.shape[:300]}`\n{entry.count:,} × avg {ms(entry.total / entry.count)} · max {ms(entry.max)} · "
+                     f"slow `{entry.slow}`\nPlan: {plan}\nFrom: {origins}")[:1024]
+            if len(name) + len(value) > budget:
+                break
+            budget -= len(name) + len(value)
+            embed.add_field(name=name, value=value, inline=False)
+            shown += 1
+        if shown < len(report):
+            embed.set_footer(text=f"{len(report) - shown} more shapes not shown (embed size limit)")
+        embed.add_field(name=declared_name, value=declared, inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
-    @tasks.loop(seconds=5.0)  # Refresh every 5 seconds
+    @tasks.loop(seconds=5.0)  # Base refresh interval; the status engine backs off under rate limits
     async def update_live_info(self):
-        """Background task that updates the live status embed every 5 seconds."""
-        if self.live_info_message is None:
-            return  # No message to update
+        """Background task that refreshes every registered live status panel."""
         try:
-            embed = await self.generate_live_embed()
-            view = discord.ui.View()
-            contact_button = discord.ui.Button(
-                label="📞 Contact Me",
-                style=discord.ButtonStyle.link,
-                url="https://discordapp.com/users/812347860128497694"  # Replace with actual URL
-            )
-            view.add_item(contact_button)
-
-            await self.live_info_message.edit(embed=embed, view=view)
+            await self.status.tick()
         except Exception as e:
-            print(f"Error updating live info message: {e}")
+            print(f"Error updating live info panels: {e}")
+        self.update_live_info.change_interval(seconds=self.status.interval)
 
     @update_live_info.before_loop
     async def before_update_live_info(self):
@@ -0,0 +1,94 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+import asyncio
+import os
+import time
+
+# 📌 Import helper functions from utils
+from utils.permissions import check_moderation_access
+from utils.raid_detector import RAID_WINDOW_SECONDS, raid_detector
+from utils.dispatcher import dispatcher
+from utils.supervisor import supervisor
+
+# 📌 What happens to raid suspects: "alert" only posts a warning, "timeout" also times them out.
+RAID_ACTION = os.getenv("RAID_ACTION", "alert").lower()
+RAID_TIMEOUT_SECONDS = int(os.getenv("RAID_TIMEOUT_SECONDS", "3600"))
+# 📌 Suspects are collected for this long and then timed out together (one bulk database commit per batch).
+RAID_BATCH_SECONDS = float(os.getenv("RAID_BATCH_SECONDS", "2"))
+RAID_REASON = "Raid protection: suspicious join wave"
+
+# 📌 RaidProtection Cog: watches member joins for raid waves.
+class RaidProtection(commands.Cog):
+    """
+    📌 Feeds every member join into the streaming raid detector (utils/raid_detector.py).
+    📌 A new wave is announced in the system channel; with RAID_ACTION=timeout the suspects are timed out in
+    📌 batches through MassModeration, so they get the same records, scheduled lifts and mod log events as /masstimeout.
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._pending = {}  # 📌 guild_id -> suspects waiting for the next batch
+        self._batches = {}  # 📌 guild_id -> running batch task
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if member.bot:
+            return
+        guild = member.guild
+        detection = raid_detector.observe(guild.id, member.id, member.name, member.created_at.timestamp(), time.time())
+        if detection is None:
+            return
+        if detection.wave:
+            action = f"Timing out suspects for {RAID_TIMEOUT_SECONDS // 60} minutes." if RAID_ACTION == "timeout" else "Review recent joins."
+            print(f"Raid wave in guild {guild.id}: {detection.joins} joins, {detection.young} young, {detection.similar} similar")
+            if guild.system_channel:
+                dispatcher.notify(guild.system_channel,
+                                  f"🚨 **Raid detected**: `{detection.joins}` joins in the last {RAID_WINDOW_SECONDS}s "
+                                  f"(`{detection.young}` new accounts, `{detection.similar}` with similar names). {action}")
+        if RAID_ACTION == "timeout":
+            self._pending.setdefault(guild.id, set()).update(detection.suspects)
+            if guild.id not in self._batches:
+                task = supervisor.spawn(self._timeout_batches(guild), f"raid_timeouts:{guild.id}", owner=self.qualified_name)
+                if task is not None:
+                    self._batches[guild.id] = task
+
+    async def _timeout_batches(self, guild: discord.Guild):
+        """📌 Times out the collected suspects every RAID_BATCH_SECONDS until the wave stops producing them."""
+        try:
+            while True:
+                await asyncio.sleep(RAID_BATCH_SECONDS)
+                targets = self._pending.pop(guild.id, None)
+                if not targets:
+                    return
+                mass_moderation = self.bot.get_cog("MassModeration")
+                if mass_moderation is None or not guild.me.guild_permissions.moderate_members:
+                    print(f"Raid protection can't timeout {len(targets)} suspects in guild {guild.id}")
+                    continue
+                result = await mass_moderation.timeout_members(guild, list(targets), RAID_TIMEOUT_SECONDS, RAID_REASON)
+                if result.failed:
+                    print(f"Raid protection: {len(result.failed)} timeouts failed in guild {guild.id}")
+        finally:
+            self._batches.pop(guild.id, None)
+
+    @app_commands.command(name="raidstatus", description="Show recent join activity and raid detection state (Moderation)")
+    async def raidstatus(self, interaction: discord.Interaction):
+        """
+        📌 The /raidstatus command shows the join window the detector currently sees for this server.
+        """
+        if not await check_moderation_access(interaction, interaction.user):
+            return
+        status = raid_detector.status(interaction.guild.id, time.time())
+        embed = discord.Embed(
+            title="🚨 Raid wave in progress" if status["raiding"] else "🛡️ Raid Protection",
+            color=discord.Color.red() if status["raiding"] else discord.Color.green(),
+        )
+        embed.add_field(name=f"Joins (last {RAID_WINDOW_SECONDS}s)", value=f"`{status['joins']}`", inline=True)
+        embed.add_field(name="New accounts", value=f"`{status['young']}`", inline=True)
+        embed.add_field(name="Similar names", value=f"`{status['similar']}`", inline=True)
+        embed.add_field(name="Action", value=f"`{RAID_ACTION}`", inline=True)
+        embed.add_field(name="Queued suspects", value=f"`{len(self._pending.get(interaction.guild.id, ()))}`", inline=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+# 📌 Setup function to add this Cog to the bot.
+async def setup(bot: commands.Bot):
+    await bot.add_cog(RaidProtection(bot))
@@ -0,0 +1,30 @@
+# 📌 scripts/migrate_per_guild.py
+# 📌 Moves data written before settings and user state were scoped per guild into the per-guild layout:
+# 📌 the global command access settings, user moderation documents and per-day timeout buckets.
+# 📌 The old documents don't say which server they belong to, so everything is assigned to the guild you pass.
+# 📌 Run once from the repository root before deploying the per-guild version (safe to re-run):
+# 📌     python -m scripts.migrate_per_guild --guild 123456789012345678
+
+import argparse
+import asyncio
+
+from utils import database, indexes, timeout_history, user_state
+from utils.settings_cache import migrate_legacy_settings
+
+async def main(guild_id: int):
+    await indexes.ensure_all(database.users_collection.name, database.timeout_days_collection.name)
+    if await migrate_legacy_settings(guild_id):
+        print(f"✅ Moved the command access settings to guild {guild_id}")
+    users = await user_state.migrate_legacy_documents(guild_id)
+    print(f"✅ Moved {users} user documents to guild {guild_id}")
+    buckets = await timeout_history.migrate_legacy_buckets(guild_id)
+    print(f"✅ Moved {buckets} timeout day buckets to guild {guild_id}")
+    # 📌 Documents from before the capped timeout history can only be bucketed once they belong to a guild.
+    migrated = await timeout_history.migrate_user_documents()
+    print(f"✅ Migrated timeout history for {migrated} users")
+    await database.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scope legacy settings and user documents to one guild")
+    parser.add_argument("--guild", type=int, required=True, help="ID of the guild the existing data belongs to")
+    asyncio.run(main(parser.parse_args().guild))
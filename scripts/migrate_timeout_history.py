@@ -0,0 +1,18 @@
+# 📌 scripts/migrate_timeout_history.py
+# 📌 Converts unbounded `timeout_history` arrays into per-day timeout buckets and caps the arrays.
+# 📌 Run once from the repository root before deploying the capped history:
+# 📌     python -m scripts.migrate_timeout_history
+
+import asyncio
+
+from utils import database, indexes
+from utils.timeout_history import migrate_user_documents
+
+async def main():
+    await indexes.ensure_all(database.timeout_days_collection.name)
+    migrated = await migrate_user_documents()
+    print(f"✅ Migrated timeout history for {migrated} users")
+    await database.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,7 @@
+# 📌 tests/conftest.py
+# 📌 Makes the repository root importable, so tests can import utils/ and benchmarks/ (python -m pytest tests).
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,187 @@
+# 📌 tests/test_scheduler.py
+# 📌 ExpiryScheduler driven by a fake clock against the in-process Mongo stand-in.
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fake_mongo import FakeCollection
+from utils.scheduler import JOB_MAX_ATTEMPTS, JOB_RETRY_SECONDS, ExpiryScheduler
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+class FakeClock:
+    def __init__(self):
+        self.now = START.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+class CountingCollection(FakeCollection):
+    """📌 Counts bulk_write calls, i.e. one deletion round trip per fired batch."""
+    def __init__(self):
+        super().__init__(name="scheduled_jobs")
+        self.bulk_writes = 0
+
+    async def bulk_write(self, requests: list, ordered: bool = True):
+        self.bulk_writes += 1
+        await super().bulk_write(requests, ordered)
+
+def make_scheduler(batch_size: int = 50, job_filter=None):
+    clock = FakeClock()
+    collection = CountingCollection()
+    scheduler = ExpiryScheduler(collection, clock=clock, batch_size=batch_size, job_filter=job_filter)
+    fired = []
+
+    async def handler(job: dict):
+        fired.append(job["_id"])
+    scheduler.register("test", handler)
+    return scheduler, clock, collection, fired
+
+def due(seconds: float) -> datetime:
+    return START + timedelta(seconds=seconds)
+
+def test_fires_in_due_order_across_mixed_expiries():
+    async def run():
+        scheduler, clock, collection, fired = make_scheduler(batch_size=2)
+        for job_id, seconds in (("c", 30), ("a", 10), ("d", 45), ("b", 20), ("e", 600)):
+            await scheduler.schedule(job_id, "test", due(seconds))
+
+        assert await scheduler.run_due() == 0
+        clock.advance(25)
+        assert await scheduler.run_due() == 2
+        assert fired == ["a", "b"]
+        clock.advance(30)
+        assert await scheduler.run_due() == 2
+        assert fired == ["a", "b", "c", "d"]
+        assert set(collection.docs) == {"e"}
+        assert scheduler.pending() == 1
+    asyncio.run(run())
+
+def test_run_due_fires_in_batches():
+    async def run():
+        scheduler, clock, collection, fired = make_scheduler(batch_size=3)
+        await scheduler.schedule_many([{"_id": f"job{n}", "kind": "test", "due": due(n)} for n in range(7)])
+        collection.bulk_writes = 0
+        clock.advance(60)
+
+        assert await scheduler.run_due() == 7
+        assert fired == [f"job{n}" for n in range(7)]
+        assert collection.bulk_writes == 3  # 📌 One deletion round trip per batch of 3, 3, 1
+        assert collection.docs == {}
+    asyncio.run(run())
+
+def test_reschedule_moves_an_existing_job():
+    async def run():
+        scheduler, clock, collection, fired = make_scheduler()
+        await scheduler.schedule("lift", "test", due(10))
+        await scheduler.schedule("lift", "test", due(60))
+        assert scheduler.pending() == 1
+
+        clock.advance(30)
+        assert await scheduler.run_due() == 0
+        assert collection.docs["lift"]["due"] == due(60)
+        clock.advance(30)
+        assert await scheduler.run_due() == 1
+        assert fired == ["lift"]
+        assert collection.docs == {}
+    asyncio.run(run())
+
+def test_cancel_removes_an_existing_job():
+    async def run():
+        scheduler, clock, collection, fired = make_scheduler()
+        await scheduler.schedule("lift", "test", due(10))
+        await scheduler.schedule("other", "test", due(20))
+        await scheduler.cancel("lift")
+
+        assert "lift" not in collection.docs
+        clock.advance(60)
+        assert await scheduler.run_due() == 1
+        assert fired == ["other"]
+    asyncio.run(run())
+
+def test_job_rescheduled_by_its_handler_stays_persisted():
+    async def run():
+        scheduler, clock, collection, fired = make_scheduler()
+
+        async def renew(job: dict):
+            fired.append(job["_id"])
+            await scheduler.schedule(job["_id"], "renew", due(120))
+        scheduler.register("renew", renew)
+        await scheduler.schedule("role", "renew", due(10))
+
+        clock.advance(10)
+        assert await scheduler.run_due() == 1
+        assert collection.docs["role"]["due"] == due(120)
+        assert scheduler.pending() == 1
+    asyncio.run(run())
+
+def test_jobs_overdue_while_offline_fire_on_start():
+    async def run():
+        scheduler, clock, collection, fired = make_scheduler(job_filter=lambda job: job["guild_id"] == 1)
+        # 📌 Persisted by a previous run; the bot comes back after some of them became due.
+        for job_id, seconds, guild_id in (("late2", -30, 1), ("late1", -90, 1), ("future", 300, 1), ("other_shard", -60, 2)):
+            collection.docs[job_id] = {"_id": job_id, "kind": "test", "due": due(seconds), "guild_id": guild_id}
+
+        await scheduler.start()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert fired == ["late1", "late2"]
+        assert set(collection.docs) == {"future", "other_shard"}
+
+        clock.advance(300)
+        scheduler.wake()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert fired == ["late1", "late2", "future"]
+        await scheduler.stop()
+    asyncio.run(run())
+
+def test_failed_job_is_kept_and_retried_with_backoff():
+    async def run():
+        scheduler, clock, collection, fired = make_scheduler()
+        failures = [RuntimeError("discord unavailable")]
+
+        async def flaky(job: dict):
+            if failures:
+                raise failures.pop()
+            fired.append(job["_id"])
+        scheduler.register("flaky", flaky)
+        await scheduler.schedule("lift", "flaky", due(10))
+        await scheduler.schedule("ok", "test", due(10))
+
+        clock.advance(10)
+        assert await scheduler.run_due() == 2
+        assert fired == ["ok"]
+        assert set(collection.docs) == {"lift"}
+        assert collection.docs["lift"]["attempts"] == 1
+        assert collection.docs["lift"]["due"] == due(10 + JOB_RETRY_SECONDS)
+
+        clock.advance(JOB_RETRY_SECONDS - 1)
+        assert await scheduler.run_due() == 0
+        clock.advance(1)
+        assert await scheduler.run_due() == 1
+        assert fired == ["ok", "lift"]
+        assert collection.docs == {}
+    asyncio.run(run())
+
+def test_job_that_keeps_failing_is_dropped_after_max_attempts():
+    async def run():
+        scheduler, clock, collection, fired = make_scheduler()
+        attempts = []
+
+        async def broken(job: dict):
+            attempts.append(job.get("attempts", 0))
+            raise RuntimeError("permanent")
+        scheduler.register("broken", broken)
+        await scheduler.schedule("lift", "broken", due(0))
+
+        for _ in range(JOB_MAX_ATTEMPTS + 2):
+            clock.advance(24 * 3600)
+            await scheduler.run_due()
+        assert attempts == list(range(JOB_MAX_ATTEMPTS))
+        assert collection.docs == {}
+        assert scheduler.pending() == 0
+    asyncio.run(run())
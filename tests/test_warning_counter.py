@@ -0,0 +1,85 @@
+# 📌 tests/test_warning_counter.py
+# 📌 WarningCounter under hundreds of concurrent warnings against the in-process Mongo stand-in.
+
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fake_mongo import FakeCollection
+from utils.user_state import user_query
+from utils.warning_counter import SlidingWindow, WarningCounter
+
+GUILD_ID, USER_ID = 1, 2
+CALLS = 300
+LIMIT = 3
+
+class JitteryCollection(FakeCollection):
+    """📌 Random per-call latency, so concurrent calls interleave the way real round trips do."""
+    def __init__(self):
+        super().__init__(delay=0.002, name="users")
+        self.random = random.Random(7)
+
+    async def _wait(self):
+        self.round_trips += 1
+        await asyncio.sleep(self.random.uniform(0, self.delay))
+
+def make_counter(decay: float = 3600) -> WarningCounter:
+    # 📌 Front layer opened wide so every call reaches the database.
+    return WarningCounter(JitteryCollection(), limit=LIMIT, decay=decay, front=SlidingWindow(window=60, burst=CALLS * 2))
+
+def stored(counter: WarningCounter) -> int:
+    return counter.collection.docs[user_query(GUILD_ID, USER_ID)["_id"]]["warnings"]
+
+def test_concurrent_warnings_are_all_counted():
+    counter = make_counter()
+
+    async def run():
+        return await asyncio.gather(*(counter.warn(GUILD_ID, USER_ID) for _ in range(CALLS)))
+    strikes = asyncio.run(run())
+
+    assert stored(counter) == CALLS
+    assert counter.counted == CALLS and counter.dropped == 0
+    assert sum(strike.timeout for strike in strikes) == CALLS // LIMIT == counter.timeouts
+    # 📌 Every cycle hands out each warning number once, and only its last number triggers the timeout.
+    assert Counter(strike.number for strike in strikes) == {number: CALLS // LIMIT for number in range(1, LIMIT + 1)}
+    assert all(strike.timeout == (strike.number == LIMIT) for strike in strikes)
+
+def test_concurrent_increments_return_unique_counts():
+    counter = make_counter()
+
+    async def run():
+        return await asyncio.gather(*(counter.increment(GUILD_ID, USER_ID) for _ in range(CALLS)))
+    counts = asyncio.run(run())
+
+    assert sorted(counts) == list(range(1, CALLS + 1))
+    assert stored(counter) == CALLS
+
+def test_warnings_decay_after_the_window():
+    counter = make_counter(decay=60)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    async def run():
+        before = await asyncio.gather(*(counter.increment(GUILD_ID, USER_ID, now) for _ in range(CALLS)))
+        within = await counter.increment(GUILD_ID, USER_ID, now + timedelta(seconds=59))
+        later = now + timedelta(seconds=59 + 61)
+        after = await asyncio.gather(*(counter.increment(GUILD_ID, USER_ID, later) for _ in range(CALLS)))
+        return before, within, after
+    before, within, after = asyncio.run(run())
+
+    assert max(before) == CALLS
+    assert within == CALLS + 1
+    # 📌 The first warning past the window restarts at 1; the concurrent rest still count up exactly.
+    assert sorted(after) == list(range(1, CALLS + 1))
+    assert stored(counter) == CALLS
+
+def test_front_layer_drops_repeats_without_a_round_trip():
+    counter = WarningCounter(JitteryCollection(), limit=LIMIT, front=SlidingWindow(window=60, burst=1))
+
+    async def run():
+        return await asyncio.gather(*(counter.warn(GUILD_ID, USER_ID) for _ in range(CALLS)))
+    strikes = asyncio.run(run())
+
+    assert sum(strike is not None for strike in strikes) == 1
+    assert counter.dropped == CALLS - 1
+    assert counter.collection.round_trips == 1
@@ -0,0 +1,103 @@
+# 📌 utils/ban_index.py
+
+import logging
+from typing import Optional
+
+import discord
+from pymongo import ASCENDING, DeleteOne, UpdateOne
+from utils.database import bans_collection, users_collection
+from utils.user_state import update_user, user_update_op
+from utils.write_buffer import users_buffer
+from utils import indexes
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.ban_index")
+
+# 📌 Bans requested from Discord per page during reconciliation (the API maximum).
+RECONCILE_PAGE_SIZE = 1000
+
+def _ban_id(guild_id: int, user_id: int) -> str:
+    return f"{guild_id}:{user_id}"
+
+# 📌 Index used to walk one guild's mirrored bans in user-ID order during reconciliation.
+indexes.register(bans_collection, [("guild_id", ASCENDING), ("user_id", ASCENDING)])
+
+async def is_banned(guild_id: int, user_id: int) -> bool:
+    """📌 O(1) lookup in the local ban mirror (may lag Discord until the next event or reconciliation)."""
+    return await bans_collection.find_one({"_id": _ban_id(guild_id, user_id)}, {"_id": 1}) is not None
+
+async def record_ban(guild_id: int, user_id: int, reason: Optional[str] = None):
+    """📌 Mirrors a ban and sets the member's `banned` flag for that guild."""
+    await bans_collection.update_one(
+        {"_id": _ban_id(guild_id, user_id)},
+        {"$set": {"guild_id": guild_id, "user_id": user_id, "reason": reason}},
+        upsert=True
+    )
+    await update_user(guild_id, user_id, {"$set": {"banned": True}})
+
+async def record_unban(guild_id: int, user_id: int):
+    """📌 Removes a ban from the mirror and clears the member's `banned` flag for that guild."""
+    await bans_collection.delete_one({"_id": _ban_id(guild_id, user_id)})
+    await update_user(guild_id, user_id, {"$set": {"banned": False}}, upsert=False)
+
+async def lookup_ban(guild: discord.Guild, user_id: int) -> Optional[discord.BanEntry]:
+    """
+    📌 Finds a single ban without listing the guild's ban list.
+    📌 Uses the direct GET /bans/{user} endpoint (one REST call) and repairs the mirror if it disagrees.
+    """
+    mirrored = await is_banned(guild.id, user_id)
+    try:
+        entry = await guild.fetch_ban(discord.Object(user_id))
+    except discord.NotFound:
+        if mirrored:
+            await record_unban(guild.id, user_id)
+        return None
+    if not mirrored:
+        await record_ban(guild.id, user_id, entry.reason)
+    return entry
+
+async def reconcile_guild(guild: discord.Guild) -> dict:
+    """
+    📌 Diffs the mirror against Discord one page of bans at a time, so memory stays bounded by the page size.
+    📌 Each page covers a contiguous user-ID range; mirrored bans in that range that Discord didn't return are removed.
+    📌 Members' `banned` flags in the same range are set or cleared to match Discord too (flags written before
+    📌 the mirror existed, or by a missed event, are fixed here).
+    📌 Returns the number of mirror entries added and removed, and of flags corrected.
+    """
+    added = removed = flags = 0
+    lower = 0
+    await users_buffer.flush()  # 📌 So buffered flag writes are seen below
+    while True:
+        page = [entry async for entry in guild.bans(limit=RECONCILE_PAGE_SIZE, after=discord.Object(lower))]
+        upper = page[-1].user.id if len(page) == RECONCILE_PAGE_SIZE else None
+        range_query = {"guild_id": guild.id, "user_id": {"$gt": lower}}
+        if upper is not None:
+            range_query["user_id"]["$lte"] = upper
+        mirrored = {doc["user_id"] async for doc in bans_collection.find(range_query, {"user_id": 1})}
+        flagged = {doc["user_id"] async for doc in users_collection.find({**range_query, "banned": True}, {"user_id": 1})}
+        actual = {entry.user.id: entry for entry in page}
+
+        ops = [
+            UpdateOne({"_id": _ban_id(guild.id, user_id)},
+                      {"$set": {"guild_id": guild.id, "user_id": user_id, "reason": actual[user_id].reason}},
+                      upsert=True)
+            for user_id in actual.keys() - mirrored
+        ]
+        ops += [DeleteOne({"_id": _ban_id(guild.id, user_id)}) for user_id in mirrored - actual.keys()]
+        if ops:
+            await bans_collection.bulk_write(ops, ordered=False)
+        flag_ops = [user_update_op(guild.id, user_id, {"$set": {"banned": True}}) for user_id in actual.keys() - flagged]
+        flag_ops += [user_update_op(guild.id, user_id, {"$set": {"banned": False}}, upsert=False)
+                     for user_id in flagged - actual.keys()]
+        if flag_ops:
+            await users_collection.bulk_write(flag_ops, ordered=False)
+        added += len(actual.keys() - mirrored)
+        removed += len(mirrored - actual.keys())
+        flags += len(flag_ops)
+
+        if upper is None:
+            break
+        lower = upper
+    if added or removed or flags:
+        logger.info(f"Ban mirror for guild {guild.id}: +{added} / -{removed}, {flags} banned flags corrected")
+    return {"added": added, "removed": removed, "flags": flags}
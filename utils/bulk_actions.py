@@ -0,0 +1,124 @@
+# 📌 utils/bulk_actions.py
+
+import asyncio
+import re
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+import discord
+from utils.member_cache import LEAN_MODE
+from utils.guild_snapshot import snapshot
+from utils.dispatcher import Priority, channel_bucket, dispatcher
+
+# 📌 Upper bound on targets per bulk command, to keep a single run within a sane time budget.
+MAX_TARGETS = 1000
+# 📌 Concurrent REST calls per bulk run. discord.py queues each request on its per-route
+# 📌 rate-limit bucket, so a small pool keeps that queue short without idling between responses.
+DEFAULT_CONCURRENCY = 5
+# 📌 Minimum seconds between progress message edits.
+PROGRESS_INTERVAL = 2.0
+# 📌 Discord's bulk-ban endpoint accepts at most this many users per request.
+BULK_BAN_CHUNK = 200
+
+USER_ID_PATTERN = re.compile(r"\d{15,20}")
+
+class BulkResult(NamedTuple):
+    """📌 Outcome of a bulk run: IDs that succeeded and {id: error} for the ones that failed."""
+    succeeded: list
+    failed: dict
+
+def parse_user_ids(text: str) -> list:
+    """📌 Extracts unique user IDs (raw or <@mention> form) from free text, keeping their order."""
+    return list(dict.fromkeys(int(match) for match in USER_ID_PATTERN.findall(text or "")))
+
+async def select_members(guild: discord.Guild, role: Optional[discord.Role] = None,
+                         joined_within: Optional[int] = None) -> list:
+    """
+    📌 Returns IDs of members matching a role and/or a "joined in the last N seconds" filter.
+    📌 Reads the member cache when the guild is fully chunked, otherwise the guild snapshot (if it has the guild),
+    📌 and with the lean member cache and no snapshot pages the member list from the API.
+    """
+    cutoff = discord.utils.utcnow() - timedelta(seconds=joined_within) if joined_within else None
+
+    def matches(member: discord.Member) -> bool:
+        if role is not None and role not in member.roles:
+            return False
+        if cutoff is not None and (member.joined_at is None or member.joined_at < cutoff):
+            return False
+        return not member.bot
+
+    if not LEAN_MODE and guild.chunked:
+        return [member.id for member in guild.members if matches(member)]
+    if snapshot.has_guild(guild.id):
+        return snapshot.members_matching(guild.id, role.id if role else None, cutoff)
+    if LEAN_MODE:
+        return [member.id async for member in guild.fetch_members(limit=None) if matches(member)]
+    return [member.id for member in guild.members if matches(member)]
+
+class ProgressReporter:
+    """
+    📌 Edits one followup message with progress, at most once every PROGRESS_INTERVAL seconds.
+    📌 Edits are low-priority, fire-and-forget dispatcher jobs, so they never hold up the moderation actions.
+    """
+    def __init__(self, message: discord.WebhookMessage, label: str, total: int):
+        self.message = message
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self._last_edit = 0.0
+
+    async def advance(self, ok: bool):
+        self.done += 1
+        if not ok:
+            self.failed += 1
+        if self.done < self.total and time.monotonic() - self._last_edit < PROGRESS_INTERVAL:
+            return
+        self._last_edit = time.monotonic()
+        content = f"⏳ {self.label}: `{self.done}/{self.total}` processed, `{self.failed}` failed"
+        dispatcher.post(Priority.STATUS, channel_bucket(self.message.channel),
+                        lambda: self.message.edit(content=content), key=self._key)
+
+    @property
+    def _key(self) -> str:
+        return f"progress:{self.message.id}"
+
+    async def finish(self, content: str):
+        """📌 Replaces the progress text with the final summary (superseding any progress edit still queued)."""
+        await dispatcher.submit(Priority.REPLY, channel_bucket(self.message.channel),
+                                lambda: self.message.edit(content=content), key=self._key)
+
+async def run_bulk(targets: list, action: Callable[[int], Awaitable[None]],
+                   progress: Optional[ProgressReporter] = None,
+                   concurrency: int = DEFAULT_CONCURRENCY) -> BulkResult:
+    """📌 Runs `action(user_id)` for every target through a bounded worker pool."""
+    succeeded, failed = [], {}
+    queue = asyncio.Queue()
+    for target in targets:
+        queue.put_nowait(target)
+
+    async def worker():
+        while not queue.empty():
+            target = queue.get_nowait()
+            try:
+                await action(target)
+                succeeded.append(target)
+                ok = True
+            except Exception as e:
+                failed[target] = str(e) or type(e).__name__
+                ok = False
+            if progress:
+                await progress.advance(ok)
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(targets)))))
+    return BulkResult(succeeded, failed)
+
+def summary(label: str, result: BulkResult, limit: int = 10) -> str:
+    """📌 Human-readable final summary with the first few failures."""
+    lines = [f"✅ {label}: `{len(result.succeeded)}` succeeded, `{len(result.failed)}` failed."]
+    for user_id, error in list(result.failed.items())[:limit]:
+        lines.append(f"• `{user_id}`: {error[:100]}")
+    if len(result.failed) > limit:
+        lines.append(f"… and {len(result.failed) - limit} more failures")
+    return "\n".join(lines)
@@ -1,22 +1,30 @@
 # 📌 utils/database.py
 
 import os
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient
 from dotenv import load_dotenv
+from utils.metrics import MongoTimingListener
+from utils.query_profiler import QUERY_PROFILER, query_profiler
 
 # 📌 Load environment variables to get the MongoDB URI
 load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
 
-# 📌 Create a MongoDB client using the provided URI.
-client = MongoClient(MONGO_URI)
+# 📌 Create an asynchronous MongoDB client using the provided URI.
+# 📌 Every collection method (find_one, update_one, ...) is a coroutine, so queries never block the event loop.
+# 📌 The command listener attributes database time to the command being handled (see utils/metrics.py),
+# 📌 and, with QUERY_PROFILER=1, the query profiler records query shapes and explains slow ones (see utils/query_profiler.py).
+listeners = [MongoTimingListener()] + ([query_profiler] if QUERY_PROFILER else [])
+client = AsyncMongoClient(MONGO_URI, event_listeners=listeners)
+query_profiler.attach(client)
 
 # 📌 Select the database (change "DiscordBot" to your database name if needed)
 db = client["DiscordBot"]
 
 def get_collection(collection_name: str):
     """
-    📌 Returns a collection from the MongoDB database.
+    📌 Returns an async collection from the MongoDB database.
+    📌 All of its query methods must be awaited.
     """
     return db[collection_name]
 
@@ -24,3 +32,14 @@ def get_collection(collection_name: str):
 users_collection = get_collection("users")
 settings_collection = get_collection("bot_settings")
 roles_collection = get_collection("roles")
+jobs_collection = get_collection("scheduled_jobs")
+timeout_days_collection = get_collection("timeout_days")
+bans_collection = get_collection("bans")
+panels_collection = get_collection("status_panels")
+mod_events_collection = get_collection("mod_events")
+
+async def close():
+    """
+    📌 Closes the MongoDB client. Called once when the bot shuts down.
+    """
+    await client.close()
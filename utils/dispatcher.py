@@ -0,0 +1,302 @@
+# 📌 utils/dispatcher.py
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import Counter
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Optional
+
+import discord
+from utils import metrics
+from utils.supervisor import supervisor
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.dispatcher")
+
+# 📌 Outbound REST calls in flight across all buckets, and per rate-limit bucket.
+DISPATCH_WORKERS = int(os.getenv("DISPATCH_WORKERS", "10"))
+DISPATCH_BUCKET_CONCURRENCY = int(os.getenv("DISPATCH_BUCKET_CONCURRENCY", "5"))
+# 📌 Queued notification/status jobs allowed per bucket before new ones are dropped.
+DISPATCH_MAX_QUEUED = int(os.getenv("DISPATCH_MAX_QUEUED", "50"))
+# 📌 Notifications for the same channel arriving within this window are sent as one digest message.
+DIGEST_WINDOW = float(os.getenv("DIGEST_WINDOW", "2.0"))
+# 📌 A call slower than this (discord.py waited out a rate limit) or a 429 puts its bucket under pressure
+# 📌 for PRESSURE_SECONDS, during which only enforcement and replies are sent on it.
+SLOW_CALL_SECONDS = 1.0
+PRESSURE_SECONDS = 5.0
+# 📌 Discord's message length limit.
+MAX_MESSAGE_LENGTH = 2000
+
+class Priority(IntEnum):
+    """📌 Lower values are sent first."""
+    ENFORCEMENT = 0  # 📌 Bans, timeouts, role changes
+    REPLY = 1  # 📌 Followups and other messages someone is waiting for
+    NOTIFICATION = 2  # 📌 Expiry notices and other announcements (digested)
+    STATUS = 3  # 📌 Live panels and progress edits (coalesced)
+
+def guild_bucket(guild) -> str:
+    """📌 Bucket for member/role/ban endpoints, which Discord rate-limits per guild."""
+    return f"guild:{guild.id}"
+
+def channel_bucket(channel) -> str:
+    """📌 Bucket for message endpoints, which Discord rate-limits per channel."""
+    return f"channel:{channel.id}"
+
+class _Job:
+    __slots__ = ("priority", "bucket", "action", "future", "key", "queued")
+
+    def __init__(self, priority: Priority, bucket: str, action: Callable[[], Awaitable[Any]], key: Optional[str]):
+        self.priority = priority
+        self.bucket = bucket
+        self.action = action
+        self.future = asyncio.get_running_loop().create_future()
+        self.key = key
+        self.queued = True
+
+class OutboundDispatcher:
+    """
+    📌 Central queue for outbound Discord REST calls, so cosmetic traffic never delays enforcement.
+    📌 Jobs are taken in priority order, limited per rate-limit bucket; buckets that hit rate limits only
+    📌 carry enforcement and replies until they recover. Status jobs with the same key are coalesced (latest wins),
+    📌 and notification lines are merged into one digest message per channel.
+    📌 Before start() (scripts, benchmarks) every call runs immediately, as if there were no dispatcher.
+    """
+    def __init__(self, workers: int = DISPATCH_WORKERS, bucket_concurrency: int = DISPATCH_BUCKET_CONCURRENCY,
+                 max_queued: int = DISPATCH_MAX_QUEUED, digest_window: float = DIGEST_WINDOW):
+        self.workers = workers
+        self.bucket_concurrency = bucket_concurrency
+        self.max_queued = max_queued
+        self.digest_window = digest_window
+        self._heap = []  # 📌 (priority, sequence, job)
+        self._sequence = itertools.count()
+        self._keys = {}  # 📌 coalescing key -> queued job
+        self._queued = Counter()  # 📌 bucket -> queued jobs
+        self._inflight = Counter()  # 📌 bucket -> running jobs
+        self._pressure = {}  # 📌 bucket -> monotonic time its pressure ends
+        self._digests = {}  # 📌 channel id -> pending notification lines
+        self._background = set()
+        self._wakeup = asyncio.Event()
+        self._tasks = []
+        self.sent = Counter()
+        self.dropped = Counter()
+        self.coalesced = Counter()
+
+    # -------------------- SUBMITTING --------------------
+    async def submit(self, priority: Priority, bucket: str, action: Callable[[], Awaitable[Any]],
+                     key: Optional[str] = None):
+        """
+        📌 Queues `action` (a zero-argument coroutine function) and returns its result.
+        📌 Low-priority jobs return None without running if they were dropped or superseded by a newer job with the same key.
+        """
+        if not self._tasks:
+            return await action()
+        if key is not None and key in self._keys:
+            # 📌 Same target already queued: run the newest version once, in the earlier job's place.
+            queued = self._keys[key]
+            queued.action = action
+            self.coalesced[queued.priority.name.lower()] += 1
+            if priority < queued.priority:
+                # 📌 e.g. a final summary replacing a pending progress edit: move it up (the old entry is skipped).
+                queued.priority = priority
+                heapq.heappush(self._heap, (priority, next(self._sequence), queued))
+                self._wakeup.set()
+            return await asyncio.shield(queued.future)
+        if priority >= Priority.NOTIFICATION and self._queued[bucket] >= self.max_queued:
+            self.dropped[priority.name.lower()] += 1
+            return None
+        job = _Job(priority, bucket, action, key)
+        heapq.heappush(self._heap, (priority, next(self._sequence), job))
+        self._queued[bucket] += 1
+        if key is not None:
+            self._keys[key] = job
+        self._wakeup.set()
+        return await job.future
+
+    def post(self, priority: Priority, bucket: str, action: Callable[[], Awaitable[Any]], key: Optional[str] = None):
+        """📌 Fire-and-forget submit(): failures are logged instead of raised (progress edits, notices)."""
+        if not self._spawn(self._post(priority, bucket, action, key), "post"):
+            self.dropped[priority.name.lower()] += 1
+
+    async def _post(self, priority, bucket, action, key=None):
+        try:
+            await self.submit(priority, bucket, action, key)
+        except discord.HTTPException as e:
+            logger.warning(f"Outbound {priority.name.lower()} call on {bucket} failed: {e}")
+
+    def notify(self, channel, line: str):
+        """📌 Queues one notification line for `channel`; lines within DIGEST_WINDOW go out as one message."""
+        lines = self._digests.get(channel.id)
+        if lines is not None:
+            lines.append(line)
+            return
+        self._digests[channel.id] = [line]
+        if not self._spawn(self._send_digest(channel), "digest"):
+            del self._digests[channel.id]
+            self.dropped["notification"] += 1
+
+    async def _send_digest(self, channel):
+        await asyncio.sleep(self.digest_window)
+        lines = self._digests.pop(channel.id, [])
+        if len(lines) == 1:
+            await self._post(Priority.NOTIFICATION, channel_bucket(channel), lambda: channel.send(lines[0]))
+            return
+        # 📌 A digest mentions many users; render the mentions without pinging all of them.
+        self.coalesced["notification"] += len(lines) - 1
+        await self._post(Priority.NOTIFICATION, channel_bucket(channel),
+                         lambda: channel.send(self.digest(lines), allowed_mentions=discord.AllowedMentions(users=False)))
+
+    @staticmethod
+    def digest(lines: list) -> str:
+        """📌 Joins notification lines into one message, trimmed to Discord's length limit."""
+        if len(lines) == 1:
+            return lines[0]
+        text = f"📋 **{len(lines)} notifications**"
+        for i, line in enumerate(lines):
+            remaining = len(lines) - i
+            if len(text) + len(line) + 1 > MAX_MESSAGE_LENGTH - 30:
+                return text + f"\n… and {remaining} more"
+            text += "\n" + line
+        return text
+
+    def _spawn(self, coro, name: str) -> bool:
+        """📌 Starts a per-message task under the background task cap. Returns False when the cap refused it."""
+        task = supervisor.spawn(coro, name, owner="dispatcher")
+        if task is None:
+            return False
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return True
+
+    # -------------------- RUNNING --------------------
+    def start(self):
+        if not self._tasks:
+            self._tasks = [supervisor.spawn(self._worker(), f"worker-{i}", owner="dispatcher", essential=True)
+                           for i in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0):
+        """📌 Sends pending digests, waits up to `timeout` for the queue to drain, then stops the workers."""
+        # 📌 Pending digests are background tasks that send after their window; let them finish first.
+        if self._background:
+            await asyncio.wait(list(self._background), timeout=timeout)
+        deadline = time.monotonic() + timeout
+        while (sum(self._queued.values()) or sum(self._inflight.values())) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for _, _, job in self._heap:
+            if not job.future.done():
+                job.future.cancel()
+        self._heap.clear()
+        self._queued.clear()
+        self._keys.clear()
+
+    def _eligible(self, job: _Job, now: float) -> bool:
+        if self._inflight[job.bucket] >= self.bucket_concurrency:
+            return False
+        return job.priority <= Priority.REPLY or self._pressure.get(job.bucket, 0.0) <= now
+
+    def _next_job(self) -> Optional[_Job]:
+        """📌 Pops the highest-priority job whose bucket can take another call right now."""
+        now = time.monotonic()
+        skipped, found = [], None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if not entry[2].queued or entry[0] != entry[2].priority:
+                continue  # 📌 Already taken, or re-queued at a higher priority
+            if entry[2].future.done():
+                self._forget(entry[2])  # 📌 Caller gave up (cancelled)
+                continue
+            if self._eligible(entry[2], now):
+                found = entry[2]
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    def _forget(self, job: _Job):
+        job.queued = False
+        self._queued[job.bucket] -= 1
+        if not self._queued[job.bucket]:
+            del self._queued[job.bucket]
+        if job.key is not None and self._keys.get(job.key) is job:
+            del self._keys[job.key]
+
+    async def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._wakeup.clear()
+                # 📌 Re-check periodically while buckets are under pressure, since nothing else wakes us when it ends.
+                timeout = 0.5 if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._execute(job)
+
+    def _press(self, bucket: str):
+        """📌 Marks `bucket` pressured for PRESSURE_SECONDS, dropping expired entries so the dict stays bounded."""
+        self.pressured_buckets()
+        self._pressure[bucket] = time.monotonic() + PRESSURE_SECONDS
+
+    async def _execute(self, job: _Job):
+        self._forget(job)
+        self._inflight[job.bucket] += 1
+        started = time.monotonic()
+        try:
+            result = await job.action()
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self._press(job.bucket)
+            if not job.future.done():
+                job.future.set_exception(e)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+            self.sent[job.priority.name.lower()] += 1
+        finally:
+            self._inflight[job.bucket] -= 1
+            if not self._inflight[job.bucket]:
+                del self._inflight[job.bucket]
+            if time.monotonic() - started > SLOW_CALL_SECONDS:
+                self._press(job.bucket)
+            self._wakeup.set()
+
+    # -------------------- METRICS --------------------
+    def depths(self) -> dict:
+        """📌 Queued jobs per priority class."""
+        depths = {priority.name.lower(): 0 for priority in Priority}
+        for priority, _, job in self._heap:
+            if job.queued and priority == job.priority:
+                depths[Priority(priority).name.lower()] += 1
+        return depths
+
+    def pressured_buckets(self) -> int:
+        """📌 Buckets currently under pressure; expired entries are removed here too (their buckets may never queue again)."""
+        now = time.monotonic()
+        for bucket in [bucket for bucket, until in self._pressure.items() if until <= now]:
+            del self._pressure[bucket]
+        return len(self._pressure)
+
+# 📌 Shared dispatcher (started and stopped in bot.py).
+dispatcher = OutboundDispatcher()
+
+metrics.register_gauge("bot_outbound_queue_depth", "Queued outbound Discord calls per priority",
+                       "priority", dispatcher.depths)
+metrics.register_gauge("bot_outbound_sent_total", "Outbound Discord calls sent per priority",
+                       "priority", lambda: dict(dispatcher.sent), kind="counter")
+metrics.register_gauge("bot_outbound_dropped_total", "Low-priority outbound calls dropped under backpressure",
+                       "priority", lambda: dict(dispatcher.dropped), kind="counter")
+metrics.register_gauge("bot_outbound_coalesced_total", "Outbound calls merged into a newer call or a digest",
+                       "priority", lambda: dict(dispatcher.coalesced), kind="counter")
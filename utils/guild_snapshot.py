@@ -0,0 +1,308 @@
+# 📌 utils/guild_snapshot.py
+
+import asyncio
+import logging
+import os
+import struct
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+
+import discord
+from utils.supervisor import supervisor
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.guild_snapshot")
+
+# 📌 File for the guild snapshot (unset = disabled). When a snapshot is loaded at boot the bot skips
+# 📌 chunking every guild and reconciles the snapshot from gateway events instead.
+GUILD_SNAPSHOT_PATH = os.getenv("GUILD_SNAPSHOT_PATH")
+# 📌 Shards this process runs (set by cluster.py); each cluster worker keeps its own snapshot file.
+SHARD_IDS = [int(s) for s in os.getenv("SHARD_IDS").split(",")] if os.getenv("SHARD_IDS") else None
+SHARD_COUNT = os.getenv("SHARD_COUNT")
+# 📌 Seconds between snapshot writes (only written when something changed).
+GUILD_SNAPSHOT_INTERVAL = float(os.getenv("GUILD_SNAPSHOT_INTERVAL", "300"))
+
+# 📌 Binary layout (little-endian):
+# 📌   header  magic[8] saved_at:f64 guild_count:u32
+# 📌   guild   guild_id:u64 role_count:u32 member_count:u32
+# 📌   role    role_id:u64 position:i32 permissions:i64
+# 📌   member  user_id:u64 joined_at:f64 bot:u8 role_count:u16, then role_count x role_id:u64
+MAGIC = b"GSNAP\x00\x00\x01"
+_HEADER = struct.Struct("<8sdI")
+_GUILD = struct.Struct("<QII")
+_ROLE = struct.Struct("<Qiq")
+_MEMBER = struct.Struct("<QdBH")
+
+class MemberState(NamedTuple):
+    """📌 What the cogs need to know about a member: role IDs, join time (0 = unknown) and the bot flag."""
+    role_ids: tuple
+    joined_at: float
+    bot: bool
+
+    @classmethod
+    def from_member(cls, member: discord.Member) -> "MemberState":
+        return cls(
+            tuple(role.id for role in member.roles if role.id != member.guild.id),
+            member.joined_at.timestamp() if member.joined_at else 0.0,
+            member.bot,
+        )
+
+    @property
+    def joined_datetime(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.joined_at, timezone.utc) if self.joined_at else None
+
+class GuildState:
+    """📌 role_id -> (position, permissions) and user_id -> MemberState for one guild."""
+    __slots__ = ("roles", "members")
+
+    def __init__(self):
+        self.roles = {}
+        self.members = {}
+
+def shard_path(path: Optional[str], shard_ids: Optional[list] = SHARD_IDS, shard_count: Optional[str] = SHARD_COUNT) -> Optional[str]:
+    """
+    📌 The snapshot file for a shard range: "guilds.snap" -> "guilds.shards-0-3-of-16.snap" in a cluster worker.
+    📌 Workers never overwrite each other's snapshots, and a changed shard layout starts from a fresh chunk.
+    """
+    if path is None or not shard_ids:
+        return path
+    shard_ids = sorted(shard_ids)
+    if shard_ids == list(range(shard_ids[0], shard_ids[-1] + 1)):
+        shards = f"{shard_ids[0]}-{shard_ids[-1]}"
+    else:
+        shards = "_".join(map(str, shard_ids))
+    root, extension = os.path.splitext(path)
+    return f"{root}.shards-{shards}-of-{shard_count or 'auto'}{extension}"
+
+def _timestamp(value: Optional[str]) -> float:
+    return datetime.fromisoformat(value).timestamp() if value else 0.0
+
+def _member_state(data: dict) -> MemberState:
+    """📌 Builds a MemberState from a raw gateway member payload."""
+    return MemberState(
+        tuple(int(role_id) for role_id in data.get("roles", ())),
+        _timestamp(data.get("joined_at")),
+        bool(data.get("user", {}).get("bot", False)),
+    )
+
+class GuildSnapshot:
+    """
+    📌 Compact on-disk copy of the guild, role and member data the cogs use.
+    📌 Loaded at boot instead of re-chunking every guild, kept current from raw gateway events,
+    📌 and written back periodically and on shutdown.
+    """
+    def __init__(self, path: Optional[str] = shard_path(GUILD_SNAPSHOT_PATH), interval: float = GUILD_SNAPSHOT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.guilds = {}
+        self.loaded = False
+        self.dirty = False
+        self._task = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    # -------------------- LOOKUPS --------------------
+    def has_guild(self, guild_id: int) -> bool:
+        return guild_id in self.guilds
+
+    def member(self, guild_id: int, user_id: int) -> Optional[MemberState]:
+        state = self.guilds.get(guild_id)
+        return state.members.get(user_id) if state else None
+
+    def role_positions(self, guild_id: int) -> dict:
+        state = self.guilds.get(guild_id)
+        return {role_id: position for role_id, (position, _) in state.roles.items()} if state else {}
+
+    def members_matching(self, guild_id: int, role_id: Optional[int] = None,
+                         joined_after: Optional[datetime] = None, include_bots: bool = False) -> list:
+        """📌 IDs of snapshot members with `role_id` and/or joined after `joined_after`."""
+        state = self.guilds.get(guild_id)
+        if state is None:
+            return []
+        cutoff = joined_after.timestamp() if joined_after else None
+        return [
+            user_id for user_id, member in state.members.items()
+            if (include_bots or not member.bot)
+            and (role_id is None or role_id in member.role_ids)
+            and (cutoff is None or member.joined_at >= cutoff)
+        ]
+
+    # -------------------- RECONCILIATION --------------------
+    def observe_member(self, member: discord.Member):
+        """📌 Records a member seen through the API (interaction payloads, REST fetches)."""
+        if not self.enabled:
+            return
+        state = self.guilds.setdefault(member.guild.id, GuildState())
+        state.members[member.id] = MemberState.from_member(member)
+        self.dirty = True
+
+    def _guild_create(self, data: dict):
+        if data.get("unavailable"):
+            return
+        state = self.guilds.setdefault(int(data["id"]), GuildState())
+        state.roles = {int(role["id"]): (role["position"], int(role["permissions"])) for role in data.get("roles", ())}
+        # 📌 Large guilds only include a few members here; the rest stay as last seen.
+        for member in data.get("members", ()):
+            state.members[int(member["user"]["id"])] = _member_state(member)
+
+    def _guild_delete(self, data: dict):
+        if not data.get("unavailable"):
+            self.guilds.pop(int(data["id"]), None)
+
+    def _role_upsert(self, data: dict):
+        role = data["role"]
+        state = self.guilds.setdefault(int(data["guild_id"]), GuildState())
+        state.roles[int(role["id"])] = (role["position"], int(role["permissions"]))
+
+    def _role_delete(self, data: dict):
+        state = self.guilds.get(int(data["guild_id"]))
+        if state:
+            state.roles.pop(int(data["role_id"]), None)
+
+    def _member_upsert(self, data: dict):
+        state = self.guilds.setdefault(int(data["guild_id"]), GuildState())
+        state.members[int(data["user"]["id"])] = _member_state(data)
+
+    def _member_remove(self, data: dict):
+        state = self.guilds.get(int(data["guild_id"]))
+        if state:
+            state.members.pop(int(data["user"]["id"]), None)
+
+    def _members_chunk(self, data: dict):
+        state = self.guilds.setdefault(int(data["guild_id"]), GuildState())
+        for member in data.get("members", ()):
+            state.members[int(member["user"]["id"])] = _member_state(member)
+
+    def install(self, bot):
+        """
+        📌 Hooks the raw gateway parsers so the snapshot sees every member and role event, including
+        📌 members discord.py doesn't cache (it only dispatches on_member_update for cached members).
+        """
+        if not self.enabled:
+            return
+        handlers = {
+            "GUILD_CREATE": self._guild_create,
+            "GUILD_DELETE": self._guild_delete,
+            "GUILD_ROLE_CREATE": self._role_upsert,
+            "GUILD_ROLE_UPDATE": self._role_upsert,
+            "GUILD_ROLE_DELETE": self._role_delete,
+            "GUILD_MEMBER_ADD": self._member_upsert,
+            "GUILD_MEMBER_UPDATE": self._member_upsert,
+            "GUILD_MEMBER_REMOVE": self._member_remove,
+            "GUILD_MEMBERS_CHUNK": self._members_chunk,
+        }
+        parsers = bot._connection.parsers
+        for event, handler in handlers.items():
+            parsers[event] = self._chain(handler, parsers[event])
+
+    def _chain(self, handler, parser):
+        def parse(data):
+            try:
+                handler(data)
+                self.dirty = True
+            except (KeyError, ValueError, TypeError):
+                logger.exception("Could not apply a gateway event to the guild snapshot")
+            return parser(data)
+        return parse
+
+    # -------------------- PERSISTENCE --------------------
+    def load(self) -> bool:
+        """📌 Reads the snapshot file, if enabled and present. Returns True when a snapshot was loaded."""
+        if not self.enabled or not os.path.exists(self.path):
+            return False
+        started = time.perf_counter()
+        try:
+            with open(self.path, "rb") as f:
+                self.guilds = self.decode(f.read())
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable guild snapshot {self.path}: {e}")
+            self.guilds = {}
+            return False
+        self.loaded = True
+        members = sum(len(state.members) for state in self.guilds.values())
+        logger.info(f"Loaded guild snapshot: {len(self.guilds)} guilds, {members} members "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return True
+
+    async def save(self):
+        """📌 Writes the snapshot atomically; packing and file I/O run in a worker thread."""
+        if not self.enabled or not self.dirty:
+            return
+        # 📌 Copy the dict contents on the loop so gateway events can't change them mid-write.
+        guilds = [(guild_id, list(state.roles.items()), list(state.members.items()))
+                  for guild_id, state in self.guilds.items()]
+        self.dirty = False
+        try:
+            await asyncio.to_thread(self._write, guilds)
+        except OSError as e:
+            self.dirty = True
+            logger.warning(f"Could not write guild snapshot {self.path}: {e}")
+
+    def _write(self, guilds: list):
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(self.encode(guilds))
+        os.replace(temporary, self.path)
+
+    @staticmethod
+    def encode(guilds: list) -> bytes:
+        """📌 [(guild_id, [(role_id, (position, permissions))], [(user_id, MemberState)])] -> bytes."""
+        parts = [_HEADER.pack(MAGIC, time.time(), len(guilds))]
+        for guild_id, roles, members in guilds:
+            parts.append(_GUILD.pack(guild_id, len(roles), len(members)))
+            parts.extend(_ROLE.pack(role_id, position, permissions) for role_id, (position, permissions) in roles)
+            for user_id, member in members:
+                parts.append(_MEMBER.pack(user_id, member.joined_at, member.bot, len(member.role_ids)))
+                parts.append(struct.pack(f"<{len(member.role_ids)}Q", *member.role_ids))
+        return b"".join(parts)
+
+    @staticmethod
+    def decode(data: bytes) -> dict:
+        view = memoryview(data)
+        magic, _, guild_count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("not a guild snapshot (or an incompatible version)")
+        offset = _HEADER.size
+        guilds = {}
+        for _ in range(guild_count):
+            guild_id, role_count, member_count = _GUILD.unpack_from(view, offset)
+            offset += _GUILD.size
+            state = GuildState()
+            for role_id, position, permissions in _ROLE.iter_unpack(view[offset:offset + role_count * _ROLE.size]):
+                state.roles[role_id] = (position, permissions)
+            offset += role_count * _ROLE.size
+            for _ in range(member_count):
+                user_id, joined_at, bot, role_total = _MEMBER.unpack_from(view, offset)
+                offset += _MEMBER.size
+                role_ids = struct.unpack_from(f"<{role_total}Q", view, offset)
+                offset += role_total * 8
+                state.members[user_id] = MemberState(role_ids, joined_at, bool(bot))
+            guilds[guild_id] = state
+        return guilds
+
+    def start(self):
+        """📌 Starts the periodic writer (no-op when disabled)."""
+        if self.enabled and self._task is None:
+            self._task = supervisor.spawn(self._run(), "writer", owner="guild_snapshot", essential=True)
+
+    async def stop(self):
+        """📌 Stops the periodic writer and writes a final snapshot (called on shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.save()
+
+# 📌 Shared snapshot (loaded and installed in bot.py).
+snapshot = GuildSnapshot()
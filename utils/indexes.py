@@ -0,0 +1,40 @@
+# 📌 utils/indexes.py
+
+import logging
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.indexes")
+
+# 📌 collection name -> (collection, [IndexModel]) declared by the modules that query it.
+_registry = {}
+
+def register(collection, keys, **options):
+    """
+    📌 Declares an index the bot's queries rely on. Call at module level, next to the queries it serves.
+    📌 `keys` and `options` are those of create_index; the default index name is kept, so existing indexes match.
+    """
+    _, models = _registry.setdefault(collection.name, (collection, []))
+    models.append(IndexModel(keys, **options))
+
+async def ensure_all(*names: str) -> dict:
+    """
+    📌 Creates every declared index (only those of the named collections when given). Idempotent: MongoDB
+    📌 skips indexes that already exist. A collection whose indexes can't be created is logged and skipped.
+    📌 Returns collection name -> index names.
+    """
+    created = {}
+    for name, (collection, models) in _registry.items():
+        if names and name not in names:
+            continue
+        try:
+            created[name] = await collection.create_indexes(models)
+        except OperationFailure as e:
+            logger.error(f"Could not create indexes on {name}: {e}")
+    return created
+
+def declared() -> dict:
+    """📌 collection name -> declared index names (for the query profile report)."""
+    return {name: [model.document["name"] for model in models] for name, (_, models) in _registry.items()}
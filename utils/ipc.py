@@ -0,0 +1,145 @@
+# 📌 utils/ipc.py
+
+import asyncio
+import json
+import logging
+import time
+
+from utils.supervisor import supervisor
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.ipc")
+
+# 📌 How often each cluster reports its stats to the launcher.
+REPORT_INTERVAL = 5.0
+
+class ClusterIPCServer:
+    """
+    📌 Runs inside the cluster launcher (cluster.py).
+    📌 Each worker process connects over localhost TCP and reports its stats as JSON lines;
+    📌 the server merges them and broadcasts the combined view back to every worker.
+    """
+    def __init__(self):
+        self.clusters = {}
+        self._writers = set()
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """📌 Starts listening and returns the bound port (port 0 picks a free one)."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                if message.get("op") == "stats":
+                    self.clusters[str(message["cluster_id"])] = message
+                    await self._broadcast()
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.warning(f"IPC client disconnected: {e}")
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _broadcast(self):
+        payload = (json.dumps({"op": "clusters", "clusters": self.clusters}) + "\n").encode()
+        for writer in list(self._writers):
+            try:
+                writer.write(payload)
+                await writer.drain()
+            except ConnectionError:
+                self._writers.discard(writer)
+
+class ClusterIPCClient:
+    """
+    📌 Runs inside each bot worker. Periodically reports this cluster's guild count and
+    📌 per-shard latency, and keeps the latest merged view of every cluster in `clusters`.
+    """
+    def __init__(self, bot, cluster_id: int, port: int, host: str = "127.0.0.1"):
+        self.bot = bot
+        self.cluster_id = cluster_id
+        self.host = host
+        self.port = port
+        self.clusters = {}
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = supervisor.spawn(self._run(), "client", owner="ipc", essential=True)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def local_stats(self) -> dict:
+        """📌 This process's contribution to the cluster totals."""
+        return {
+            "op": "stats",
+            "cluster_id": self.cluster_id,
+            "guilds": len(self.bot.guilds),
+            "shards": {str(shard_id): latency for shard_id, latency in shard_latencies(self.bot)},
+            "updated": time.time(),
+        }
+
+    async def _run(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                # 📌 Essential: the report loop below watches it, so it must never be refused by the task cap.
+                listener = supervisor.spawn(self._listen(reader), "listen", owner="ipc", essential=True)
+                try:
+                    while not listener.done():
+                        writer.write((json.dumps(self.local_stats()) + "\n").encode())
+                        await writer.drain()
+                        await asyncio.sleep(REPORT_INTERVAL)
+                finally:
+                    listener.cancel()
+                    writer.close()
+            except (ConnectionError, OSError) as e:
+                logger.warning(f"IPC connection to launcher failed, retrying: {e}")
+            await asyncio.sleep(REPORT_INTERVAL)
+
+    async def _listen(self, reader: asyncio.StreamReader):
+        while line := await reader.readline():
+            message = json.loads(line)
+            if message.get("op") == "clusters":
+                self.clusters = message["clusters"]
+
+def shard_latencies(bot) -> list:
+    """📌 Returns [(shard_id, latency_seconds)] for both sharded and single-connection bots."""
+    if hasattr(bot, "latencies"):
+        return list(bot.latencies)
+    return [(bot.shard_id or 0, bot.latency)]
+
+def cluster_totals(bot) -> dict:
+    """
+    📌 Returns server count and per-shard latency across every cluster.
+    📌 Without a launcher (single process) this falls back to the local bot's numbers.
+    """
+    ipc = getattr(bot, "ipc", None)
+    clusters = dict(ipc.clusters) if ipc else {}
+    if ipc:
+        # 📌 Always use fresh local numbers for our own cluster.
+        clusters[str(ipc.cluster_id)] = ipc.local_stats()
+    else:
+        clusters["0"] = {"guilds": len(bot.guilds), "shards": {str(s): l for s, l in shard_latencies(bot)}}
+    shards = {}
+    for stats in clusters.values():
+        shards.update({int(shard_id): latency for shard_id, latency in stats["shards"].items()})
+    return {
+        "clusters": len(clusters),
+        "guilds": sum(stats["guilds"] for stats in clusters.values()),
+        "shards": dict(sorted(shards.items())),
+    }
@@ -0,0 +1,164 @@
+# 📌 utils/loop_watchdog.py
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from utils import metrics
+from utils.supervisor import supervisor
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.loop_watchdog")
+
+# 📌 Heartbeat period, and how late a heartbeat must be before the blocking stack is captured.
+LOOP_WATCHDOG_INTERVAL = float(os.getenv("LOOP_WATCHDOG_INTERVAL", "0.1"))
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", "0.25"))
+# 📌 Distinct (handler, call site) offenders kept; the one with the least total stall time is dropped first.
+MAX_OFFENDERS = 50
+# 📌 Frames kept from each captured stack (innermost last).
+STACK_DEPTH = 12
+# 📌 Lag histogram bucket upper bounds in seconds.
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 📌 Frames from files under this directory are the bot's own code (as opposed to libraries and the stdlib).
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Offender:
+    """📌 Stalls attributed to one handler and call site, with the stack of the worst one."""
+    __slots__ = ("count", "total", "worst", "stack")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.stack = ""
+
+def _call_site(stack: list) -> str:
+    """📌 The innermost frame in the bot's own code: the line that made the blocking call."""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_ROOT):
+            return f"{os.path.relpath(frame.filename, _ROOT)}:{frame.lineno} in {frame.name}"
+    frame = stack[-1]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno} in {frame.name}"
+
+class LoopWatchdog:
+    """
+    📌 Measures event-loop scheduling lag and finds what caused it.
+    📌 A heartbeat task sleeps for `interval` and records how late it wakes up in a histogram. A daemon thread
+    📌 watches the heartbeat; when it is `threshold` overdue the loop is blocked, so the thread captures the loop
+    📌 thread's current stack (sys._current_frames) and the interaction being handled. Once the heartbeat runs again,
+    📌 the stall is logged and counted against that handler and call site.
+    """
+    def __init__(self, interval: float = LOOP_WATCHDOG_INTERVAL, threshold: float = LOOP_LAG_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = metrics.Histogram(LAG_BUCKETS)
+        self.offenders = {}  # 📌 (handler, call site) -> Offender
+        self.stalls = 0
+        self.worst = 0.0
+        self._due = time.monotonic()  # 📌 When the heartbeat should next run
+        self._captured_due = None
+        self._capture = None  # 📌 (handler, call site, stack) captured during the current stall
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._loop = None
+        self._loop_thread = None
+        self._task = None
+        self._thread = None
+
+    def start(self):
+        """📌 Starts the heartbeat and the watcher thread. Must be called from the running loop."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stopping.clear()
+        self._due = time.monotonic() + self.interval
+        self._task = supervisor.spawn(self._heartbeat(), "heartbeat", owner="loop_watchdog", essential=True)
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        await asyncio.to_thread(self._thread.join, 1.0)
+        self._task = self._thread = None
+
+    async def _heartbeat(self):
+        while True:
+            self._due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._due)
+            self.lag.observe(lag)
+            with self._lock:
+                capture, self._capture = self._capture, None
+            if lag >= self.threshold:
+                self._record(lag, capture)
+
+    def _watch(self):
+        """📌 Watcher thread: polls the heartbeat twice per interval."""
+        while not self._stopping.wait(self.interval / 2):
+            due = self._due
+            if time.monotonic() - due < self.threshold or self._captured_due == due:
+                continue
+            self._captured_due = due  # 📌 One capture per stall: the call that is blocking right now
+            capture = self._capture_loop_stack()
+            if capture is not None:
+                with self._lock:
+                    self._capture = capture
+
+    def _capture_loop_stack(self) -> Optional[tuple]:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame)[-STACK_DEPTH:]
+        del frame
+        # 📌 The task the loop is running; None for plain callbacks.
+        task = asyncio.current_task(self._loop)
+        timing = metrics.running.get(task) if task is not None else None
+        if timing is not None:
+            handler = timing.name
+        elif task is not None:
+            handler = f"task:{getattr(task.get_coro(), '__qualname__', task.get_name())}"
+        else:
+            handler = "callback"
+        return handler, _call_site(stack), "".join(traceback.format_list(stack))
+
+    def _record(self, lag: float, capture: Optional[tuple]):
+        """📌 Runs on the loop once a stall is over."""
+        handler, site, stack = capture or ("unknown", "not captured", "")
+        self.stalls += 1
+        self.worst = max(self.worst, lag)
+        key = (handler, site)
+        offender = self.offenders.get(key)
+        if offender is None:
+            if len(self.offenders) >= MAX_OFFENDERS:
+                del self.offenders[min(self.offenders, key=lambda k: self.offenders[k].total)]
+            offender = self.offenders[key] = Offender()
+        offender.count += 1
+        offender.total += lag
+        if lag >= offender.worst:
+            offender.worst = lag
+            offender.stack = stack
+        logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms by {handler} at {site}\n{stack}".rstrip())
+
+    def top(self, count: int = 3) -> list:
+        """📌 [(handler, call site, Offender)] with the most total stall time first."""
+        ranked = sorted(self.offenders.items(), key=lambda item: -item[1].total)[:count]
+        return [(handler, site, offender) for (handler, site), offender in ranked]
+
+    def stats(self) -> dict:
+        return {"p50": self.lag.quantile(0.5), "p99": self.lag.quantile(0.99), "max": self.worst, "stalls": self.stalls}
+
+# 📌 Shared watchdog (started and stopped in bot.py, shown on /liveinfo).
+loop_watchdog = LoopWatchdog()
+metrics.register_gauge("bot_loop_lag_seconds", "Event loop scheduling lag (bucket-bound percentiles) and stalls",
+                       "stat", loop_watchdog.stats)
@@ -0,0 +1,90 @@
+# 📌 utils/member_cache.py
+
+import os
+from collections import OrderedDict
+from typing import Optional
+
+import discord
+from utils.guild_snapshot import MemberState, snapshot
+
+# 📌 "full" caches every member and presence (Intents.all()); "lean" disables presences and the
+# 📌 member cache, keeping only recently interacting members and fetching others on demand.
+INTENTS_PROFILE = os.getenv("INTENTS_PROFILE", "full").lower()
+LEAN_MODE = INTENTS_PROFILE == "lean"
+# 📌 Maximum number of interacting members remembered in lean mode.
+MEMBER_CACHE_SIZE = int(os.getenv("MEMBER_CACHE_SIZE", "5000"))
+
+def bot_options() -> dict:
+    """
+    📌 Returns the intents and cache keyword arguments for the selected profile.
+    📌 Lean mode keeps the members intent so join/update events still arrive, but nothing is chunked or cached.
+    """
+    intents = discord.Intents.all()
+    if not LEAN_MODE:
+        return {"intents": intents}
+    intents.presences = False
+    return {
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "chunk_guilds_at_startup": False,
+    }
+
+class RecentMemberCache:
+    """📌 Small LRU of members seen in interactions or fetched on demand, keyed by (guild_id, user_id)."""
+    def __init__(self, max_size: int = MEMBER_CACHE_SIZE):
+        self.max_size = max_size
+        self._members = OrderedDict()
+
+    def remember(self, member: discord.Member):
+        key = (member.guild.id, member.id)
+        self._members[key] = member
+        self._members.move_to_end(key)
+        if len(self._members) > self.max_size:
+            self._members.popitem(last=False)
+
+    def get(self, guild_id: int, user_id: int) -> Optional[discord.Member]:
+        member = self._members.get((guild_id, user_id))
+        if member is not None:
+            self._members.move_to_end((guild_id, user_id))
+        return member
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+# 📌 Shared LRU used by the helpers below.
+recent_members = RecentMemberCache()
+
+async def get_or_fetch_member(guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+    """
+    📌 Returns a guild member from the gateway cache, the recent-member LRU, or the REST API, in that order.
+    📌 Returns None if the user is not in the guild.
+    """
+    member = guild.get_member(user_id) or recent_members.get(guild.id, user_id)
+    if member is not None:
+        return member
+    try:
+        member = await guild.fetch_member(user_id)
+    except discord.NotFound:
+        return None
+    recent_members.remember(member)
+    snapshot.observe_member(member)
+    return member
+
+async def resolve_member(guild: discord.Guild, user) -> Optional[discord.Member]:
+    """📌 Ensures `user` is a full Member with roles (interaction payloads usually already are)."""
+    if isinstance(user, discord.Member):
+        return user
+    return await get_or_fetch_member(guild, user.id)
+
+async def member_details(guild: discord.Guild, user) -> Optional[MemberState]:
+    """
+    📌 Role IDs and join time of a guild member, from a Member object or the caches if possible,
+    📌 then the on-disk guild snapshot, and only then the REST API. Returns None if the user is not in the guild.
+    """
+    member = user if isinstance(user, discord.Member) else guild.get_member(user.id) or recent_members.get(guild.id, user.id)
+    if member is None:
+        state = snapshot.member(guild.id, user.id)
+        if state is not None:
+            return state
+        member = await get_or_fetch_member(guild, user.id)
+    return MemberState.from_member(member) if member else None
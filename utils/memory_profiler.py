@@ -0,0 +1,102 @@
+# 📌 utils/memory_profiler.py
+
+import asyncio
+import os
+import time
+import tracemalloc
+from collections import Counter
+from typing import NamedTuple, Optional
+
+# 📌 Frames recorded per allocation; more frames find the bot's own code under deeper library stacks but cost more.
+MEMPROFILE_FRAMES = int(os.getenv("MEMPROFILE_FRAMES", "15"))
+# 📌 Allocation sites listed per area.
+SITES_PER_AREA = 3
+
+# 📌 Frames from files under this directory are the bot's own code (as opposed to libraries and the stdlib).
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_LIBRARIES = "libraries"
+
+class Area(NamedTuple):
+    """📌 Growth attributed to one cog or module: bytes and blocks, and the sites that grew most."""
+    name: str
+    size_diff: int
+    count_diff: int
+    sites: list  # 📌 [(file:line, size_diff)]
+
+class Report(NamedTuple):
+    areas: list
+    current: int  # 📌 Bytes traced now
+    peak: int
+    interval: Optional[float]  # 📌 Seconds since the previous snapshot (None for the first)
+
+class MemoryProfiler:
+    """
+    📌 On-demand tracemalloc profiling for the /memprofile owner command.
+    📌 Each snapshot is diffed against the previous one, and every allocation is attributed to the innermost frame
+    📌 in the bot's own code: its cog when that file defines one, otherwise the module's path. Allocations made
+    📌 entirely inside libraries are grouped together. Tracing slows allocation down, so it only runs between
+    📌 start() and stop().
+    """
+    def __init__(self, frames: int = MEMPROFILE_FRAMES):
+        self.frames = frames
+        self._previous = None
+        self._previous_at = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._previous = self._previous_at = None
+
+    def stop(self):
+        tracemalloc.stop()
+        self._previous = self._previous_at = None
+
+    async def snapshot(self, owners: Optional[dict] = None) -> Report:
+        """
+        📌 Takes a snapshot and reports the growth since the previous one (since start() for the first).
+        📌 `owners` maps source files to cog names. The snapshot and diff run in a worker thread.
+        """
+        owners = {os.path.abspath(path): name for path, name in (owners or {}).items()}
+        previous, previous_at = self._previous, self._previous_at
+        snapshot, areas = await asyncio.to_thread(self._take, previous, owners)
+        self._previous, self._previous_at = snapshot, time.monotonic()
+        current, peak = tracemalloc.get_traced_memory()
+        return Report(areas, current, peak, self._previous_at - previous_at if previous_at else None)
+
+    def _take(self, previous, owners: dict) -> tuple:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        baseline = previous or tracemalloc.Snapshot((), snapshot.traceback_limit)
+        size, count, sites = Counter(), Counter(), {}
+        for stat in snapshot.compare_to(baseline, "traceback"):
+            if not stat.size_diff:
+                continue
+            name, site = self._attribute(stat.traceback, owners)
+            size[name] += stat.size_diff
+            count[name] += stat.count_diff
+            sites.setdefault(name, Counter())[site] += stat.size_diff
+        areas = [Area(name, size_diff, count[name], sites[name].most_common(SITES_PER_AREA))
+                 for name, size_diff in size.most_common()]
+        return snapshot, areas
+
+    @staticmethod
+    def _attribute(traceback: tracemalloc.Traceback, owners: dict) -> tuple:
+        """📌 (area, file:line) for the innermost frame in the bot's own code."""
+        for frame in reversed(traceback):  # 📌 Frames are stored oldest first
+            path = os.path.abspath(frame.filename)
+            if path.startswith(_ROOT):
+                relative = os.path.relpath(path, _ROOT)
+                return owners.get(path, relative), f"{relative}:{frame.lineno}"
+        frame = traceback[-1]
+        return _LIBRARIES, f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+# 📌 Shared profiler used by /memprofile.
+memory_profiler = MemoryProfiler()
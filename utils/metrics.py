@@ -0,0 +1,263 @@
+# 📌 utils/metrics.py
+
+import asyncio
+import bisect
+import contextvars
+import logging
+import os
+import time
+from typing import Callable, Optional
+
+import discord
+from aiohttp import web
+from discord import app_commands
+from discord.webhook.async_ import AsyncWebhookAdapter
+from pymongo import monitoring
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.metrics")
+
+# 📌 Port for the Prometheus-text endpoint (unset = endpoint disabled).
+METRICS_PORT = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+# 📌 Discord invalidates interactions that aren't acknowledged within 3 seconds.
+ACK_DEADLINE = 3.0
+# 📌 Histogram bucket upper bounds in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0, 10.0)
+
+class Histogram:
+    """📌 Fixed-bucket histogram in the Prometheus style (cumulative buckets, sum, count)."""
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """📌 Upper bound of the bucket containing the q-th quantile (inf if it's past the last bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            if running >= target:
+                return bound
+        return float("inf")
+
+    def cumulative(self) -> list:
+        """📌 [(le, cumulative count)] including +Inf."""
+        result, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+class CommandStats:
+    """📌 Per-command histograms and counters."""
+    def __init__(self):
+        self.duration = Histogram()
+        self.ack = Histogram()
+        self.mongo = Histogram()
+        self.rest = Histogram()
+        self.errors = 0
+        self.late_acks = 0
+
+class Timing:
+    """📌 Timing of one interaction; shared through a context variable with the Mongo and REST hooks."""
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.ack = None
+        self.mongo = 0.0
+        self.rest = 0.0
+        self.failed = False
+        self.finished = False
+
+current_timing: contextvars.ContextVar[Optional[Timing]] = contextvars.ContextVar("current_timing", default=None)
+
+# 📌 command name -> CommandStats
+stats = {}
+# 📌 task -> Timing of the interaction it is handling, so other threads (the loop watchdog) can attribute work.
+running = {}
+# 📌 metric name -> (description, label name, read() -> {label value: number}, kind) for values owned by other modules.
+gauges = {}
+
+def register_gauge(name: str, description: str, label: str, read: Callable[[], dict], kind: str = "gauge"):
+    """📌 Exports a labelled value read at scrape time (e.g. queue depths). `kind` is "gauge" or "counter"."""
+    gauges[name] = (description, label, read, kind)
+
+def start_timing(name: str) -> Timing:
+    """
+    📌 Starts timing the interaction handled by the current task.
+    📌 The measurement is recorded automatically when the task finishes.
+    """
+    timing = Timing(name)
+    current_timing.set(timing)
+    task = asyncio.current_task()
+    if task is not None:
+        running[task] = timing
+
+        def done(_):
+            running.pop(task, None)
+            finish_timing(timing)
+        task.add_done_callback(done)
+    return timing
+
+def finish_timing(timing: Timing):
+    if timing.finished:
+        return
+    timing.finished = True
+    duration = time.perf_counter() - timing.started
+    entry = stats.setdefault(timing.name, CommandStats())
+    entry.duration.observe(duration)
+    entry.mongo.observe(timing.mongo)
+    entry.rest.observe(timing.rest)
+    if timing.ack is not None:
+        entry.ack.observe(timing.ack)
+    if timing.failed:
+        entry.errors += 1
+    if (timing.ack if timing.ack is not None else duration) > ACK_DEADLINE:
+        entry.late_acks += 1
+
+def record_error():
+    """📌 Marks the interaction in the current task as failed."""
+    timing = current_timing.get()
+    if timing is not None:
+        timing.failed = True
+
+# -------------------- HOOKS --------------------
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """📌 Command tree that times every application command (pass as `tree_cls` to the bot)."""
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        start_timing((interaction.data or {}).get("name", "unknown"))
+        return await super().interaction_check(interaction)
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        record_error()
+        await super().on_error(interaction, error)
+
+class InstrumentedView(discord.ui.View):
+    """📌 Base view that times every component callback under `view:<ClassName>`."""
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        start_timing(f"view:{type(self).__name__}")
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item):
+        record_error()
+        await super().on_error(interaction, error, item)
+
+class MongoTimingListener(monitoring.CommandListener):
+    """📌 pymongo command listener that attributes database time to the current interaction."""
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._add(event.duration_micros)
+
+    def failed(self, event):
+        self._add(event.duration_micros)
+
+    @staticmethod
+    def _add(duration_micros: int):
+        timing = current_timing.get()
+        if timing is not None:
+            timing.mongo += duration_micros / 1_000_000
+
+def _timed_request(request):
+    """📌 Wraps an async REST request function so its duration counts as Discord REST time."""
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await request(*args, **kwargs)
+        finally:
+            timing = current_timing.get()
+            if timing is not None:
+                timing.rest += time.perf_counter() - started
+    return wrapper
+
+def _acknowledging(create_interaction_response):
+    """📌 Records time-to-ack when the interaction callback (the acknowledgement) completes."""
+    def wrapper(*args, **kwargs):
+        response = create_interaction_response(*args, **kwargs)
+
+        async def run():
+            result = await response
+            timing = current_timing.get()
+            if timing is not None and timing.ack is None:
+                timing.ack = time.perf_counter() - timing.started
+            return result
+        return run()
+    return wrapper
+
+def install(bot):
+    """📌 Hooks the bot's HTTP client and the interaction webhook adapter. Call once at startup."""
+    bot.http.request = _timed_request(bot.http.request)
+    AsyncWebhookAdapter.request = _timed_request(AsyncWebhookAdapter.request)
+    AsyncWebhookAdapter.create_interaction_response = _acknowledging(AsyncWebhookAdapter.create_interaction_response)
+
+# -------------------- EXPORT --------------------
+def _labels(value: str, label: str = "command") -> str:
+    return f'{label}="' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def render_prometheus() -> str:
+    """📌 Renders every metric in the Prometheus text exposition format."""
+    lines = []
+    histograms = (
+        ("bot_command_duration_seconds", "duration", "Total handler time per command"),
+        ("bot_command_ack_seconds", "ack", "Time until the interaction was acknowledged"),
+        ("bot_command_mongo_seconds", "mongo", "MongoDB time per invocation"),
+        ("bot_command_rest_seconds", "rest", "Discord REST time per invocation"),
+    )
+    for metric, attribute, description in histograms:
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} histogram"]
+        for command, entry in sorted(stats.items()):
+            histogram = getattr(entry, attribute)
+            labels = _labels(command)
+            for bound, count in histogram.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+    counters = (
+        ("bot_command_errors_total", "errors", "Invocations that raised an error"),
+        ("bot_command_late_acks_total", "late_acks", f"Invocations acknowledged after {ACK_DEADLINE:g}s or never"),
+    )
+    for metric, attribute, description in counters:
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} counter"]
+        for command, entry in sorted(stats.items()):
+            lines.append(f"{metric}{{{_labels(command)}}} {getattr(entry, attribute)}")
+    for metric, (description, label, read, kind) in sorted(gauges.items()):
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}"]
+        for value, number in sorted(read().items()):
+            lines.append(f"{metric}{{{_labels(str(value), label)}}} {number}")
+    return "\n".join(lines) + "\n"
+
+def summary_rows() -> list:
+    """📌 (command, count, p50, p99, ack p99, mongo p99, rest p99, errors, late acks) for the /metrics command."""
+    return [
+        (command, entry.duration.count, entry.duration.quantile(0.5), entry.duration.quantile(0.99),
+         entry.ack.quantile(0.99), entry.mongo.quantile(0.99), entry.rest.quantile(0.99), entry.errors, entry.late_acks)
+        for command, entry in sorted(stats.items(), key=lambda item: -item[1].duration.count)
+    ]
+
+async def start_http_server(host: str = METRICS_HOST, port: Optional[int] = METRICS_PORT) -> Optional[web.AppRunner]:
+    """📌 Serves GET /metrics on a local port. Returns the runner (for cleanup) or None when disabled."""
+    if port is None:
+        return None
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(text=render_prometheus(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,172 @@
+# 📌 utils/modlog.py
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+import discord
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import CollectionInvalid, OperationFailure, PyMongoError
+from utils import database, indexes
+from utils.database import mod_events_collection
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.modlog")
+
+# 📌 Events per /modlog page, and documents fetched per cursor batch while exporting.
+PAGE_SIZE = 10
+# 📌 Characters of a reason shown on a /modlog page (exports keep the full text).
+REASON_PREVIEW_LENGTH = 200
+EXPORT_BATCH_SIZE = 500
+# 📌 Columns of the CSV export (NDJSON rows carry the same fields).
+EXPORT_FIELDS = ("at", "action", "actor_id", "target_id", "reason", "duration_seconds", "role_id")
+
+# 📌 Event kinds written by the moderation commands, the scheduler handlers and the auto-timeout.
+ACTIONS = ("timeout", "timeout_expired", "timeout_removed", "ban", "unban", "temprole", "temprole_expired", "auto_timeout")
+
+# 📌 Guild/time, guild/actor/time and guild/target/time indexes for /modlog pages and filters. `_id` is the
+# 📌 page tie-breaker, so each page is one bounded index scan already in (at, _id) order, with no in-memory sort.
+indexes.register(mod_events_collection, [("meta.guild_id", ASCENDING), ("at", DESCENDING), ("_id", DESCENDING)])
+indexes.register(mod_events_collection, [("meta.guild_id", ASCENDING), ("actor_id", ASCENDING), ("at", DESCENDING), ("_id", DESCENDING)])
+indexes.register(mod_events_collection, [("meta.guild_id", ASCENDING), ("target_id", ASCENDING), ("at", DESCENDING), ("_id", DESCENDING)])
+
+async def ensure_collection():
+    """
+    📌 Creates the event log as a time-series collection (MongoDB 5.0+), bucketed per guild by the metaField.
+    📌 Call before indexes.ensure_all(). Idempotent; falls back to a plain collection on older servers.
+    """
+    try:
+        await database.db.create_collection(
+            mod_events_collection.name,
+            timeseries={"timeField": "at", "metaField": "meta", "granularity": "minutes"},
+        )
+    except CollectionInvalid:
+        pass  # 📌 Already exists
+    except OperationFailure as e:
+        logger.warning(f"Time-series collections unavailable, using a plain collection for the mod log: {e}")
+
+def event(guild_id: int, action: str, target_id: int, actor_id: Optional[int] = None, reason: Optional[str] = None,
+          duration: Optional[timedelta] = None, role_id: Optional[int] = None) -> dict:
+    """📌 Builds one event document. `actor_id` None means the bot acted on its own (expiries, auto-timeout)."""
+    now = discord.utils.utcnow()
+    # 📌 BSON dates have millisecond precision; truncating here keeps page cursors exact.
+    doc = {"at": now.replace(microsecond=now.microsecond // 1000 * 1000), "meta": {"guild_id": guild_id},
+           "action": action, "actor_id": actor_id, "target_id": target_id}
+    if reason is not None:
+        doc["reason"] = reason
+    if duration is not None:
+        doc["duration_seconds"] = int(duration.total_seconds())
+    if role_id is not None:
+        doc["role_id"] = role_id
+    return doc
+
+async def record(guild_id: int, action: str, target_id: int, **details):
+    """📌 Appends one event. The action already happened, so a failed write is logged rather than raised."""
+    try:
+        await mod_events_collection.insert_one(event(guild_id, action, target_id, **details))
+    except PyMongoError:
+        logger.exception(f"Could not log {action} for {target_id} in guild {guild_id}")
+
+async def record_many(events: list):
+    """📌 Appends many events with one insert_many (bulk commands)."""
+    if not events:
+        return
+    try:
+        await mod_events_collection.insert_many(events, ordered=False)
+    except PyMongoError:
+        logger.exception(f"Could not log {len(events)} bulk moderation events")
+
+# -------------------- READING --------------------
+def _query(guild_id: int, action: Optional[str] = None, actor_id: Optional[int] = None,
+           target_id: Optional[int] = None) -> dict:
+    query = {"meta.guild_id": guild_id}
+    if action:
+        query["action"] = action
+    if actor_id is not None:
+        query["actor_id"] = actor_id
+    if target_id is not None:
+        query["target_id"] = target_id
+    return query
+
+def _aware(at: datetime) -> datetime:
+    # 📌 MongoDB returns naive datetimes (UTC) unless the client is tz_aware.
+    return at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at
+
+def encode_cursor(doc: dict) -> str:
+    """📌 Opaque page cursor: the (time, _id) of the last event shown."""
+    return f"{round(_aware(doc['at']).timestamp() * 1000)}.{doc['_id']}"
+
+def _decode_cursor(cursor: str):
+    millis, object_id = cursor.split(".", 1)
+    return datetime.fromtimestamp(int(millis) / 1000, timezone.utc), ObjectId(object_id)
+
+async def page(guild_id: int, cursor: Optional[str] = None, size: int = PAGE_SIZE, **filters):
+    """
+    📌 Keyset pagination, newest first: returns (events, next cursor or None).
+    📌 Each page is one index range scan (at <= the cursor's time) in index order; only events sharing the cursor's
+    📌 millisecond are filtered by `_id`, so deep pages cost the same as the first.
+    """
+    query = _query(guild_id, **filters)
+    if cursor:
+        at, object_id = _decode_cursor(cursor)
+        query["at"] = {"$lte": at}
+        query["$nor"] = [{"at": at, "_id": {"$gte": object_id}}]
+    docs = await mod_events_collection.find(query).sort([("at", DESCENDING), ("_id", DESCENDING)]).limit(size + 1).to_list(size + 1)
+    if len(docs) > size:
+        return docs[:size], encode_cursor(docs[size - 1])
+    return docs, None
+
+async def iter_events(guild_id: int, **filters) -> AsyncIterator[dict]:
+    """📌 Every matching event, oldest first, fetched EXPORT_BATCH_SIZE documents at a time."""
+    cursor = mod_events_collection.find(_query(guild_id, **filters), {"meta": 0}, batch_size=EXPORT_BATCH_SIZE)
+    async for doc in cursor.sort([("at", ASCENDING), ("_id", ASCENDING)]):
+        yield doc
+
+def _row(doc: dict) -> dict:
+    row = {field: doc.get(field) for field in EXPORT_FIELDS}
+    row["at"] = _aware(doc["at"]).isoformat()
+    return row
+
+async def export(guild_id: int, fmt: str, fp, max_bytes: int, **filters) -> tuple:
+    """
+    📌 Streams matching events into the binary file `fp` as NDJSON or CSV, one cursor batch at a time,
+    📌 stopping before `max_bytes`. Returns (rows written, truncated).
+    """
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=EXPORT_FIELDS) if fmt == "csv" else None
+    if writer:
+        writer.writeheader()
+    written = rows = 0
+    async for doc in iter_events(guild_id, **filters):
+        if writer:
+            writer.writerow(_row(doc))
+        else:
+            text.write(json.dumps(_row(doc)) + "\n")
+        line = text.getvalue().encode()
+        text.seek(0)
+        text.truncate()
+        if written + len(line) > max_bytes:
+            return rows, True
+        fp.write(line)
+        written += len(line)
+        rows += 1
+    return rows, False
+
+def describe(doc: dict) -> str:
+    """📌 One /modlog line for an event."""
+    actor = f"<@{doc['actor_id']}>" if doc.get("actor_id") else "🤖 automatic"
+    line = f"<t:{int(_aware(doc['at']).timestamp())}:f> **{doc['action']}** <@{doc['target_id']}> by {actor}"
+    if doc.get("role_id"):
+        line += f" (<@&{doc['role_id']}>)"
+    if doc.get("duration_seconds"):
+        line += f" for `{timedelta(seconds=doc['duration_seconds'])}`"
+    if doc.get("reason"):
+        reason = doc["reason"]
+        if len(reason) > REASON_PREVIEW_LENGTH:
+            reason = reason[:REASON_PREVIEW_LENGTH - 1] + "…"
+        line += f" — {reason}"
+    return line
@@ -0,0 +1,128 @@
+# 📌 utils/permission_cache.py
+
+import heapq
+import os
+from collections import OrderedDict
+from enum import Enum
+
+import discord
+from utils import metrics
+
+# 📌 Maximum number of (guild, member) decisions kept; the least recently used is dropped first.
+PERMISSION_CACHE_SIZE = int(os.getenv("PERMISSION_CACHE_SIZE", "50000"))
+# 📌 /setting is restricted to members holding one of this many highest roles.
+TOP_ROLE_COUNT = 2
+
+class Decision(Enum):
+    """📌 Outcome of the role-based moderation access check (warnings for blacklisted members are handled separately)."""
+    ALLOWED = "allowed"
+    DENIED = "denied"  # 📌 An allowlist exists and the member has none of its roles
+    BLACKLISTED = "blacklisted"  # 📌 Warned, then auto-timed out
+
+def _decide(member: discord.Member, access) -> Decision:
+    if member.guild_permissions.administrator:
+        return Decision.ALLOWED
+    role_ids = [role.id for role in member.roles if role != member.guild.default_role]
+    if access.allowlist:
+        return Decision.ALLOWED if any(role_id in access.allowlist for role_id in role_ids) else Decision.DENIED
+    if access.blacklist and any(role_id in access.blacklist for role_id in role_ids):
+        return Decision.BLACKLISTED
+    return Decision.ALLOWED
+
+class _Decision:
+    __slots__ = ("decision", "access", "generation", "roles")
+
+    def __init__(self, decision: Decision, access, generation: int, roles: tuple):
+        self.decision = decision
+        self.access = access
+        self.generation = generation
+        self.roles = roles
+
+class PermissionCache:
+    """
+    📌 Moderation access decisions per (guild, member), so repeated checks skip the role and list scans.
+    📌 A decision is reused only while all of these still hold:
+    📌 - the guild's settings object is the same one (settings_cache keeps it unless the settings change);
+    📌 - the guild's generation is unchanged (bumped by role and guild updates, which can change permissions);
+    📌 - the member's role IDs are unchanged. This catches role edits even when on_member_update doesn't fire
+    📌   (discord.py only dispatches it for cached members, so not in lean mode).
+    📌 The top-two-role index used by /setting is kept here too and dropped on the same role events.
+    """
+    def __init__(self, max_size: int = PERMISSION_CACHE_SIZE):
+        self.max_size = max_size
+        self._decisions = OrderedDict()  # 📌 (guild_id, member_id) -> _Decision, least recently used first
+        self._generations = {}  # 📌 guild_id -> generation
+        self._top_roles = {}  # 📌 guild_id -> IDs of the TOP_ROLE_COUNT highest roles
+        self.hits = 0
+        self.misses = 0
+
+    def decide(self, member: discord.Member, access) -> Decision:
+        """📌 Returns the cached decision for `member` under `access`, computing it on a miss."""
+        key = (member.guild.id, member.id)
+        generation = self._generations.get(member.guild.id, 0)
+        # 📌 Role IDs from the public Member.roles, so any member-like object works (a handful of IDs to compare).
+        roles = tuple(role.id for role in member.roles)
+        entry = self._decisions.get(key)
+        if entry is not None and entry.access is access and entry.generation == generation and entry.roles == roles:
+            self.hits += 1
+            self._decisions.move_to_end(key)
+            return entry.decision
+        self.misses += 1
+        decision = _decide(member, access)
+        self._decisions[key] = _Decision(decision, access, generation, roles)
+        self._decisions.move_to_end(key)
+        if len(self._decisions) > self.max_size:
+            self._decisions.popitem(last=False)
+        return decision
+
+    def top_roles(self, guild: discord.Guild) -> tuple:
+        """📌 IDs of the guild's highest roles, computed once per role change instead of sorting on every call."""
+        top = self._top_roles.get(guild.id)
+        if top is None:
+            top = tuple(role.id for role in heapq.nlargest(TOP_ROLE_COUNT, guild.roles, key=lambda role: role.position))
+            self._top_roles[guild.id] = top
+        return top
+
+    # -------------------- INVALIDATION --------------------
+    def invalidate_member(self, guild_id: int, member_id: int):
+        self._decisions.pop((guild_id, member_id), None)
+
+    def invalidate_guild(self, guild_id: int):
+        """📌 O(1): stale decisions are skipped by generation and age out of the LRU."""
+        self._generations[guild_id] = self._generations.get(guild_id, 0) + 1
+        self._top_roles.pop(guild_id, None)
+
+    def install(self, bot):
+        """📌 Registers the event listeners that invalidate decisions. Call once at startup."""
+        async def on_member_update(before: discord.Member, after: discord.Member):
+            self.invalidate_member(after.guild.id, after.id)
+
+        async def on_raw_member_remove(payload: discord.RawMemberRemoveEvent):
+            self.invalidate_member(payload.guild_id, payload.user.id)
+
+        async def on_role_change(role: discord.Role, after: discord.Role = None):
+            self.invalidate_guild(role.guild.id)
+
+        async def on_guild_update(before: discord.Guild, after: discord.Guild):
+            # 📌 A new owner gains every permission.
+            self.invalidate_guild(after.id)
+
+        async def on_guild_remove(guild: discord.Guild):
+            # 📌 The generation is kept, so decisions from before a rejoin can never match again.
+            self.invalidate_guild(guild.id)
+
+        bot.add_listener(on_member_update)
+        bot.add_listener(on_raw_member_remove)
+        for event in ("on_guild_role_create", "on_guild_role_update", "on_guild_role_delete"):
+            bot.add_listener(on_role_change, event)
+        bot.add_listener(on_guild_update)
+        bot.add_listener(on_guild_remove)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hits / total if total else 0.0,
+                "entries": len(self._decisions)}
+
+# 📌 Shared cache used by check_moderation_access and /setting (listeners installed in bot.py).
+permission_cache = PermissionCache()
+metrics.register_gauge("bot_permission_cache", "Moderation access decision cache counters and size", "stat", permission_cache.stats)
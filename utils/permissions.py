@@ -1,7 +1,12 @@
 # 📌 utils/permissions.py
 
 import discord
-from utils.database import settings_collection, users_collection
+from utils.warning_counter import WARNING_LIMIT, warning_counter
+from utils.settings_cache import command_access_cache
+from utils.permission_cache import Decision, permission_cache
+from utils.member_cache import resolve_member
+from utils.dispatcher import Priority, dispatcher, guild_bucket
+from utils import modlog
 
 async def check_moderation_access(interaction: discord.Interaction, user: discord.Member) -> bool:
     """
@@ -10,35 +15,38 @@ async def check_moderation_access(interaction: discord.Interaction, user: discor
     📌 If an allowlist exists, the user must have a role from that list.
     📌 If a blacklist exists, the user is blocked and may receive warnings and auto-timeout.
     """
-    if user.guild_permissions.administrator:
+    # 📌 With the lean member cache the user may only be partially known; make sure we have their roles.
+    user = await resolve_member(interaction.guild, user)
+    if user is None:
+        await interaction.response.send_message("❌ You must be a member of this server to use moderation commands.", ephemeral=True)
+        return False
+    access = await command_access_cache.get(user.guild.id)
+    # 📌 Cached per member; recomputed only when their roles, the guild's roles or the settings change.
+    decision = permission_cache.decide(user, access)
+    if decision is Decision.ALLOWED:
         return True
-    data = settings_collection.find_one({"_id": "command_access"}) or {}
-    allowlist = data.get("allowlist", [])
-    blacklist = data.get("blacklist", [])
-    user_roles = [role for role in user.roles if role != user.guild.default_role]
-    if allowlist:
-        if any(role.id in allowlist for role in user_roles):
-            return True
-        else:
-            await interaction.response.send_message("❌ You do not have permission to use this moderation command.", ephemeral=True)
+    if decision is Decision.DENIED:
+        await interaction.response.send_message("❌ You do not have permission to use this moderation command.", ephemeral=True)
+        return False
+    # 📌 Blacklisted: warn, then auto-timeout on every WARNING_LIMIT-th counted attempt.
+    strike = await warning_counter.warn(user.guild.id, user.id)
+    if strike is None:
+        # 📌 Repeat within the spam window: answered without counting it or touching the database.
+        await interaction.response.send_message("⚠️ You are blacklisted from using moderation commands.", ephemeral=True)
+    elif not strike.timeout:
+        await interaction.response.send_message(f"⚠️ Warning {strike.number}/{WARNING_LIMIT}: You are blacklisted from using moderation commands.", ephemeral=True)
+    else:
+        from datetime import datetime, timedelta
+        from zoneinfo import ZoneInfo
+        timeout_duration = 259200  # 📌 3 days in seconds
+        until = datetime.now(tz=ZoneInfo("UTC")) + timedelta(seconds=timeout_duration)
+        try:
+            await dispatcher.submit(Priority.ENFORCEMENT, guild_bucket(user.guild),
+                                    lambda: user.timeout(until, reason="Auto-timeout for blacklisted user"))
+        except Exception as e:
+            await interaction.response.send_message(f"❌ Failed to timeout: {e}", ephemeral=True)
             return False
-    if blacklist:
-        if any(role.id in blacklist for role in user_roles):
-            user_data = users_collection.find_one({"_id": user.id}) or {}
-            warnings = user_data.get("warnings", 0) + 1
-            users_collection.update_one({"_id": user.id}, {"$set": {"warnings": warnings}}, upsert=True)
-            if warnings < 3:
-                await interaction.response.send_message(f"⚠️ Warning {warnings}/3: You are blacklisted from using moderation commands.", ephemeral=True)
-            else:
-                from datetime import datetime, timedelta
-                from zoneinfo import ZoneInfo
-                timeout_duration = 259200  # 📌 3 days in seconds
-                until = datetime.now(tz=ZoneInfo("UTC")) + timedelta(seconds=timeout_duration)
-                try:
-                    await user.timeout(until, reason="Auto-timeout for blacklisted user")
-                except Exception as e:
-                    await interaction.response.send_message(f"❌ Failed to timeout: {e}", ephemeral=True)
-                users_collection.update_one({"_id": user.id}, {"$set": {"warnings": 0}}, upsert=True)
-                await interaction.response.send_message("🚫 You have been automatically timed out for 3 days due to repeated violations.", ephemeral=True)
-            return False
-    return True
+        await modlog.record(user.guild.id, "auto_timeout", user.id, reason="Auto-timeout for blacklisted user",
+                            duration=timedelta(seconds=timeout_duration))
+        await interaction.response.send_message("🚫 You have been automatically timed out for 3 days due to repeated violations.", ephemeral=True)
+    return False
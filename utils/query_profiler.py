@@ -0,0 +1,245 @@
+# 📌 utils/query_profiler.py
+
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter
+from typing import Optional
+
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
+from utils import metrics
+from utils.supervisor import supervisor
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.query_profiler")
+
+# 📌 Record every query's shape and duration. Off by default: set QUERY_PROFILER=1 while investigating.
+QUERY_PROFILER = os.getenv("QUERY_PROFILER", "0") == "1"
+# 📌 Queries at least this slow are counted as slow and explained (at most once per shape per interval).
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_SECONDS", "0.1"))
+# 📌 Fraction of the other queries explained, so fast but unindexed queries are found too.
+QUERY_EXPLAIN_SAMPLE = float(os.getenv("QUERY_EXPLAIN_SAMPLE", "0.01"))
+QUERY_EXPLAIN_INTERVAL = float(os.getenv("QUERY_EXPLAIN_INTERVAL", "600"))
+# 📌 Distinct query shapes tracked; queries with new shapes beyond it are only counted.
+MAX_QUERY_SHAPES = int(os.getenv("MAX_QUERY_SHAPES", "500"))
+# 📌 An indexed query examining this many documents per document returned (and at least MIN_SCANNED) is flagged.
+SCAN_RATIO = 20
+MIN_SCANNED = 100
+
+# 📌 Profiled commands and the field holding their filter.
+_FILTER_FIELDS = {"find": "filter", "count": "query", "distinct": "query", "findAndModify": "query",
+                  "aggregate": "pipeline", "update": "updates", "delete": "deletes"}
+# 📌 Fields copied into the explain of a read (session and cluster fields are left out).
+_EXPLAIN_FIELDS = {
+    "find": ("find", "filter", "sort", "projection", "limit", "skip", "hint", "collation"),
+    "aggregate": ("aggregate", "pipeline", "cursor", "hint", "collation"),
+    "count": ("count", "query", "limit", "skip", "hint", "collation"),
+    "distinct": ("distinct", "key", "query", "collation"),
+}
+
+def _filter(command_name: str, command: dict) -> dict:
+    """📌 The query filter of a command: the first $match of a pipeline, the first statement of a write."""
+    value = command.get(_FILTER_FIELDS[command_name])
+    if command_name == "aggregate":
+        return (value or [{}])[0].get("$match", {})
+    if command_name in ("update", "delete"):
+        return (value or [{}])[0].get("q", {})
+    return value or {}
+
+def _shape(value):
+    """📌 The query with every value replaced by "?" (field names, operators and clause structure are kept)."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        return [_shape(item) for item in value]  # 📌 $or / $and clauses
+    return "?"
+
+def query_shape(command_name: str, command: dict) -> str:
+    shape = json.dumps(_shape(_filter(command_name, command)), separators=(",", ":"))
+    if command.get("sort"):
+        shape += " sort " + json.dumps(dict(command["sort"]), separators=(",", ":"))  # 📌 Directions matter to indexes
+    return shape
+
+def _explain_command(command_name: str, command: dict) -> dict:
+    """📌 The command to explain: reads as issued, writes as a find on their filter (explain never applies writes)."""
+    if command_name in _EXPLAIN_FIELDS:
+        return {field: command[field] for field in _EXPLAIN_FIELDS[command_name] if field in command}
+    return {"find": command[command_name], "filter": _filter(command_name, command), "limit": 1}
+
+def _origin() -> str:
+    """📌 What issued the current query: the interaction's command, else the task (IDs stripped so names repeat)."""
+    timing = metrics.current_timing.get()
+    if timing is not None:
+        return timing.name
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is None or task.get_name().startswith("Task-"):
+        return "background"
+    return re.sub(r":\d+", "", task.get_name())
+
+def _find(doc, key: str):
+    """📌 First value stored under `key` anywhere in an explain result."""
+    if isinstance(doc, dict):
+        if key in doc:
+            return doc[key]
+        doc = list(doc.values())
+    if isinstance(doc, list):
+        for item in doc:
+            found = _find(item, key)
+            if found is not None:
+                return found
+    return None
+
+def _stages(plan):
+    """📌 (stage, index name) for every stage of a winning plan."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"], plan.get("indexName")
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+class QueryStats:
+    """📌 Everything recorded for one query shape: timings, the commands that issued it and the last explained plan."""
+    __slots__ = ("collection", "operation", "shape", "origins", "count", "total", "max", "slow",
+                 "explained_at", "plan", "collscan", "docs_examined", "keys_examined", "returned")
+
+    def __init__(self, collection: str, operation: str, shape: str):
+        self.collection = collection
+        self.operation = operation
+        self.shape = shape
+        self.origins = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.explained_at = None
+        self.plan = None
+        self.collscan = False
+        self.docs_examined = self.keys_examined = self.returned = None
+
+    def observe(self, seconds: float, origin: str):
+        self.origins[origin] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if seconds >= SLOW_QUERY_SECONDS:
+            self.slow += 1
+
+    def record_plan(self, result: dict):
+        execution = _find(result, "executionStats") or {}
+        stages = list(_stages(_find(result, "winningPlan") or {}))
+        self.collscan = any(stage == "COLLSCAN" for stage, _ in stages)
+        used = list(dict.fromkeys(index for _, index in stages if index))
+        self.plan = "COLLSCAN" if self.collscan else ("IXSCAN " + ", ".join(used) if used else
+                                                      (stages[0][0] if stages else "unknown"))
+        self.docs_examined = execution.get("totalDocsExamined")
+        self.keys_examined = execution.get("totalKeysExamined")
+        self.returned = execution.get("nReturned")
+
+    @property
+    def flags(self) -> list:
+        """📌 "slow", "unindexed" (collection scan) or "scan" (an index that still examines many documents)."""
+        flags = ["slow"] if self.slow else []
+        if self.collscan:
+            flags.append("unindexed")
+        elif self.docs_examined is not None and self.docs_examined >= MIN_SCANNED and \
+                self.docs_examined >= SCAN_RATIO * max(self.returned or 0, 1):
+            flags.append("scan")
+        return flags
+
+class QueryProfiler(monitoring.CommandListener):
+    """
+    📌 pymongo command listener that profiles the bot's queries by shape (the filter with its values removed).
+    📌 Each shape records its count, durations and the commands or background tasks that issued it. Slow queries
+    📌 and a small sample of the rest are explained in the background (executionStats), which shows collection
+    📌 scans and documents examined per document returned. The report lists flagged shapes first.
+    """
+    def __init__(self, max_shapes: int = MAX_QUERY_SHAPES):
+        self.max_shapes = max_shapes
+        self.client = None
+        self._pending = {}  # 📌 request_id -> (shape key, origin, command name, command)
+        self._shapes = {}  # 📌 (collection, operation, shape) -> QueryStats
+        self.untracked = 0
+        self.explains = 0
+
+    def attach(self, client):
+        """📌 The client explains are sent through (the one this listener is registered on)."""
+        self.client = client
+
+    def started(self, event):
+        if event.command_name not in _FILTER_FIELDS:
+            return
+        command = event.command
+        key = (f"{event.database_name}.{command.get(event.command_name)}", event.command_name,
+               query_shape(event.command_name, command))
+        self._pending[event.request_id] = (key, _origin(), command)
+
+    def succeeded(self, event):
+        self._finished(event)
+
+    def failed(self, event):
+        self._finished(event)
+
+    def _finished(self, event):
+        pending = self._pending.pop(event.request_id, None)
+        if pending is None:
+            return
+        key, origin, command = pending
+        stats = self._shapes.get(key)
+        if stats is None:
+            if len(self._shapes) >= self.max_shapes:
+                self.untracked += 1
+                return
+            stats = self._shapes[key] = QueryStats(*key)
+        seconds = event.duration_micros / 1_000_000
+        stats.observe(seconds, origin)
+
+        now = time.monotonic()
+        if self.client is None or (stats.explained_at is not None and now - stats.explained_at < QUERY_EXPLAIN_INTERVAL):
+            return
+        if seconds >= SLOW_QUERY_SECONDS or random.random() < QUERY_EXPLAIN_SAMPLE:
+            stats.explained_at = now
+            database_name = key[0].split(".", 1)[0]
+            supervisor.spawn(self._explain(stats, database_name, _explain_command(event.command_name, command)),
+                             "explain", owner="query_profiler")
+
+    async def _explain(self, stats: QueryStats, database_name: str, command: dict):
+        try:
+            result = await self.client[database_name].command({"explain": command, "verbosity": "executionStats"})
+        except PyMongoError as e:
+            logger.debug(f"Explain failed for {stats.collection} {stats.shape}: {e}")
+            return
+        self.explains += 1
+        unindexed = stats.collscan
+        stats.record_plan(result)
+        if stats.collscan and not unindexed:
+            logger.warning(f"Unindexed query on {stats.collection}: {stats.operation} {stats.shape} "
+                           f"(from {', '.join(origin for origin, _ in stats.origins.most_common(3))})")
+
+    def report(self, limit: int = 10) -> list:
+        """📌 The shapes to look at: flagged ones first, then by total time."""
+        return sorted(self._shapes.values(), key=lambda stats: (not stats.flags, -stats.total))[:limit]
+
+    def reset(self):
+        self._shapes.clear()
+        self.untracked = 0
+
+    def stats(self) -> dict:
+        return {"shapes": len(self._shapes), "flagged": sum(1 for stats in self._shapes.values() if stats.flags),
+                "explains": self.explains, "untracked": self.untracked}
+
+# 📌 Shared profiler registered on the MongoDB client (utils/database.py) and reported by /queryprofile.
+query_profiler = QueryProfiler()
+metrics.register_gauge("bot_query_profiler", "Query shapes tracked, flagged, explained and untracked queries",
+                       "stat", query_profiler.stats)
@@ -0,0 +1,208 @@
+# 📌 utils/raid_detector.py
+
+import math
+import os
+import unicodedata
+from array import array
+from collections import OrderedDict, deque
+from typing import NamedTuple, Optional
+
+from utils import metrics
+
+# 📌 Sliding window the join statistics cover, split into buckets of RAID_BUCKET_SECONDS.
+RAID_WINDOW_SECONDS = int(os.getenv("RAID_WINDOW_SECONDS", "10"))
+RAID_BUCKET_SECONDS = 1
+# 📌 A wave needs at least this many joins in the window above the guild's usual rate, and then either mostly
+# 📌 young accounts among the extra joins, or enough of them sharing a name skeleton.
+RAID_JOIN_THRESHOLD = int(os.getenv("RAID_JOIN_THRESHOLD", "10"))
+RAID_YOUNG_ACCOUNT_DAYS = float(os.getenv("RAID_YOUNG_ACCOUNT_DAYS", "7"))
+RAID_YOUNG_RATIO = float(os.getenv("RAID_YOUNG_RATIO", "0.6"))
+RAID_SIMILAR_NAMES = int(os.getenv("RAID_SIMILAR_NAMES", "6"))
+RAID_SIMILAR_RATIO = float(os.getenv("RAID_SIMILAR_RATIO", "0.3"))
+# 📌 The usual join rate is a moving average over roughly this many seconds; joins within RAID_NOISE_SIGMAS
+# 📌 standard deviations of it are treated as normal traffic, so busy guilds don't trip the thresholds.
+RAID_BASELINE_SECONDS = float(os.getenv("RAID_BASELINE_SECONDS", "300"))
+RAID_NOISE_SIGMAS = 3.0
+# 📌 A wave ends once joins are back to normal and no suspicious member has joined for this long.
+RAID_COOLDOWN_SECONDS = float(os.getenv("RAID_COOLDOWN_SECONDS", "60"))
+# 📌 Recent joiners remembered per guild, so the members who triggered a wave can be acted on too.
+RAID_RECENT_JOINS = int(os.getenv("RAID_RECENT_JOINS", "256"))
+# 📌 Guilds with join activity tracked at once; idle guilds are dropped first.
+RAID_MAX_GUILDS = int(os.getenv("RAID_MAX_GUILDS", "20000"))
+# 📌 Similar names are counted in this many hash buckets per window bucket (fixed memory per guild).
+NAME_BUCKETS = 32
+# 📌 Characters of the name skeleton compared.
+SKELETON_LENGTH = 6
+
+_SLOTS = max(1, RAID_WINDOW_SECONDS // RAID_BUCKET_SECONDS)
+_ALPHA = min(1.0, RAID_BUCKET_SECONDS / RAID_BASELINE_SECONDS)
+
+def name_skeleton(name: str) -> str:
+    """📌 Case-folded letters of a name with accents, digits and symbols dropped: "xX_Ráider_1234" -> "xxraid"."""
+    letters = unicodedata.normalize("NFKD", name).casefold()
+    return "".join(char for char in letters if char.isalpha())[:SKELETON_LENGTH]
+
+class Join(NamedTuple):
+    user_id: int
+    at: float
+    young: bool
+    name_slot: int
+
+class Detection(NamedTuple):
+    """📌 Returned for a suspicious join: `wave` is True for the join that started a wave, with every recent suspect."""
+    wave: bool
+    suspects: list  # 📌 User IDs to act on
+    joins: int  # 📌 Joins in the window
+    young: int  # 📌 Young accounts among them
+    similar: int  # 📌 Joins in the busiest name bucket
+
+class GuildWindow:
+    """
+    📌 Join statistics for one guild over the last RAID_WINDOW_SECONDS, in a fixed ring of per-second buckets.
+    📌 Window totals are kept alongside, so a join costs O(1) and expired buckets are subtracted as time moves on.
+    📌 Completed buckets also feed moving averages of joins and young joins per bucket (the guild's baseline),
+    📌 plain means until RAID_BASELINE_SECONDS of buckets have been seen so a new window warms up quickly.
+    """
+    __slots__ = ("head", "joins", "young", "names", "total_joins", "total_young", "total_names",
+                 "rate", "young_rate", "seen", "recent", "raid_until", "hot_slot", "last_seen")
+
+    def __init__(self, now: float):
+        self.head = int(now // RAID_BUCKET_SECONDS)
+        self.joins = array("I", bytes(4 * _SLOTS))
+        self.young = array("I", bytes(4 * _SLOTS))
+        self.names = array("H", bytes(2 * _SLOTS * NAME_BUCKETS))
+        self.total_joins = 0
+        self.total_young = 0
+        self.total_names = array("I", bytes(4 * NAME_BUCKETS))
+        self.rate = 0.0
+        self.young_rate = 0.0
+        self.seen = 0
+        self.recent = deque(maxlen=RAID_RECENT_JOINS)
+        self.raid_until = 0.0
+        self.hot_slot = None
+        self.last_seen = now
+
+    def advance(self, now: float):
+        """📌 Expires the buckets that fell out of the window (at most one full pass of the ring)."""
+        bucket = int(now // RAID_BUCKET_SECONDS)
+        if bucket <= self.head:
+            return
+        if now >= self.raid_until:  # 📌 A raid doesn't become the baseline
+            slot = self.head % _SLOTS
+            self.seen += 1
+            weight = max(_ALPHA, 1 / self.seen)
+            self.rate += weight * (self.joins[slot] - self.rate)
+            self.young_rate += weight * (self.young[slot] - self.young_rate)
+            empty = bucket - self.head - 1  # 📌 Buckets without joins
+            if empty:
+                warming = min(empty, max(0, round(1 / _ALPHA) - self.seen))
+                decay = self.seen / (self.seen + warming) * (1 - _ALPHA) ** (empty - warming)
+                self.rate *= decay
+                self.young_rate *= decay
+                self.seen += empty
+        for expired in range(self.head + 1, min(bucket, self.head + _SLOTS) + 1):
+            slot = expired % _SLOTS
+            self.total_joins -= self.joins[slot]
+            self.total_young -= self.young[slot]
+            self.joins[slot] = self.young[slot] = 0
+            base = slot * NAME_BUCKETS
+            for name_slot in range(NAME_BUCKETS):
+                count = self.names[base + name_slot]
+                if count:
+                    self.total_names[name_slot] -= count
+                    self.names[base + name_slot] = 0
+        self.head = bucket
+
+    def add(self, join: Join):
+        slot = self.head % _SLOTS
+        self.joins[slot] += 1
+        self.total_joins += 1
+        if join.young:
+            self.young[slot] += 1
+            self.total_young += 1
+        self.names[slot * NAME_BUCKETS + join.name_slot] += 1
+        self.total_names[join.name_slot] += 1
+        self.recent.append(join)
+
+class RaidDetector:
+    """
+    📌 Streaming raid detection over member joins, with constant memory per guild and O(1) work per join.
+    📌 A wave starts when a guild's joins exceed its usual rate by RAID_JOIN_THRESHOLD and the extra joiners are
+    📌 mostly young accounts or share a name skeleton. While the wave lasts, every young or similarly named joiner
+    📌 is a suspect.
+    """
+    def __init__(self, max_guilds: int = RAID_MAX_GUILDS):
+        self.max_guilds = max_guilds
+        self._guilds = OrderedDict()  # 📌 guild_id -> GuildWindow, least recently joined first
+        self.joins = 0
+        self.waves = 0
+        self.suspects = 0
+
+    def observe(self, guild_id: int, user_id: int, name: str, created_at: float, now: float) -> Optional[Detection]:
+        """📌 Records a join (timestamps in seconds). Returns a Detection when the joiner is part of a raid wave."""
+        self.joins += 1
+        window = self._guilds.get(guild_id)
+        if window is None:
+            window = self._guilds[guild_id] = GuildWindow(now)
+            self._evict(now)
+        else:
+            self._guilds.move_to_end(guild_id)
+            window.advance(now)
+        window.last_seen = now
+
+        join = Join(user_id, now, now - created_at < RAID_YOUNG_ACCOUNT_DAYS * 86400,
+                    hash(name_skeleton(name)) % NAME_BUCKETS)
+        window.add(join)
+        similar = window.total_names[join.name_slot]
+
+        expected = window.rate * _SLOTS
+        excess = window.total_joins - expected - RAID_NOISE_SIGMAS * math.sqrt(expected)
+        if excess < RAID_JOIN_THRESHOLD:
+            return None  # 📌 Within the guild's usual traffic (and a running wave winds down)
+
+        if now < window.raid_until:
+            if not (join.young or join.name_slot == window.hot_slot):
+                return None
+            window.raid_until = now + RAID_COOLDOWN_SECONDS
+            self.suspects += 1
+            return Detection(False, [user_id], window.total_joins, window.total_young, similar)
+
+        young_wave = window.total_young - window.young_rate * _SLOTS >= RAID_YOUNG_RATIO * excess
+        similar_excess = similar - expected / NAME_BUCKETS
+        name_wave = similar_excess >= RAID_SIMILAR_NAMES and similar_excess >= RAID_SIMILAR_RATIO * excess
+        if not (young_wave or name_wave):
+            return None
+        window.raid_until = now + RAID_COOLDOWN_SECONDS
+        window.hot_slot = join.name_slot if name_wave else None
+        cutoff = now - RAID_WINDOW_SECONDS
+        suspects = [recent.user_id for recent in window.recent
+                    if recent.at >= cutoff and (recent.young or recent.name_slot == window.hot_slot)]
+        self.waves += 1
+        self.suspects += len(suspects)
+        return Detection(True, suspects, window.total_joins, window.total_young, similar)
+
+    def _evict(self, now: float):
+        """📌 Drops guilds whose window and wave are both over, then the least recently active beyond max_guilds."""
+        idle = RAID_WINDOW_SECONDS + RAID_COOLDOWN_SECONDS
+        while self._guilds:
+            guild_id, window = next(iter(self._guilds.items()))
+            if len(self._guilds) <= self.max_guilds and now - window.last_seen < idle:
+                break
+            del self._guilds[guild_id]
+
+    def status(self, guild_id: int, now: float) -> dict:
+        """📌 Current window statistics for one guild (for /raidstatus)."""
+        window = self._guilds.get(guild_id)
+        if window is None:
+            return {"joins": 0, "young": 0, "similar": 0, "raiding": False}
+        window.advance(now)
+        return {"joins": window.total_joins, "young": window.total_young, "similar": max(window.total_names),
+                "raiding": now < window.raid_until}
+
+    def stats(self) -> dict:
+        return {"joins": self.joins, "waves": self.waves, "suspects": self.suspects, "guilds": len(self._guilds)}
+
+# 📌 Shared detector fed by the RaidProtection cog.
+raid_detector = RaidDetector()
+metrics.register_gauge("bot_raid_detector", "Joins analysed, raid waves, suspects flagged and guilds tracked",
+                       "stat", raid_detector.stats, kind="counter")
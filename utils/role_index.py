@@ -0,0 +1,108 @@
+# 📌 utils/role_index.py
+
+import bisect
+from typing import Optional
+
+import discord
+from utils import metrics
+
+# 📌 Discord's limit on options per select menu.
+PAGE_SIZE = 25
+
+def role_key(role: discord.Role) -> tuple:
+    """📌 Sort/search key: case-insensitive name, then ID so equal names stay distinct."""
+    return role.name.casefold(), role.id
+
+def page_entries(entries: list, query: str = "", after: Optional[tuple] = None, limit: int = PAGE_SIZE,
+                 exclude=frozenset()) -> tuple:
+    """
+    📌 One page of role IDs from sorted `entries` whose name starts with `query`, continuing after the key `after`.
+    📌 Returns (role IDs, key to pass as `after` for the next page, or None on the last page).
+    📌 Finding the page start is a binary search, so deep pages cost the same as the first.
+    """
+    query = query.casefold()
+    position = bisect.bisect_right(entries, after) if after else bisect.bisect_left(entries, (query,))
+    role_ids, last = [], None
+    for index in range(position, len(entries)):
+        key = entries[index]
+        if not key[0].startswith(query):
+            break
+        if key[1] in exclude:
+            continue
+        if len(role_ids) == limit:
+            return role_ids, last
+        role_ids.append(key[1])
+        last = key
+    return role_ids, None
+
+def count_matches(entries: list, query: str = "") -> int:
+    """📌 Number of entries whose name starts with `query` (two binary searches)."""
+    query = query.casefold()
+    start = bisect.bisect_left(entries, (query,))
+    end = bisect.bisect_left(entries, (query + "\U0010ffff",))
+    return end - start
+
+class RoleIndex:
+    """
+    📌 Per-guild roles sorted by name, for paging and prefix search in the settings UI without scanning every role.
+    📌 A guild is indexed the first time it's needed and then kept current from role events (install()).
+    """
+    def __init__(self):
+        self._guilds = {}  # 📌 guild_id -> sorted list of role_key() tuples
+
+    def entries(self, guild: discord.Guild) -> list:
+        """📌 The guild's sorted role keys (@everyone excluded: it can't be allowlisted or blacklisted)."""
+        entries = self._guilds.get(guild.id)
+        if entries is None:
+            entries = self._guilds[guild.id] = sorted(role_key(role) for role in guild.roles if not role.is_default())
+        return entries
+
+    def page(self, guild: discord.Guild, query: str = "", after: Optional[tuple] = None, limit: int = PAGE_SIZE,
+             exclude=frozenset()) -> tuple:
+        return page_entries(self.entries(guild), query, after, limit, exclude)
+
+    def count(self, guild: discord.Guild, query: str = "") -> int:
+        return count_matches(self.entries(guild), query)
+
+    # -------------------- MAINTENANCE --------------------
+    def _insert(self, role: discord.Role):
+        entries = self._guilds.get(role.guild.id)
+        if entries is not None and not role.is_default():
+            bisect.insort(entries, role_key(role))
+
+    def _remove(self, role: discord.Role):
+        entries = self._guilds.get(role.guild.id)
+        if entries is None:
+            return
+        key = role_key(role)
+        position = bisect.bisect_left(entries, key)
+        if position < len(entries) and entries[position] == key:
+            del entries[position]
+
+    def install(self, bot):
+        """📌 Registers the role event listeners that keep indexed guilds current. Call once at startup."""
+        async def on_guild_role_create(role: discord.Role):
+            self._insert(role)
+
+        async def on_guild_role_delete(role: discord.Role):
+            self._remove(role)
+
+        async def on_guild_role_update(before: discord.Role, after: discord.Role):
+            if before.name != after.name:
+                self._remove(before)
+                self._insert(after)
+
+        async def on_guild_remove(guild: discord.Guild):
+            self._guilds.pop(guild.id, None)
+
+        bot.add_listener(on_guild_role_create)
+        bot.add_listener(on_guild_role_delete)
+        bot.add_listener(on_guild_role_update)
+        bot.add_listener(on_guild_remove)
+
+    def stats(self) -> dict:
+        return {"guilds": len(self._guilds), "roles": sum(len(entries) for entries in self._guilds.values())}
+
+# 📌 Shared index used by the settings role picker (listeners installed in bot.py).
+role_index = RoleIndex()
+metrics.register_gauge("bot_role_index", "Guilds and roles held by the settings role index", "stat", role_index.stats)
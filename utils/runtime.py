@@ -0,0 +1,106 @@
+# 📌 utils/runtime.py
+
+import asyncio
+import gc
+import json
+import logging
+import os
+from typing import Coroutine
+
+import aiohttp
+import discord
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.runtime")
+
+# 📌 "stock" keeps the defaults of asyncio, discord.py and aiohttp; "fast" uses uvloop, orjson, a bounded keep-alive
+# 📌 HTTP pool and fewer garbage collections. Each setting below can also be set on its own and overrides the profile.
+RUNTIME_PROFILE = os.getenv("RUNTIME_PROFILE", "stock").lower()
+FAST = RUNTIME_PROFILE == "fast"
+
+def _setting(name: str, fast: str, stock: str) -> str:
+    return os.getenv(name, fast if FAST else stock)
+
+# 📌 Run on uvloop when it's installed (pip install uvloop; not available on Windows).
+RUNTIME_UVLOOP = _setting("RUNTIME_UVLOOP", "1", "0") == "1"
+# 📌 Gateway/REST JSON codec: "orjson" (pip install orjson), "stdlib", or "auto" (discord.py's choice).
+RUNTIME_JSON = _setting("RUNTIME_JSON", "orjson", "auto").lower()
+# 📌 HTTP connection pool: total and per-host connection limits (0 = unlimited, discord.py's default),
+# 📌 keep-alive and DNS cache lifetimes in seconds.
+HTTP_POOL_LIMIT = int(_setting("HTTP_POOL_LIMIT", "100", "0"))
+HTTP_POOL_LIMIT_PER_HOST = int(_setting("HTTP_POOL_LIMIT_PER_HOST", "50", "0"))
+HTTP_KEEPALIVE_SECONDS = float(_setting("HTTP_KEEPALIVE_SECONDS", "60", "15"))
+HTTP_DNS_TTL = int(_setting("HTTP_DNS_TTL", "300", "10"))
+# 📌 gc.set_threshold() values ("" keeps the interpreter's), and whether objects created during startup are frozen
+# 📌 out of future collections (gc.freeze).
+GC_THRESHOLDS = _setting("GC_THRESHOLDS", "50000,50,100", "")
+GC_FREEZE = _setting("GC_FREEZE", "1", "0") == "1"
+
+# 📌 What was actually applied (an optional package may be missing), for the startup log and /metrics.
+active = {"profile": RUNTIME_PROFILE}
+
+def _stdlib_dumps(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=True)
+
+def configure():
+    """
+    📌 Applies the JSON codec and GC settings. Call once, before the bot is created.
+    📌 discord.py looks its codec up on every payload, so replacing it here covers the gateway and REST.
+    """
+    codec = "orjson" if discord.utils.HAS_ORJSON else "stdlib"
+    if RUNTIME_JSON == "orjson" and not discord.utils.HAS_ORJSON:
+        try:
+            import orjson
+        except ImportError:
+            logger.warning("RUNTIME_JSON=orjson but orjson is not installed; using the standard library")
+        else:
+            discord.utils._to_json = lambda obj: orjson.dumps(obj).decode("utf-8")
+            discord.utils._from_json = orjson.loads
+            codec = "orjson"
+    elif RUNTIME_JSON == "stdlib":
+        discord.utils._to_json = _stdlib_dumps
+        discord.utils._from_json = json.loads
+        codec = "stdlib"
+    active["json"] = codec
+    # 📌 discord.py negotiates gateway compression itself: zstd-stream with the zstandard package, else zlib-stream.
+    # 📌 Older releases (requirements.txt allows them) lack this private context and always use zlib-stream.
+    context = getattr(discord.utils, "_ActiveDecompressionContext", None)
+    active["gateway_compression"] = getattr(context, "COMPRESSION_TYPE", "zlib-stream")
+
+    if GC_THRESHOLDS:
+        gc.set_threshold(*(int(value) for value in GC_THRESHOLDS.split(",")))
+    active["gc_thresholds"] = ",".join(str(value) for value in gc.get_threshold())
+
+def connector():
+    """📌 The HTTP connector for the bot's REST session, or None to keep discord.py's. Needs a running loop."""
+    if not FAST and not any(name in os.environ for name in (
+            "HTTP_POOL_LIMIT", "HTTP_POOL_LIMIT_PER_HOST", "HTTP_KEEPALIVE_SECONDS", "HTTP_DNS_TTL")):
+        active["http_pool"] = "default"
+        return None
+    active["http_pool"] = f"{HTTP_POOL_LIMIT or '∞'}/{HTTP_POOL_LIMIT_PER_HOST or '∞'} per host"
+    return aiohttp.TCPConnector(limit=HTTP_POOL_LIMIT, limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                                keepalive_timeout=HTTP_KEEPALIVE_SECONDS, ttl_dns_cache=HTTP_DNS_TTL)
+
+def freeze_startup_objects():
+    """📌 Moves everything allocated so far (modules, cogs, caches) out of the collector's reach (GC_FREEZE)."""
+    if GC_FREEZE:
+        gc.collect()
+        gc.freeze()
+        active["gc_frozen"] = gc.get_freeze_count()
+
+def run(main: Coroutine):
+    """📌 Runs the bot's main coroutine on uvloop when enabled and installed, otherwise on the stock asyncio loop."""
+    loop = "asyncio"
+    if RUNTIME_UVLOOP:
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("RUNTIME_UVLOOP=1 but uvloop is not installed; using the asyncio event loop")
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            loop = "uvloop"
+    active["loop"] = loop
+    return asyncio.run(main)
+
+def summary() -> str:
+    return " · ".join(f"{key}={value}" for key, value in active.items())
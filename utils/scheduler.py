@@ -0,0 +1,196 @@
+# 📌 utils/scheduler.py
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from pymongo import ASCENDING, DeleteOne, ReplaceOne
+from utils.supervisor import supervisor
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.scheduler")
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+# 📌 A job whose handler raises is retried after JOB_RETRY_SECONDS, doubling each time up to JOB_RETRY_MAX_SECONDS,
+# 📌 and dropped (with an error) after JOB_MAX_ATTEMPTS failed attempts, about two hours in total.
+JOB_RETRY_SECONDS = 30.0
+JOB_RETRY_MAX_SECONDS = 3600.0
+JOB_MAX_ATTEMPTS = 8
+
+class ExpiryScheduler:
+    """
+    📌 Durable scheduler for delayed moderation actions (timeout lifts, temporary role removals).
+    📌 Jobs are persisted to MongoDB so they survive restarts, and kept in a single in-memory min-heap.
+    📌 One wakeup task sleeps until the earliest due time and fires due jobs in batches.
+    📌 `clock` returns the current UNIX time and can be replaced with a fake clock for testing.
+    📌 `job_filter` limits which persisted jobs this process loads (e.g. only its own shards' guilds).
+    """
+    def __init__(self, collection, clock: Callable[[], float] = time.time, batch_size: int = 50,
+                 job_filter: Optional[Callable[[dict], bool]] = None):
+        self.collection = collection
+        self.clock = clock
+        self.job_filter = job_filter
+        self.batch_size = batch_size
+        self._handlers = {}
+        self._jobs = {}   # 📌 job _id -> job document (the source of truth for the heap)
+        self._heap = []   # 📌 (due timestamp, job _id); stale entries are skipped lazily
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def register(self, kind: str, handler: JobHandler):
+        """📌 Registers the coroutine that runs when a job of `kind` becomes due."""
+        self._handlers[kind] = handler
+
+    async def start(self):
+        """
+        📌 Ensures the due-time index, reloads pending jobs and starts the wakeup task.
+        📌 Jobs that became due while the bot was offline fire immediately. Safe to call more than once.
+        """
+        if self._task is not None:
+            return
+        await self.collection.create_index([("due", ASCENDING)])
+        async for job in self.collection.find({}).sort("due", ASCENDING):
+            if self.job_filter is None or self.job_filter(job):
+                self._push(job)
+        logger.info(f"Loaded {len(self._jobs)} pending scheduled jobs")
+        self._task = supervisor.spawn(self._run(), "wakeup", owner="scheduler", essential=True)
+
+    async def stop(self):
+        """📌 Cancels the wakeup task; pending jobs stay persisted for the next start."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def schedule(self, job_id: str, kind: str, due: datetime, **payload) -> str:
+        """
+        📌 Persists and queues a job. Scheduling an existing `job_id` replaces it,
+        📌 so re-timing out a user moves their lift time instead of adding a second job.
+        """
+        job = {"_id": job_id, "kind": kind, "due": due, **payload}
+        await self.collection.replace_one({"_id": job_id}, job, upsert=True)
+        self._push(job)
+        return job_id
+
+    async def schedule_many(self, jobs: list):
+        """📌 Persists and queues several jobs (dicts with _id, kind, due, ...) with a single bulk_write."""
+        if not jobs:
+            return
+        await self.collection.bulk_write([ReplaceOne({"_id": job["_id"]}, job, upsert=True) for job in jobs], ordered=False)
+        for job in jobs:
+            self._push(job)
+
+    async def cancel(self, job_id: str):
+        """📌 Removes a pending job from the heap and from MongoDB."""
+        self._jobs.pop(job_id, None)
+        await self.collection.delete_one({"_id": job_id})
+
+    def pending(self) -> int:
+        """📌 Number of jobs waiting to fire."""
+        return len(self._jobs)
+
+    def wake(self):
+        """📌 Re-evaluates the next due time (e.g. after a fake clock has been advanced)."""
+        self._wakeup.set()
+
+    def _push(self, job: dict):
+        due = self._timestamp(job["due"])
+        self._jobs[job["_id"]] = job
+        heapq.heappush(self._heap, (due, job["_id"]))
+        if self._heap[0][1] == job["_id"]:
+            # 📌 The new job is now the earliest one, so the sleeping wakeup task must re-arm.
+            self._wakeup.set()
+
+    @staticmethod
+    def _timestamp(due: datetime) -> float:
+        # 📌 MongoDB returns naive datetimes (UTC) unless the client is tz_aware.
+        if due.tzinfo is None:
+            due = due.replace(tzinfo=timezone.utc)
+        return due.timestamp()
+
+    def _pop_due(self) -> list:
+        """📌 Pops up to `batch_size` jobs whose due time has passed."""
+        now = self.clock()
+        batch = []
+        while self._heap and len(batch) < self.batch_size and self._heap[0][0] <= now:
+            due, job_id = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            # 📌 Skip cancelled jobs and heap entries superseded by a reschedule.
+            if job is None or self._timestamp(job["due"]) != due:
+                continue
+            del self._jobs[job_id]
+            batch.append(job)
+        return batch
+
+    async def _fire(self, job: dict) -> bool:
+        """📌 Runs a job's handler. Returns False if it raised, so the job is retried."""
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            logger.warning(f"No handler registered for scheduled job kind '{job['kind']}'")
+            return True  # 📌 Retrying can't help; the job is dropped as before
+        try:
+            await handler(job)
+        except Exception:
+            logger.exception(f"Scheduled job {job['_id']} failed")
+            return False
+        return True
+
+    def _retry(self, job: dict) -> Optional[dict]:
+        """📌 The job moved to its next attempt after a backoff, or None once it has used up its attempts."""
+        attempts = job.get("attempts", 0) + 1
+        if attempts >= JOB_MAX_ATTEMPTS:
+            logger.error(f"Scheduled job {job['_id']} failed {attempts} times; giving up")
+            return None
+        delay = min(JOB_RETRY_SECONDS * 2 ** (attempts - 1), JOB_RETRY_MAX_SECONDS)
+        return {**job, "due": datetime.fromtimestamp(self.clock() + delay, timezone.utc), "attempts": attempts}
+
+    async def run_due(self) -> int:
+        """📌 Fires every job that is currently due, in batches. Returns how many jobs ran."""
+        fired = 0
+        while batch := self._pop_due():
+            results = await asyncio.gather(*(self._fire(job) for job in batch))
+            # 📌 Filtered on the due time that fired: a job rescheduled by its handler keeps its new document.
+            ops, retries = [], []
+            for job, succeeded in zip(batch, results):
+                retry = None if succeeded else self._retry(job)
+                if retry is None:
+                    ops.append(DeleteOne({"_id": job["_id"], "due": job["due"]}))
+                else:
+                    ops.append(ReplaceOne({"_id": job["_id"], "due": job["due"]}, retry))
+                    retries.append(retry)
+            await self.collection.bulk_write(ops, ordered=False)
+            for retry in retries:
+                if retry["_id"] not in self._jobs:  # 📌 Not rescheduled or re-queued meanwhile
+                    self._push(retry)
+            fired += len(batch)
+        return fired
+
+    def _next_delay(self):
+        """📌 Seconds until the earliest live job is due, or None if nothing is pending."""
+        while self._heap:
+            due, job_id = self._heap[0]
+            job = self._jobs.get(job_id)
+            if job is None or self._timestamp(job["due"]) != due:
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, due - self.clock())
+        return None
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            delay = self._next_delay()
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.run_due()
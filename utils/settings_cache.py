@@ -0,0 +1,192 @@
+# 📌 utils/settings_cache.py
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+from utils import metrics
+from utils.database import settings_collection
+from utils.supervisor import supervisor
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.settings_cache")
+
+# 📌 Seconds before a cached copy is re-read from MongoDB (0 disables TTL expiry).
+SETTINGS_CACHE_TTL = float(os.getenv("SETTINGS_CACHE_TTL", "60"))
+# 📌 Set to "1" to follow a MongoDB change stream (requires a replica set) so every bot process sees writes instantly.
+SETTINGS_CACHE_WATCH = os.getenv("SETTINGS_CACHE_WATCH", "0") == "1"
+# 📌 Guilds whose settings weren't used for this many seconds are dropped from the cache (0 disables idle eviction).
+SETTINGS_CACHE_IDLE = float(os.getenv("SETTINGS_CACHE_IDLE", "1800"))
+# 📌 Hard cap on cached guilds; the least recently used guild is dropped first.
+SETTINGS_CACHE_MAX_GUILDS = int(os.getenv("SETTINGS_CACHE_MAX_GUILDS", "10000"))
+
+COMMAND_ACCESS_ID = "command_access"
+
+def command_access_id(guild_id: int) -> str:
+    """📌 `_id` of a guild's command access document in bot_settings."""
+    return f"{COMMAND_ACCESS_ID}:{guild_id}"
+
+class CommandAccess(NamedTuple):
+    """📌 Immutable snapshot of the command access settings."""
+    allowlist: frozenset
+    blacklist: frozenset
+
+    @classmethod
+    def from_document(cls, data: Optional[dict]) -> "CommandAccess":
+        data = data or {}
+        return cls(frozenset(data.get("allowlist", [])), frozenset(data.get("blacklist", [])))
+
+class _Entry:
+    __slots__ = ("value", "loaded_at", "used_at")
+
+    def __init__(self, value: CommandAccess, now: float):
+        self.value = value
+        self.loaded_at = now
+        self.used_at = now
+
+class CommandAccessCache:
+    """
+    📌 In-process cache of each guild's `command_access:{guild_id}` settings document.
+    📌 Guilds are loaded lazily on first use and kept in least-recently-used order, so guilds that go idle
+    📌 (or the oldest ones, past SETTINGS_CACHE_MAX_GUILDS) are evicted and the cache stays bounded.
+    📌 Writes made through `update_roles` refresh the cache immediately.
+    📌 Other processes' writes are picked up by TTL expiry or, optionally, a change stream.
+    """
+    def __init__(self, collection, ttl: float = SETTINGS_CACHE_TTL, idle: float = SETTINGS_CACHE_IDLE,
+                 max_guilds: int = SETTINGS_CACHE_MAX_GUILDS):
+        self.collection = collection
+        self.ttl = ttl
+        self.idle = idle
+        self.max_guilds = max_guilds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # 📌 guild_id -> _Entry, least recently used first
+        self._locks = {}  # 📌 guild_id -> lock held while that guild is being loaded
+        self._watch_task = None
+
+    def _is_fresh(self, entry: Optional[_Entry], now: float) -> bool:
+        if entry is None:
+            return False
+        return not self.ttl or now - entry.loaded_at < self.ttl
+
+    def _touch(self, guild_id: int, entry: _Entry, now: float) -> CommandAccess:
+        entry.used_at = now
+        self._entries.move_to_end(guild_id)
+        self._evict(now)
+        return entry.value
+
+    def _evict(self, now: float):
+        """📌 Drops guilds from the idle end; O(1) per call unless there is something to evict."""
+        while self._entries:
+            guild_id, oldest = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_guilds and (not self.idle or now - oldest.used_at < self.idle):
+                break
+            del self._entries[guild_id]
+            self.evictions += 1
+
+    def _store(self, guild_id: int, data: Optional[dict]) -> CommandAccess:
+        now = time.monotonic()
+        value = CommandAccess.from_document(data)
+        previous = self._entries.get(guild_id)
+        if previous is not None and previous.value == value:
+            # 📌 Unchanged settings keep their identity, which permission_cache uses to tell if a decision is current.
+            value = previous.value
+        entry = _Entry(value, now)
+        self._entries[guild_id] = entry
+        return self._touch(guild_id, entry, now)
+
+    async def get(self, guild_id: int) -> CommandAccess:
+        """📌 Returns a guild's current settings, reading MongoDB only on a miss."""
+        now = time.monotonic()
+        entry = self._entries.get(guild_id)
+        if self._is_fresh(entry, now):
+            self.hits += 1
+            return self._touch(guild_id, entry, now)
+        lock = self._locks.setdefault(guild_id, asyncio.Lock())
+        try:
+            async with lock:
+                # 📌 Another coroutine may have loaded this guild while we waited for the lock.
+                now = time.monotonic()
+                entry = self._entries.get(guild_id)
+                if self._is_fresh(entry, now):
+                    self.hits += 1
+                    return self._touch(guild_id, entry, now)
+                self.misses += 1
+                return self._store(guild_id, await self.collection.find_one({"_id": command_access_id(guild_id)}))
+        finally:
+            if not lock.locked() and self._locks.get(guild_id) is lock:
+                del self._locks[guild_id]
+
+    async def update_roles(self, guild_id: int, role_type: str, role_ids: list, remove: bool) -> CommandAccess:
+        """📌 Adds or removes role IDs from a guild's allowlist/blacklist and refreshes the cache from the result."""
+        if remove:
+            update = {"$pull": {role_type: {"$in": role_ids}}}
+        else:
+            update = {"$addToSet": {role_type: {"$each": role_ids}}}
+        update["$setOnInsert"] = {"guild_id": guild_id}
+        data = await self.collection.find_one_and_update(
+            {"_id": command_access_id(guild_id)}, update, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        return self._store(guild_id, data)
+
+    def invalidate(self, guild_id: Optional[int] = None):
+        """📌 Drops one guild's cached copy (or every guild's) so the next `get` re-reads MongoDB."""
+        if guild_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(guild_id, None)
+
+    def stats(self) -> dict:
+        """📌 Returns hit/miss/eviction counters and the number of cached guilds for monitoring."""
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hits / total if total else 0.0,
+                "evictions": self.evictions, "guilds": len(self._entries)}
+
+    def start_watching(self):
+        """📌 Starts the change-stream watcher if enabled via SETTINGS_CACHE_WATCH."""
+        if SETTINGS_CACHE_WATCH and self._watch_task is None:
+            self._watch_task = supervisor.spawn(self._watch(), "change_stream", owner="settings_cache", essential=True)
+
+    async def _watch(self):
+        """📌 Refreshes cached guilds whenever their settings document changes in any process."""
+        pipeline = [{"$match": {"documentKey._id": {"$regex": f"^{COMMAND_ACCESS_ID}:"}}}]
+        try:
+            async with await self.collection.watch(pipeline, full_document="updateLookup") as stream:
+                async for change in stream:
+                    guild_id = int(change["documentKey"]["_id"].split(":", 1)[1])
+                    # 📌 Only guilds already cached are refreshed; the rest load lazily when first used.
+                    if guild_id not in self._entries:
+                        continue
+                    if change.get("fullDocument") is not None:
+                        self._store(guild_id, change["fullDocument"])
+                    else:
+                        self.invalidate(guild_id)
+        except PyMongoError as e:
+            # 📌 Change streams need a replica set; TTL expiry keeps processes consistent without one.
+            logger.warning(f"Settings change stream unavailable, falling back to TTL expiry: {e}")
+
+async def migrate_legacy_settings(guild_id: int) -> bool:
+    """
+    📌 One-off migration of the old global `command_access` document to `command_access:{guild_id}`.
+    📌 Existing per-guild settings are never overwritten. Returns True if a legacy document was migrated.
+    """
+    legacy = await settings_collection.find_one({"_id": COMMAND_ACCESS_ID})
+    if legacy is None:
+        return False
+    await settings_collection.update_one(
+        {"_id": command_access_id(guild_id)},
+        {"$setOnInsert": {"guild_id": guild_id, "allowlist": legacy.get("allowlist", []), "blacklist": legacy.get("blacklist", [])}},
+        upsert=True
+    )
+    await settings_collection.delete_one({"_id": COMMAND_ACCESS_ID})
+    return True
+
+# 📌 Shared cache instance used by the permission checks and the settings UI.
+command_access_cache = CommandAccessCache(settings_collection)
+metrics.register_gauge("bot_settings_cache", "Per-guild settings cache counters and size", "stat", command_access_cache.stats)
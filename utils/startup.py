@@ -0,0 +1,113 @@
+# 📌 utils/startup.py
+
+import asyncio
+import hashlib
+import importlib
+import json
+import logging
+import os
+import pkgutil
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable
+
+import discord
+from discord import app_commands
+from utils import metrics
+from utils.database import settings_collection
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.startup")
+
+# 📌 Set FORCE_COMMAND_SYNC=1 to sync the command tree even if its hash is unchanged.
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "0") == "1"
+COMMAND_TREE_ID = "command_tree"
+
+class StartupTimer:
+    """📌 Records how long each startup stage took (seconds, in completion order)."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float):
+        self.stages[name] = seconds
+        logger.info(f"Startup stage {name}: {seconds * 1000:.0f} ms")
+
+    def since_start(self) -> float:
+        return time.perf_counter() - self.started
+
+# 📌 Process-wide timer, created when this module is first imported (i.e. at bot startup).
+timer = StartupTimer()
+metrics.register_gauge("bot_startup_stage_seconds", "Duration of each startup stage", "stage", lambda: dict(timer.stages))
+
+def discover_extensions(package: str = "commands") -> list:
+    """📌 Module names of every extension in `package` (sorted, so load order is stable)."""
+    module = importlib.import_module(package)
+    return sorted(f"{package}.{info.name}" for info in pkgutil.iter_modules(module.__path__) if not info.name.startswith("_"))
+
+async def load_extensions(bot, package: str = "commands") -> list:
+    """
+    📌 Loads every extension in two timed stages:
+    📌 1. imports them concurrently in worker threads, which pulls their dependency trees into sys.modules in parallel;
+    📌 2. runs the (now cheap) load_extension calls together, so cog_load I/O such as index creation overlaps.
+    """
+    names = discover_extensions(package)
+    async with timer.stage("extensions.import"):
+        await asyncio.gather(*(asyncio.to_thread(importlib.import_module, name) for name in names))
+    async with timer.stage("extensions.setup"):
+        await asyncio.gather(*(bot.load_extension(name) for name in names))
+    for name in names:
+        print(f"📌 Loaded extension: {name}")
+    return names
+
+def command_tree_hash(tree: app_commands.CommandTree) -> str:
+    """📌 SHA-256 of the global command definitions exactly as they would be sent to Discord."""
+    commands = [
+        command
+        for kind in (discord.AppCommandType.chat_input, discord.AppCommandType.user, discord.AppCommandType.message)
+        for command in tree.get_commands(type=kind)
+    ]
+    payload = sorted((command.to_dict(tree) for command in commands), key=lambda data: (data.get("type", 1), data["name"]))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+async def sync_commands_if_changed(bot) -> bool:
+    """
+    📌 Syncs the global command tree only when its definitions changed since the last sync
+    📌 (hash stored in bot_settings, per application). Returns True if a sync was performed.
+    """
+    digest = command_tree_hash(bot.tree)
+    doc_id = f"{COMMAND_TREE_ID}:{bot.application_id}"
+    stored = await settings_collection.find_one({"_id": doc_id}, {"hash": 1})
+    if not FORCE_COMMAND_SYNC and stored and stored.get("hash") == digest:
+        logger.info("Command tree unchanged; skipping sync")
+        return False
+    await bot.tree.sync()
+    await settings_collection.update_one({"_id": doc_id}, {"$set": {"hash": digest, "synced_at": time.time()}}, upsert=True)
+    return True
+
+# -------------------- WARMUPS --------------------
+_warmups = []
+
+def register_warmup(name: str, warmup: Callable[[], Awaitable[None]]):
+    """📌 Registers non-critical work (cache prefills, panel resumes) to run in the background once the bot is ready."""
+    _warmups.append((name, warmup))
+
+async def _run_warmup(name: str, warmup: Callable[[], Awaitable[None]]):
+    try:
+        async with timer.stage(f"warmup.{name}"):
+            await warmup()
+    except Exception:
+        logger.exception(f"Warmup {name} failed")
+
+async def run_warmups():
+    """📌 Runs every registered warmup concurrently; failures are logged and never block interactions."""
+    async with timer.stage("warmups"):
+        await asyncio.gather(*(_run_warmup(name, warmup) for name, warmup in _warmups))
@@ -0,0 +1,125 @@
+# 📌 utils/status_engine.py
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Optional
+
+import discord
+from utils.database import panels_collection
+from utils.dispatcher import Priority, channel_bucket, dispatcher
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.status_engine")
+
+# 📌 Edits slower than this were most likely held back by a rate-limit bucket.
+SLOW_EDIT_SECONDS = 1.0
+# 📌 Live panels allowed per guild (each channel holds at most one; a new one replaces it).
+MAX_PANELS_PER_GUILD = int(os.getenv("MAX_PANELS_PER_GUILD", "3"))
+
+class StatusPanel:
+    """📌 One live status message and the hash of the content it currently shows."""
+    def __init__(self, channel_id: int, message_id: int, guild_id: Optional[int] = None):
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.guild_id = guild_id
+        self.last_hash = None
+
+class StatusEngine:
+    """
+    📌 Keeps any number of live status panels up to date.
+    📌 The embed is rendered once per tick and only sent to panels whose content hash changed.
+    📌 The refresh interval backs off when edits hit rate limits and recovers when they are fast again.
+    📌 Panel locations are persisted so they resume after a restart.
+    """
+    def __init__(self, bot, render: Callable[[], Awaitable[discord.Embed]],
+                 base_interval: float = 5.0, max_interval: float = 60.0):
+        self.bot = bot
+        self.render = render
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.interval = base_interval
+        self.panels = {}
+        self.edits = 0
+        self.skipped = 0
+
+    async def load(self):
+        """📌 Restores persisted panels whose channel is visible to this process (its own shards)."""
+        async for doc in panels_collection.find({}):
+            if self.bot.get_channel(doc["channel_id"]) is not None:
+                self.panels[doc["_id"]] = StatusPanel(doc["channel_id"], doc["_id"], doc.get("guild_id"))
+        logger.info(f"Resumed {len(self.panels)} live status panels")
+
+    def panel_in(self, channel_id: int) -> Optional[StatusPanel]:
+        return next((panel for panel in self.panels.values() if panel.channel_id == channel_id), None)
+
+    def guild_panels(self, guild_id: int) -> int:
+        return sum(1 for panel in self.panels.values() if panel.guild_id == guild_id)
+
+    async def register(self, message: discord.Message, embed: discord.Embed):
+        """📌 Starts updating `message` and persists its location, replacing the channel's previous panel."""
+        previous = self.panel_in(message.channel.id)
+        if previous is not None:
+            await self.unregister(previous.message_id)
+        panel = StatusPanel(message.channel.id, message.id, message.guild.id if message.guild else None)
+        panel.last_hash = self.content_hash(embed)
+        self.panels[message.id] = panel
+        await panels_collection.update_one(
+            {"_id": message.id},
+            {"$set": {"channel_id": panel.channel_id, "guild_id": panel.guild_id}},
+            upsert=True
+        )
+
+    async def unregister(self, message_id: int):
+        self.panels.pop(message_id, None)
+        await panels_collection.delete_one({"_id": message_id})
+
+    @staticmethod
+    def content_hash(embed: discord.Embed) -> str:
+        return hashlib.sha1(json.dumps(embed.to_dict(), sort_keys=True, default=str).encode()).hexdigest()
+
+    async def tick(self):
+        """📌 Renders once and edits only the panels whose content changed."""
+        if not self.panels:
+            return
+        embed = await self.render()
+        digest = self.content_hash(embed)
+        rate_limited = False
+        for panel in list(self.panels.values()):
+            if panel.last_hash == digest:
+                self.skipped += 1
+                continue
+            channel = self.bot.get_channel(panel.channel_id)
+            if channel is None:
+                continue
+            started = time.monotonic()
+            try:
+                # 📌 Only the embed changes; the link-button view stays attached to the message.
+                # 📌 Panel edits are the lowest dispatcher priority, so they wait behind moderation traffic.
+                message = channel.get_partial_message(panel.message_id)
+                edited = await dispatcher.submit(Priority.STATUS, channel_bucket(channel), lambda: message.edit(embed=embed),
+                                                 key=f"panel:{panel.message_id}")
+            except discord.NotFound:
+                await self.unregister(panel.message_id)
+                continue
+            except discord.HTTPException as e:
+                rate_limited = rate_limited or e.status == 429
+                logger.warning(f"Error updating live info panel {panel.message_id}: {e}")
+                continue
+            if edited is None:
+                continue  # 📌 Dropped under backpressure; retried next tick
+            panel.last_hash = digest
+            self.edits += 1
+            # 📌 discord.py waits out rate limits inside edit(), so a slow edit (or a long wait in the outbound queue)
+            # 📌 means we're close to the limit.
+            rate_limited = rate_limited or time.monotonic() - started > SLOW_EDIT_SECONDS
+        self._adjust_interval(rate_limited)
+
+    def _adjust_interval(self, rate_limited: bool):
+        """📌 Doubles the interval under rate-limit pressure and eases back toward the base interval otherwise."""
+        if rate_limited:
+            self.interval = min(self.max_interval, self.interval * 2)
+        else:
+            self.interval = max(self.base_interval, self.interval * 0.8)
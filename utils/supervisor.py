@@ -0,0 +1,100 @@
+# 📌 utils/supervisor.py
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from typing import Coroutine, Optional
+
+from utils import metrics
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.supervisor")
+
+# 📌 Background tasks allowed at once; spawns beyond it are refused (essential service tasks are exempt).
+MAX_BACKGROUND_TASKS = int(os.getenv("MAX_BACKGROUND_TASKS", "1000"))
+
+class _Supervised:
+    __slots__ = ("owner", "name", "started")
+
+    def __init__(self, owner: str, name: str):
+        self.owner = owner
+        self.name = name
+        self.started = time.monotonic()
+
+class TaskSupervisor:
+    """
+    📌 Registry for every background task the bot starts, instead of bare asyncio.create_task calls.
+    📌 Tasks are named "{owner}:{name}" (visible in the loop watchdog and asyncio debugging), counted per owner,
+    📌 capped, and have their failures logged. cancel() stops an owner's tasks, e.g. a cog's on unload, and
+    📌 cancel() with no owner stops whatever is left at shutdown.
+    """
+    def __init__(self, limit: int = MAX_BACKGROUND_TASKS):
+        self.limit = limit
+        self._tasks = {}  # 📌 task -> _Supervised
+        self.started = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def spawn(self, coro: Coroutine, name: str, owner: str = "bot", essential: bool = False) -> Optional[asyncio.Task]:
+        """
+        📌 Starts `coro` as a supervised task. Returns None (and closes the coroutine) when the cap is reached,
+        📌 unless the task is `essential` (long-lived services the bot can't run without).
+        """
+        if not essential and len(self._tasks) >= self.limit:
+            coro.close()
+            self.rejected += 1
+            logger.warning(f"Background task limit ({self.limit}) reached; refused {owner}:{name}")
+            return None
+        task = asyncio.create_task(coro, name=f"{owner}:{name}")
+        self._tasks[task] = _Supervised(owner, name)
+        self.started += 1
+        task.add_done_callback(self._finished)
+        return task
+
+    def _finished(self, task: asyncio.Task):
+        self._tasks.pop(task, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1
+            logger.error(f"Background task {task.get_name()} failed", exc_info=task.exception())
+
+    async def cancel(self, owner: Optional[str] = None, timeout: float = 5.0) -> int:
+        """📌 Cancels `owner`'s tasks (all tasks when None) and waits up to `timeout` for them. Returns how many."""
+        tasks = [task for task, entry in self._tasks.items() if owner is None or entry.owner == owner]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                logger.warning(f"Background task {task.get_name()} did not stop within {timeout:g}s")
+        return len(tasks)
+
+    def install(self, bot):
+        """📌 Cancels a cog's tasks (spawned with owner=cog.qualified_name) when the cog is removed."""
+        remove_cog = bot.remove_cog
+
+        async def supervised_remove_cog(name: str, **kwargs):
+            cog = await remove_cog(name, **kwargs)
+            if cog is not None:
+                await self.cancel(cog.qualified_name)
+            return cog
+        bot.remove_cog = supervised_remove_cog
+
+    def running(self) -> Counter:
+        """📌 Running tasks per owner."""
+        return Counter(entry.owner for entry in self._tasks.values())
+
+    def oldest(self, count: int = 5) -> list:
+        """📌 [(task name, seconds running)] for the longest-running tasks."""
+        now = time.monotonic()
+        entries = sorted(self._tasks.items(), key=lambda item: item[1].started)[:count]
+        return [(task.get_name(), now - entry.started) for task, entry in entries]
+
+    def stats(self) -> dict:
+        return {"running": len(self._tasks), "started": self.started, "failed": self.failed, "rejected": self.rejected}
+
+# 📌 Shared supervisor used by the bot's services and cogs (installed in bot.py).
+supervisor = TaskSupervisor()
+metrics.register_gauge("bot_background_tasks", "Supervised background tasks running, started, failed and refused",
+                       "stat", supervisor.stats)
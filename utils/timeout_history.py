@@ -0,0 +1,152 @@
+# 📌 utils/timeout_history.py
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo import ASCENDING, DeleteOne, UpdateOne
+from utils.database import users_collection, timeout_days_collection
+from utils.write_buffer import users_buffer
+from utils.user_state import user_query, with_identity
+from utils import indexes
+
+# 📌 /userinfo reports timeouts within this many days (today included, as before).
+HISTORY_WINDOW_DAYS = 30
+# 📌 Only the most recent entries (with reasons) are kept on the user document.
+TIMEOUT_HISTORY_LIMIT = 20
+# 📌 Day buckets are removed by a TTL index once they can no longer fall inside the window.
+BUCKET_TTL_SECONDS = (HISTORY_WINDOW_DAYS + 2) * 86400
+
+def _day_start(moment: datetime) -> datetime:
+    """📌 Midnight UTC of the day containing `moment`."""
+    return datetime(moment.year, moment.month, moment.day, tzinfo=timezone.utc)
+
+# 📌 Lookup and TTL indexes for the per-day timeout buckets.
+indexes.register(timeout_days_collection, [("guild_id", ASCENDING), ("user_id", ASCENDING), ("day", ASCENDING)])
+indexes.register(timeout_days_collection, "day", expireAfterSeconds=BUCKET_TTL_SECONDS)
+
+def _bucket_id(guild_id: int, user_id: int, day: datetime) -> str:
+    return f"{guild_id}:{user_id}:{day.strftime('%Y-%m-%d')}"
+
+def _timeout_updates(guild_id: int, user_id: int, when: datetime, reason: str, extra: Optional[dict]):
+    """📌 Returns ((filter, update) for the day bucket, (filter, update) for the user document)."""
+    day = _day_start(when)
+    bucket = (
+        {"_id": _bucket_id(guild_id, user_id, day)},
+        {"$inc": {"count": 1}, "$setOnInsert": {"guild_id": guild_id, "user_id": user_id, "day": day}},
+    )
+    update = {
+        "$push": {"timeout_history": {
+            "$each": [{"date": when.strftime("%Y-%m-%d"), "reason": reason}],
+            "$slice": -TIMEOUT_HISTORY_LIMIT,
+        }},
+        "$inc": {"timeouts_total": 1},
+        # 📌 New documents never need the migration below.
+        "$setOnInsert": {"history_bucketed": True},
+    }
+    if extra:
+        update["$set"] = extra
+    return bucket, (user_query(guild_id, user_id), with_identity(update, guild_id, user_id))
+
+def timeout_record_ops(guild_id: int, user_id: int, when: datetime, reason: str, extra: Optional[dict] = None):
+    """
+    📌 Builds the (bucket, user) UpdateOne operations that record one timeout.
+    📌 Used by bulk commands so many timeouts are committed with one bulk_write per collection.
+    """
+    bucket, user = _timeout_updates(guild_id, user_id, when, reason, extra)
+    return UpdateOne(*bucket, upsert=True), UpdateOne(*user, upsert=True)
+
+async def record_timeout(guild_id: int, user_id: int, when: datetime, reason: str, extra: Optional[dict] = None):
+    """
+    📌 Records a timeout in `guild_id`: bumps the per-day counter and appends to the capped recent history.
+    📌 `extra` holds additional $set fields for the user document (e.g. muted / mute_end).
+    """
+    bucket, user = _timeout_updates(guild_id, user_id, when, reason, extra)
+    await timeout_days_collection.update_one(*bucket, upsert=True)
+    await users_buffer.update_one(*user, upsert=True)
+
+async def count_recent_timeouts(guild_id: int, user_id: int, now: Optional[datetime] = None) -> int:
+    """📌 Sums at most HISTORY_WINDOW_DAYS + 1 day buckets, so the cost doesn't grow with history."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = _day_start(now) - timedelta(days=HISTORY_WINDOW_DAYS)
+    cursor = await timeout_days_collection.aggregate([
+        {"$match": {"guild_id": guild_id, "user_id": user_id, "day": {"$gte": cutoff}}},
+        {"$group": {"_id": None, "total": {"$sum": "$count"}}},
+    ])
+    async for result in cursor:
+        return result["total"]
+    return 0
+
+async def migrate_user_documents(batch_size: int = 500) -> int:
+    """
+    📌 One-off migration for documents written before day buckets existed.
+    📌 Rebuilds buckets for the recent window from each unbounded `timeout_history` array, then caps the array.
+    📌 Run it once (scripts/migrate_timeout_history.py) before starting a bot version that caps the history,
+    📌 after scripts/migrate_per_guild.py has scoped the documents to their guild.
+    📌 Migrated users are marked with `history_bucketed`, so re-running it is safe. Returns the number of users migrated.
+    """
+    cutoff = _day_start(datetime.now(timezone.utc)) - timedelta(days=HISTORY_WINDOW_DAYS)
+    migrated = 0
+    bucket_ops, user_ops = [], []
+    query = {"timeout_history.0": {"$exists": True}, "history_bucketed": {"$ne": True}, "guild_id": {"$exists": True}}
+    async for doc in users_collection.find(query, {"guild_id": 1, "user_id": 1, "timeout_history": 1}):
+        per_day = Counter()
+        for entry in doc["timeout_history"]:
+            try:
+                day = datetime.strptime(entry.get("date", ""), "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            except ValueError:
+                continue
+            if day >= cutoff:
+                per_day[day] += 1
+        for day, count in per_day.items():
+            bucket_ops.append(UpdateOne(
+                {"_id": _bucket_id(doc["guild_id"], doc["user_id"], day)},
+                {"$set": {"count": count, "guild_id": doc["guild_id"], "user_id": doc["user_id"], "day": day}},
+                upsert=True
+            ))
+        user_ops.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"timeout_history": doc["timeout_history"][-TIMEOUT_HISTORY_LIMIT:], "history_bucketed": True},
+             "$max": {"timeouts_total": len(doc["timeout_history"])}}
+        ))
+        migrated += 1
+        if len(user_ops) >= batch_size:
+            await _flush(bucket_ops, user_ops)
+    await _flush(bucket_ops, user_ops)
+    return migrated
+
+async def _flush(bucket_ops: list, user_ops: list):
+    if bucket_ops:
+        await timeout_days_collection.bulk_write(bucket_ops, ordered=False)
+    if user_ops:
+        await users_collection.bulk_write(user_ops, ordered=False)
+    bucket_ops.clear()
+    user_ops.clear()
+
+async def migrate_legacy_buckets(guild_id: int, batch_size: int = 500) -> int:
+    """
+    📌 One-off migration for day buckets written before timeouts were counted per guild (`_id` "{user_id}:{day}").
+    📌 Like user_state.migrate_legacy_documents, every legacy bucket is assigned to `guild_id`. Returns the number moved.
+    """
+    migrated = 0
+    copies, deletes = [], []
+    async for doc in timeout_days_collection.find({"guild_id": {"$exists": False}}):
+        copies.append(UpdateOne(
+            {"_id": _bucket_id(guild_id, doc["user_id"], doc["day"])},
+            {"$setOnInsert": {"guild_id": guild_id, "user_id": doc["user_id"], "day": doc["day"], "count": doc.get("count", 0)}},
+            upsert=True
+        ))
+        deletes.append(DeleteOne({"_id": doc["_id"]}))
+        migrated += 1
+        if len(copies) >= batch_size:
+            await _flush_buckets(copies, deletes)
+    await _flush_buckets(copies, deletes)
+    return migrated
+
+async def _flush_buckets(copies: list, deletes: list):
+    if copies:
+        await timeout_days_collection.bulk_write(copies, ordered=False)
+    if deletes:
+        await timeout_days_collection.bulk_write(deletes, ordered=False)
+    copies.clear()
+    deletes.clear()
@@ -0,0 +1,72 @@
+# 📌 utils/user_state.py
+
+from typing import Optional
+
+from pymongo import ASCENDING, DeleteOne, UpdateOne
+from utils.database import users_collection
+from utils.write_buffer import users_buffer
+from utils import indexes
+
+# 📌 User moderation documents are scoped per guild: `_id` is "{guild_id}:{user_id}" (so the write-behind
+# 📌 buffer can keep merging by `_id`), and `guild_id` / `user_id` are stored for per-guild queries.
+
+def user_key(guild_id: int, user_id: int) -> str:
+    return f"{guild_id}:{user_id}"
+
+def user_query(guild_id: int, user_id: int) -> dict:
+    """📌 Filter for one member's moderation document."""
+    return {"_id": user_key(guild_id, user_id)}
+
+def with_identity(update: dict, guild_id: int, user_id: int) -> dict:
+    """📌 Adds the guild/user fields to an upsert, so documents created by it can be queried per guild."""
+    update = dict(update)
+    update["$setOnInsert"] = {**update.get("$setOnInsert", {}), "guild_id": guild_id, "user_id": user_id}
+    return update
+
+# 📌 Compound index for per-guild scans of user documents.
+indexes.register(users_collection, [("guild_id", ASCENDING), ("user_id", ASCENDING)])
+
+async def get_user(guild_id: int, user_id: int, projection: Optional[dict] = None) -> dict:
+    """📌 A member's moderation document in `guild_id` ({} if there is none), including buffered writes."""
+    return await users_buffer.find_one(user_query(guild_id, user_id), projection) or {}
+
+async def update_user(guild_id: int, user_id: int, update: dict, upsert: bool = True):
+    """📌 Updates a member's moderation document through the write-behind buffer."""
+    if upsert:
+        update = with_identity(update, guild_id, user_id)
+    await users_buffer.update_one(user_query(guild_id, user_id), update, upsert=upsert)
+
+def user_update_op(guild_id: int, user_id: int, update: dict, upsert: bool = True) -> UpdateOne:
+    """📌 The same update as an UpdateOne, for bulk commands that commit many members with one bulk_write."""
+    if upsert:
+        update = with_identity(update, guild_id, user_id)
+    return UpdateOne(user_query(guild_id, user_id), update, upsert=upsert)
+
+async def migrate_legacy_documents(guild_id: int, batch_size: int = 500) -> int:
+    """
+    📌 One-off migration for user documents keyed by user ID alone (written before state was per guild).
+    📌 The old documents don't record which server they came from, so all of them are assigned to `guild_id`.
+    📌 Each is copied to its "{guild_id}:{user_id}" document (never overwriting one that already exists) and then removed,
+    📌 so re-running it is safe. Returns the number of documents migrated.
+    """
+    migrated = 0
+    copies, deletes = [], []
+    async for doc in users_collection.find({"guild_id": {"$exists": False}}):
+        user_id = doc.pop("_id")
+        copies.append(UpdateOne(user_query(guild_id, user_id),
+                                {"$setOnInsert": {**doc, "guild_id": guild_id, "user_id": user_id}}, upsert=True))
+        deletes.append(DeleteOne({"_id": user_id}))
+        migrated += 1
+        if len(copies) >= batch_size:
+            await _flush(copies, deletes)
+    await _flush(copies, deletes)
+    return migrated
+
+async def _flush(copies: list, deletes: list):
+    # 📌 Legacy documents are only removed once their copies are written.
+    if copies:
+        await users_collection.bulk_write(copies, ordered=False)
+    if deletes:
+        await users_collection.bulk_write(deletes, ordered=False)
+    copies.clear()
+    deletes.clear()
@@ -0,0 +1,118 @@
+# 📌 utils/warning_counter.py
+
+import os
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+from pymongo import ReturnDocument
+from utils import metrics
+from utils.database import users_collection
+from utils.user_state import user_query
+
+# 📌 Warnings before a blacklisted member is auto-timed out.
+WARNING_LIMIT = 3
+# 📌 Warnings expire once a member has gone this long without a new one.
+WARNING_DECAY_SECONDS = float(os.getenv("WARNING_DECAY_SECONDS", "86400"))
+# 📌 Front layer: at most SPAM_BURST attempts per member are counted in any SPAM_WINDOW_SECONDS;
+# 📌 repeats inside the window are answered without touching the database.
+SPAM_WINDOW_SECONDS = float(os.getenv("SPAM_WINDOW_SECONDS", "2.0"))
+SPAM_BURST = int(os.getenv("SPAM_BURST", "1"))
+
+# 📌 Stands in for "never warned" when comparing against the decay cutoff.
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+class Strike(NamedTuple):
+    """📌 One counted warning: its number within the current cycle (1..WARNING_LIMIT) and whether it triggers the timeout."""
+    number: int
+    timeout: bool
+
+class SlidingWindow:
+    """
+    📌 Per-key sliding-window limiter kept entirely in memory.
+    📌 Keys are held in last-seen order, so keys whose window has passed are evicted from the front as new ones arrive.
+    """
+    def __init__(self, window: float = SPAM_WINDOW_SECONDS, burst: int = SPAM_BURST):
+        self.window = window
+        self.burst = burst
+        self._hits = OrderedDict()  # 📌 key -> deque of admitted timestamps (monotonic), oldest key first
+
+    def admit(self, key, now: Optional[float] = None) -> bool:
+        """📌 Records an attempt; False if `key` already had `burst` admitted attempts within the window."""
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.window
+        while self._hits:
+            oldest_key, oldest = next(iter(self._hits.items()))
+            if oldest[-1] > cutoff:
+                break
+            del self._hits[oldest_key]
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque(maxlen=self.burst)
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+        if len(hits) >= self.burst:
+            return False
+        hits.append(now)
+        self._hits.move_to_end(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+class WarningCounter:
+    """
+    📌 Blacklist warnings as one atomic increment-and-return per counted attempt.
+    📌 A pipeline update resets counts older than the decay window and increments in the same operation, so
+    📌 concurrent attempts each get a distinct count and none are lost. The count keeps growing within a window;
+    📌 every WARNING_LIMIT-th warning triggers the timeout, so exactly one attempt per cycle does.
+    """
+    def __init__(self, collection, limit: int = WARNING_LIMIT, decay: float = WARNING_DECAY_SECONDS,
+                 front: Optional[SlidingWindow] = None):
+        self.collection = collection
+        self.limit = limit
+        self.decay = decay
+        self.front = front if front is not None else SlidingWindow()
+        self.counted = 0
+        self.dropped = 0
+        self.timeouts = 0
+
+    async def increment(self, guild_id: int, user_id: int, now: Optional[datetime] = None) -> int:
+        """📌 Atomically adds one warning (after applying decay) and returns the member's count in the current window."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=self.decay)
+        fresh = {"$gte": [{"$ifNull": ["$warnings_at", _EPOCH]}, cutoff]}
+        doc = await self.collection.find_one_and_update(
+            user_query(guild_id, user_id),
+            [{"$set": {
+                "warnings": {"$add": [{"$cond": [fresh, {"$ifNull": ["$warnings", 0]}, 0]}, 1]},
+                "warnings_at": now,
+                "guild_id": guild_id,
+                "user_id": user_id,
+            }}],
+            projection={"warnings": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc["warnings"]
+
+    async def warn(self, guild_id: int, user_id: int) -> Optional[Strike]:
+        """📌 Counts a blacklisted attempt. Returns None for repeats dropped by the in-memory front layer."""
+        if not self.front.admit((guild_id, user_id)):
+            self.dropped += 1
+            return None
+        count = await self.increment(guild_id, user_id)
+        self.counted += 1
+        timeout = count % self.limit == 0
+        if timeout:
+            self.timeouts += 1
+        return Strike((count - 1) % self.limit + 1, timeout)
+
+    def stats(self) -> dict:
+        return {"counted": self.counted, "dropped": self.dropped, "timeouts": self.timeouts, "tracked": len(self.front)}
+
+# 📌 Shared counter used by check_moderation_access.
+warning_counter = WarningCounter(users_collection)
+metrics.register_gauge("bot_blacklist_warnings", "Blacklist warning attempts counted, dropped as spam and timeouts",
+                       "stat", warning_counter.stats)
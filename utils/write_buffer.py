@@ -0,0 +1,218 @@
+# 📌 utils/write_buffer.py
+
+import asyncio
+import copy
+import logging
+import os
+from typing import Optional
+
+from pymongo import UpdateOne
+from utils.database import users_collection
+from utils.supervisor import supervisor
+
+# 📌 Set up a logger for this module.
+logger = logging.getLogger("utils.write_buffer")
+
+# 📌 Set WRITE_BEHIND=1 to batch user-document writes; by default every write goes straight to MongoDB.
+WRITE_BEHIND = os.getenv("WRITE_BEHIND", "0") == "1"
+# 📌 Seconds between flushes, and the pending-document count that triggers an early flush.
+WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "0.5"))
+WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "1000"))
+
+# 📌 Update operators that can be merged per document. Anything else is written through immediately.
+MERGEABLE_OPERATORS = {"$set", "$unset", "$inc", "$push", "$setOnInsert"}
+
+def _push_items(value) -> tuple:
+    """📌 Normalises a $push value into (items, slice)."""
+    if isinstance(value, dict) and "$each" in value:
+        return list(value["$each"]), value.get("$slice")
+    return [value], None
+
+def merge_updates(first: dict, second: dict) -> dict:
+    """
+    📌 Combines two update documents for the same _id into one that has the same effect as applying both in order.
+    📌 Each field ends up under exactly one of $set/$unset/$inc, as MongoDB requires.
+    """
+    merged = copy.deepcopy(first)
+    sets = merged.setdefault("$set", {})
+    unsets = merged.setdefault("$unset", {})
+    incs = merged.setdefault("$inc", {})
+    pushes = merged.setdefault("$push", {})
+    inserts = merged.setdefault("$setOnInsert", {})
+
+    for key, value in second.get("$set", {}).items():
+        incs.pop(key, None)
+        unsets.pop(key, None)
+        pushes.pop(key, None)
+        sets[key] = copy.deepcopy(value)
+    for key in second.get("$unset", {}):
+        sets.pop(key, None)
+        incs.pop(key, None)
+        pushes.pop(key, None)
+        unsets[key] = ""
+    for key, amount in second.get("$inc", {}).items():
+        if key in sets:
+            sets[key] = sets[key] + amount
+        elif key in unsets:
+            del unsets[key]
+            sets[key] = amount
+        else:
+            incs[key] = incs.get(key, 0) + amount
+    for key, value in second.get("$push", {}).items():
+        items, slice_ = _push_items(value)
+        if key in sets or key in unsets:
+            # 📌 The array was replaced earlier in the window, so push onto the replacement directly.
+            values = list(sets.get(key) or []) + copy.deepcopy(items)
+            unsets.pop(key, None)
+            if slice_ is not None:
+                values = values[slice_:] if slice_ < 0 else values[:slice_]
+            sets[key] = values
+            continue
+        if key in pushes:
+            previous, previous_slice = _push_items(pushes[key])
+            items = previous + items
+            slice_ = slice_ if slice_ is not None else previous_slice
+        pushes[key] = {"$each": items, "$slice": slice_} if slice_ is not None else {"$each": items}
+    for key, value in second.get("$setOnInsert", {}).items():
+        inserts.setdefault(key, copy.deepcopy(value))
+
+    return {operator: fields for operator, fields in merged.items() if fields}
+
+def apply_update(doc: Optional[dict], update: dict, upsert: bool) -> Optional[dict]:
+    """📌 Applies a (merged) update to a document in memory, for the read-your-writes overlay."""
+    if doc is None:
+        if not upsert:
+            return None
+        doc = dict(update.get("$setOnInsert", {}))
+    else:
+        doc = copy.deepcopy(doc)
+    doc.update(copy.deepcopy(update.get("$set", {})))
+    for key in update.get("$unset", {}):
+        doc.pop(key, None)
+    for key, amount in update.get("$inc", {}).items():
+        doc[key] = doc.get(key, 0) + amount
+    for key, value in update.get("$push", {}).items():
+        items, slice_ = _push_items(value)
+        values = list(doc.get(key, [])) + copy.deepcopy(items)
+        if slice_ is not None:
+            values = values[slice_:] if slice_ < 0 else values[:slice_]
+        doc[key] = values
+    return doc
+
+class WriteBehindBuffer:
+    """
+    📌 Optional write-behind layer in front of one collection.
+    📌 `update_one` calls on `{"_id": ...}` filters are merged per document and flushed with one bulk_write
+    📌 every WRITE_BEHIND_INTERVAL seconds. `find_one` overlays pending changes so callers read their own writes.
+    📌 When disabled, both methods pass straight through to the collection.
+    """
+    def __init__(self, collection, enabled: bool = WRITE_BEHIND, interval: float = WRITE_BEHIND_INTERVAL,
+                 max_pending: int = WRITE_BEHIND_MAX_PENDING):
+        self.collection = collection
+        self.enabled = enabled
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending = {}  # 📌 _id -> [merged update, upsert]
+        self._inflight = {}  # 📌 Batch currently being written, still visible to reads
+        self._flush_lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._task = None
+        self.writes = 0
+        self.flushed_docs = 0
+
+    def _bufferable(self, query: dict, update: dict) -> bool:
+        return self.enabled and set(query) == {"_id"} and set(update) <= MERGEABLE_OPERATORS
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        """📌 Queues (or writes through) a single-document update."""
+        self.writes += 1
+        if not self._bufferable(query, update):
+            if self.enabled and set(query) == {"_id"} and query["_id"] in self._pending:
+                # 📌 Keep per-document ordering: flush what's pending before an unmergeable write.
+                await self.flush()
+            return await self.collection.update_one(query, update, upsert=upsert)
+        key = query["_id"]
+        if key in self._pending:
+            pending = self._pending[key]
+            pending[0] = merge_updates(pending[0], update)
+            pending[1] = pending[1] or upsert
+        else:
+            self._pending[key] = [merge_updates({}, update), upsert]
+        if len(self._pending) >= self.max_pending:
+            self._full.set()
+
+    async def find_one(self, query: dict, *args, **kwargs):
+        """📌 Reads through to MongoDB and applies any pending update for the same _id."""
+        doc = await self.collection.find_one(query, *args, **kwargs)
+        if not self.enabled or set(query) != {"_id"}:
+            return doc
+        key = query["_id"]
+        for layer in (self._inflight, self._pending):
+            if key in layer:
+                update, upsert = layer[key]
+                was_missing = doc is None
+                doc = apply_update(doc, update, upsert)
+                if doc is not None and was_missing:
+                    doc["_id"] = key
+        return doc
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def flush(self):
+        """📌 Writes every pending document with one unordered bulk_write."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+            self._full.clear()
+            try:
+                await self.collection.bulk_write(
+                    [UpdateOne({"_id": key}, update, upsert=upsert) for key, (update, upsert) in batch.items()],
+                    ordered=False
+                )
+                self.flushed_docs += len(batch)
+            except Exception:
+                logger.exception(f"Write-behind flush of {len(batch)} documents failed; re-queueing")
+                # 📌 Put the failed batch back underneath anything queued while we were writing.
+                for key, (update, upsert) in batch.items():
+                    if key in self._pending:
+                        newer, newer_upsert = self._pending[key]
+                        self._pending[key] = [merge_updates(update, newer), upsert or newer_upsert]
+                    else:
+                        self._pending[key] = [update, upsert]
+                raise
+            finally:
+                self._inflight = {}
+
+    def start(self):
+        """📌 Starts the periodic flusher (no-op when write-behind is disabled)."""
+        if self.enabled and self._task is None:
+            self._task = supervisor.spawn(self._run(), "flusher", owner="write_buffer", essential=True)
+
+    async def stop(self):
+        """📌 Stops the flusher and flushes everything still pending (called on shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                # 📌 Already logged and re-queued; retry on the next interval.
+                pass
+
+# 📌 Shared buffer for user moderation documents.
+users_buffer = WriteBehindBuffer(users_collection)